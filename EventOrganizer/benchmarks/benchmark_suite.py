@@ -0,0 +1,479 @@
+from domain.person import Person
+from exceptions.repo_exc import RepoError
+from infrastructure.person_repository import FilePersonRepository
+from infrastructure.event_repository import FileEventRepository
+from infrastructure.person_event_repository import FilePersonEventRepository
+from service.person_service import PersonService
+from service.event_service import EventService
+from service.person_event_service import PersonEventService
+from service.sorting import SortEngine
+from service import dataset_generator
+from validation.person_validator import PersonValidator
+from validation.event_validator import EventValidator
+from ui.console import Console
+from benchmarks.sort_benchmark import generate_events
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+SIZES = (1000, 10000, 100000)
+
+REPEAT = 3
+
+# Number of calls timed by the cases measuring a single operation (lookups, inserts).
+OPERATIONS = 100
+
+# A case is a regression when it is this fraction slower than in the baseline.
+DEFAULT_THRESHOLD = 0.2
+
+# The O(n^2) sort algorithms take seconds above this size and would dominate the run, so they are skipped there.
+QUADRATIC_LIMIT = 1000
+
+CONSOLE_COMMANDS = ("top_persons 10", "person_display_events_by_date 1", "search_events_text concert OR party")
+
+
+class Fixture:
+    """
+    Class definition for Fixture.
+
+    File repositories and services over a private copy of a generated dataset, as the application
+    builds them (cached, attendance journaled).
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Constructor for Fixture object.
+
+        Args:
+            directory (str): directory holding the text files of the dataset
+
+        Return: None
+        """
+
+        self.persons_file = os.path.join(directory, dataset_generator.PERSONS_FILE_NAME)
+        self.events_file = os.path.join(directory, dataset_generator.EVENTS_FILE_NAME)
+        self.person_event_file = os.path.join(directory, dataset_generator.PERSON_EVENT_FILE_NAME)
+        self.person_repository = FilePersonRepository(self.persons_file, cached=True)
+        self.event_repository = FileEventRepository(self.events_file, cached=True)
+        self.person_event_repository = FilePersonEventRepository(self.person_event_file, cached=True, journaled=True)
+        self.person_service = PersonService(self.person_repository, PersonValidator())
+        self.event_service = EventService(self.event_repository, EventValidator())
+        self.person_event_service = PersonEventService(self.person_repository, self.event_repository,
+                                                       self.person_event_repository)
+
+    def load(self) -> None:
+        """
+        Read every text file once, so timed calls only measure the operation itself.
+
+        Return: None
+        """
+
+        self.person_repository.get_persons()
+        self.event_repository.get_events()
+        self.person_event_repository.get_person_event_counts()
+
+
+def dataset_sizes(size: int) -> tuple:
+    """
+    Return numbers of persons, events and attendances of the dataset of a benchmark size.
+
+    Args:
+        size (int): number of persons
+
+    Return: tuple
+    """
+
+    return size, max(10, size // 10), size * 5
+
+
+def prepare_load_persons(fixture: Fixture, size: int):
+    """
+    Build the case reading 'persons' text file into a new repository.
+
+    Args:
+        fixture (Fixture): repositories and services over a copy of the dataset
+        size (int): number of persons of the dataset
+
+    Return: function (timed, reading the file)
+    """
+
+    return lambda: FilePersonRepository(fixture.persons_file).get_persons()
+
+
+def prepare_load_events(fixture: Fixture, size: int):
+    """
+    Build the case reading 'events' text file into a new repository.
+
+    Args:
+        fixture (Fixture): repositories and services over a copy of the dataset
+        size (int): number of persons of the dataset
+
+    Return: function (timed, reading the file)
+    """
+
+    return lambda: FileEventRepository(fixture.events_file).get_events()
+
+
+def prepare_load_person_events(fixture: Fixture, size: int):
+    """
+    Build the case reading 'person_event' text file and its journal into a new repository.
+
+    Args:
+        fixture (Fixture): repositories and services over a copy of the dataset
+        size (int): number of persons of the dataset
+
+    Return: function (timed, reading the files)
+    """
+
+    return lambda: FilePersonEventRepository(fixture.person_event_file, journaled=True).get_person_event_counts()
+
+
+def prepare_save_persons(fixture: Fixture, size: int):
+    """
+    Build the case adding one person to a loaded repository, which rewrites 'persons' text file.
+
+    Args:
+        fixture (Fixture): repositories and services over a copy of the dataset
+        size (int): number of persons of the dataset
+
+    Return: function (timed, adding the person)
+    """
+
+    fixture.load()
+    return lambda: fixture.person_repository.add_person(Person(size + 1, "Benchmark", f"Benchmark{size + 1}"))
+
+
+def prepare_add_person(fixture: Fixture, size: int):
+    """
+    Build the case adding persons through PersonService, each one validated and written.
+
+    Args:
+        fixture (Fixture): repositories and services over a copy of the dataset
+        size (int): number of persons of the dataset
+
+    Return: function (timed, adding the persons)
+    """
+
+    fixture.load()
+
+    def run() -> None:
+        for person_id in range(size + 1, size + 1 + OPERATIONS // 10):
+            fixture.person_service.add_person(person_id, "Benchmark", f"Benchmark{person_id}")
+
+    return run
+
+
+def prepare_store(fixture: Fixture, size: int):
+    """
+    Build the case adding attendances through PersonEventService, each one appended to the journal.
+
+    Args:
+        fixture (Fixture): repositories and services over a copy of the dataset
+        size (int): number of persons of the dataset
+
+    Return: function (timed, adding the attendances)
+    """
+
+    fixture.load()
+    events = dataset_sizes(size)[1]
+
+    def run() -> None:
+        for person_id in range(1, OPERATIONS + 1):
+            # Every person attends about 5 of the events, so a few of these pairs are already stored.
+            try:
+                fixture.person_event_service.add_person_to_event(person_id, (person_id * 7) % events + 1)
+            except RepoError:
+                pass
+
+    return run
+
+
+def prepare_get_person_events(fixture: Fixture, size: int):
+    """
+    Build the case looking up the events of persons spread over the dataset.
+
+    Args:
+        fixture (Fixture): repositories and services over a copy of the dataset
+        size (int): number of persons of the dataset
+
+    Return: function (timed, running the lookups)
+    """
+
+    fixture.load()
+    step = max(1, size // OPERATIONS)
+
+    def run() -> None:
+        for person_id in range(1, size + 1, step):
+            fixture.person_event_service.get_person_events(person_id)
+
+    return run
+
+
+def prepare_get_top_persons(fixture: Fixture, size: int):
+    """
+    Build the case ranking the top 20% persons by number of events.
+
+    Args:
+        fixture (Fixture): repositories and services over a copy of the dataset
+        size (int): number of persons of the dataset
+
+    Return: function (timed, ranking the persons)
+    """
+
+    fixture.load()
+    return lambda: fixture.person_event_service.get_top_persons()
+
+
+def prepare_get_top_events(fixture: Fixture, size: int):
+    """
+    Build the case ranking the top 20% events by number of persons.
+
+    Args:
+        fixture (Fixture): repositories and services over a copy of the dataset
+        size (int): number of persons of the dataset
+
+    Return: function (timed, ranking the events)
+    """
+
+    fixture.load()
+    return lambda: fixture.person_event_service.get_top_events()
+
+
+def prepare_sort(algorithm: str):
+    """
+    Return the prepare function of the case sorting Event objects with a SortEngine algorithm.
+
+    Args:
+        algorithm (str): one of SortEngine.ALGORITHMS
+
+    Return: function
+    """
+
+    def prepare(fixture: Fixture, size: int):
+        if algorithm in ("selection", "shake") and size > QUADRATIC_LIMIT:
+            return None
+
+        events = generate_events(size)
+        engine = SortEngine(algorithm)
+        return lambda: engine.sort(events, [lambda event: event.get_timestamp()])
+
+    return prepare
+
+
+def prepare_console(command: str):
+    """
+    Return the prepare function of the case running a console command, its output discarded.
+
+    Args:
+        command (str): console command line
+
+    Return: function
+    """
+
+    def prepare(fixture: Fixture, size: int):
+        fixture.load()
+        console = Console(fixture.person_service, fixture.event_service, fixture.person_event_service)
+
+        def run() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                console.execute(command)
+
+        return run
+
+    return prepare
+
+
+# (case name, number of operations timed, prepare function). A prepare function builds what the case needs
+# and returns the function to time, or None when the case is skipped at that size.
+CASES = (
+    ("load_persons", 1, prepare_load_persons),
+    ("load_events", 1, prepare_load_events),
+    ("load_person_events", 1, prepare_load_person_events),
+    ("save_persons", 1, prepare_save_persons),
+    ("add_person", OPERATIONS // 10, prepare_add_person),
+    ("store", OPERATIONS, prepare_store),
+    ("get_person_events", OPERATIONS, prepare_get_person_events),
+    ("get_top_persons", 1, prepare_get_top_persons),
+    ("get_top_events", 1, prepare_get_top_events),
+) + tuple((f"sort_{algorithm}", 1, prepare_sort(algorithm)) for algorithm in SortEngine.ALGORITHMS) \
+  + tuple((f"console_{command.split()[0]}", 1, prepare_console(command)) for command in CONSOLE_COMMANDS)
+
+
+def run(sizes=SIZES, repeat: int = REPEAT, cases=None, seed: int = dataset_generator.DEFAULT_SEED) -> dict:
+    """
+    Time every case at every dataset size.
+
+    Every repetition runs on a fresh copy of the generated dataset, so cases writing files do not
+    affect each other. The best time is kept as the result, being the least noisy.
+
+    Args:
+        sizes (tuple): numbers of persons of the datasets
+        repeat (int): number of timed runs of every case
+        cases (list): names of the cases to run (all by default)
+        seed (int): seed of the dataset generator
+
+    Return: dict (results document, see save_results)
+    """
+
+    results = []
+    root = tempfile.mkdtemp()
+
+    try:
+        for size in sizes:
+            dataset = os.path.join(root, f"dataset-{size}")
+            dataset_generator.write_dataset(dataset, *dataset_sizes(size), seed=seed)
+
+            for name, operations, prepare in CASES:
+                if cases is not None and name not in cases:
+                    continue
+
+                timings = []
+                for _ in range(repeat):
+                    copy = os.path.join(root, "copy")
+                    shutil.copytree(dataset, copy)
+                    try:
+                        function = prepare(Fixture(copy), size)
+                        if function is None:
+                            break
+
+                        start = time.perf_counter()
+                        function()
+                        timings.append(time.perf_counter() - start)
+                    finally:
+                        shutil.rmtree(copy)
+
+                if len(timings) > 0:
+                    results.append({"case": name, "size": size, "operations": operations, "seconds": min(timings),
+                                    "median": statistics.median(timings)})
+    finally:
+        shutil.rmtree(root)
+
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def save_results(document: dict, file_path: str) -> None:
+    """
+    Write a results document as JSON.
+
+    Args:
+        document (dict): 'created', 'python', 'platform', 'repeat' and 'results', a list of
+            {'case', 'size', 'operations', 'seconds', 'median'} records
+        file_path (str): path of the JSON file
+
+    Return: None
+    """
+
+    with open(file_path, "w") as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+
+
+def load_results(file_path: str) -> dict:
+    """
+    Read a results document written by save_results.
+
+    Args:
+        file_path (str): path of the JSON file
+
+    Return: dict
+    """
+
+    with open(file_path, "r") as f:
+        return json.load(f)
+
+
+def compare(document: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Compare results with a baseline, case by case.
+
+    Cases missing from the baseline are left out.
+
+    Args:
+        document (dict): current results document
+        baseline (dict): baseline results document
+        threshold (float): fraction a case may be slower than its baseline before it is a regression
+
+    Return: list of (case, size, baseline seconds, seconds, ratio, is regression) tuples
+    """
+
+    baseline_seconds = {(result["case"], result["size"]): result["seconds"] for result in baseline["results"]}
+    comparison = []
+
+    for result in document["results"]:
+        before = baseline_seconds.get((result["case"], result["size"]))
+        if before is None:
+            continue
+
+        ratio = result["seconds"] / before if before > 0 else 1.0
+        comparison.append((result["case"], result["size"], before, result["seconds"], ratio, ratio > 1 + threshold))
+
+    return comparison
+
+
+def main() -> None:
+    """
+    Run the suite from the command line arguments, print the results and compare them with a baseline.
+
+    Exits with status 1 when a case regressed.
+
+    Return: None
+    """
+
+    parser = argparse.ArgumentParser(description="Time repositories, services and console commands at scale.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                        help=f"numbers of persons of the datasets (default: {' '.join(map(str, SIZES))})")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help=f"timed runs per case (default: {REPEAT})")
+    parser.add_argument("--cases", nargs="+", help="names of the cases to run (default: all)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare with the results of this JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"slowdown flagged as regression, as a fraction (default: {DEFAULT_THRESHOLD})")
+    arguments = parser.parse_args()
+
+    names = [name for name, _, _ in CASES]
+    for name in arguments.cases or ():
+        if name not in names:
+            parser.error(f"unknown case '{name}', cases are: {', '.join(names)}")
+
+    document = run(arguments.sizes, arguments.repeat, arguments.cases)
+
+    print(f"{'case':<38} {'size':>8} {'seconds':>10} {'per op':>10}")
+    for result in document["results"]:
+        print(f"{result['case']:<38} {result['size']:>8} {result['seconds']:>10.4f} "
+              f"{result['seconds'] / result['operations']:>10.6f}")
+
+    if arguments.output is not None:
+        save_results(document, arguments.output)
+
+    if arguments.baseline is None:
+        return
+
+    comparison = compare(document, load_results(arguments.baseline), arguments.threshold)
+    print(f"\n{'case':<38} {'size':>8} {'baseline':>10} {'seconds':>10} {'ratio':>7}")
+    for case, size, before, seconds, ratio, regression in comparison:
+        flag = "  REGRESSION" if regression else ""
+        print(f"{case:<38} {size:>8} {before:>10.4f} {seconds:>10.4f} {ratio:>7.2f}{flag}")
+
+    regressions = sum(1 for comparison_row in comparison if comparison_row[-1])
+    print(f"\n{regressions} regression(s) above {arguments.threshold:.0%}")
+    if regressions > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+from domain.person import Person
+from domain.event import Event
+from domain.person_event import PersonEvent
+from infrastructure.person_repository import PersonRepository
+from infrastructure.event_repository import EventRepository
+from infrastructure.person_event_repository import PersonEventRepository
+import random
+import tracemalloc
+
+PERSONS = 100000
+EVENTS = 10000
+ATTENDANCES = 1000000
+
+
+def measure(build) -> int:
+    """
+    Return the number of bytes still allocated by a function once it returns its result.
+
+    Args:
+        build (function): function building the data structure to measure
+
+    Return: int
+    """
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+
+    return after - before
+
+
+def build_persons(size: int, seed: int = 0) -> PersonRepository:
+    """
+    Fill a PersonRepository with random Person objects.
+
+    Args:
+        size (int): number of Person objects
+        seed (int): seed of the random generator
+
+    Return: PersonRepository
+    """
+
+    generator = random.Random(seed)
+    repository = PersonRepository()
+
+    for person_id in range(1, size + 1):
+        name = f"Person{generator.randint(1, size)}"
+        repository.add_person(Person(person_id, name, f"Street{person_id}"))
+
+    return repository
+
+
+def build_events(size: int, seed: int = 0) -> EventRepository:
+    """
+    Fill an EventRepository with random Event objects, their date and time read from text as on load.
+
+    Args:
+        size (int): number of Event objects
+        seed (int): seed of the random generator
+
+    Return: EventRepository
+    """
+
+    generator = random.Random(seed)
+    repository = EventRepository()
+
+    for event_id in range(1, size + 1):
+        line = f"{event_id},{generator.randint(2020, 2026)}-{generator.randint(1, 12)}-{generator.randint(1, 28)}," \
+               f"{generator.randint(0, 23)}:{generator.randint(0, 59):02d},Event {generator.randint(1, 100)}"
+        tokens = line.split(",")
+        repository.add_event(Event(int(tokens[0]), tokens[1], tokens[2], tokens[3]))
+
+    return repository
+
+
+def build_attendances(size: int, persons: int, events: int, seed: int = 0) -> PersonEventRepository:
+    """
+    Fill a PersonEventRepository with random distinct PersonEvent objects.
+
+    Args:
+        size (int): number of PersonEvent objects
+        persons (int): number of distinct person ids
+        events (int): number of distinct event ids
+        seed (int): seed of the random generator
+
+    Return: PersonEventRepository
+    """
+
+    generator = random.Random(seed)
+    repository = PersonEventRepository()
+    stored = 0
+
+    while stored < size:
+        if repository.store(PersonEvent(generator.randint(1, persons), generator.randint(1, events)), exist_ok=True):
+            stored += 1
+
+    return repository
+
+
+def run(persons: int = PERSONS, events: int = EVENTS, attendances: int = ATTENDANCES) -> list:
+    """
+    Measure memory held by repositories full of entities, including their indexes.
+
+    Args:
+        persons (int): number of Person objects
+        events (int): number of Event objects
+        attendances (int): number of PersonEvent objects
+
+    Return: list of (entity, count, total bytes, bytes per entity) tuples
+    """
+
+    results = []
+
+    for entity, count, build in (
+            ("Person", persons, lambda: build_persons(persons)),
+            ("Event", events, lambda: build_events(events)),
+            ("PersonEvent", attendances, lambda: build_attendances(attendances, persons, events))):
+        total = measure(build)
+        results.append((entity, count, total, total / count))
+
+    return results
+
+
+def main() -> None:
+    """
+    Print the benchmark results as a table.
+
+    Return: None
+    """
+
+    print(f"{'entity':<12} {'count':>9} {'MiB':>9} {'bytes/entity':>13}")
+    for entity, count, total, per_entity in run():
+        print(f"{entity:<12} {count:>9} {total / 2 ** 20:>9.1f} {per_entity:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
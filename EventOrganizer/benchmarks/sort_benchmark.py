@@ -0,0 +1,77 @@
+from domain.event import Event
+from service.sorting import SortEngine
+import random
+import time
+
+SIZES = (1000, 10000, 100000)
+
+# The O(n^2) algorithms take minutes above this size, so they are skipped there.
+QUADRATIC_LIMIT = 10000
+
+
+def generate_events(size: int, seed: int = 0) -> list:
+    """
+    Generate random Event objects.
+
+    Args:
+        size (int): number of Event objects
+        seed (int): seed of the random generator
+
+    Return: list
+    """
+
+    generator = random.Random(seed)
+    events = []
+
+    for event_id in range(1, size + 1):
+        date = f"{generator.randint(2020, 2026)}-{generator.randint(1, 12)}-{generator.randint(1, 28)}"
+        time_value = f"{generator.randint(0, 23)}:{generator.randint(0, 59):02d}"
+        description = f"Event {generator.randint(1, size)}"
+        events.append(Event(event_id, date, time_value, description))
+
+    return events
+
+
+def run(sizes=SIZES) -> list:
+    """
+    Time every SortEngine algorithm sorting Event objects by date and time.
+
+    Args:
+        sizes (tuple): numbers of Event objects to sort
+
+    Return: list of (algorithm, size, seconds or None if skipped) tuples
+    """
+
+    results = []
+    keys = [lambda event: event.get_timestamp()]
+
+    for size in sizes:
+        events = generate_events(size)
+        for algorithm in SortEngine.ALGORITHMS:
+            if algorithm in ("selection", "shake") and size > QUADRATIC_LIMIT:
+                results.append((algorithm, size, None))
+                continue
+
+            engine = SortEngine(algorithm)
+            start = time.perf_counter()
+            engine.sort(events, keys)
+            results.append((algorithm, size, time.perf_counter() - start))
+
+    return results
+
+
+def main() -> None:
+    """
+    Print the benchmark results as a table.
+
+    Return: None
+    """
+
+    print(f"{'algorithm':<10} {'size':>8} {'seconds':>10}")
+    for algorithm, size, seconds in run():
+        elapsed = "skipped" if seconds is None else f"{seconds:.4f}"
+        print(f"{algorithm:<10} {size:>8} {elapsed:>10}")
+
+
+if __name__ == "__main__":
+    main()
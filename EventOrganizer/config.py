@@ -0,0 +1,29 @@
+import os
+
+# Storage backend: "file" (text files) or "sqlite" (single database file).
+STORAGE = os.environ.get("EVENT_ORGANIZER_STORAGE", "file")
+
+DATA_DIRECTORY = os.environ.get("EVENT_ORGANIZER_DATA",
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), "infrastructure"))
+
+PERSONS_FILE = os.path.join(DATA_DIRECTORY, "persons.txt")
+EVENTS_FILE = os.path.join(DATA_DIRECTORY, "events.txt")
+PERSON_EVENT_FILE = os.path.join(DATA_DIRECTORY, "person_event.txt")
+PERSON_EVENT_BINARY_FILE = os.path.join(DATA_DIRECTORY, "person_event.bin")
+TRANSACTION_MANIFEST = os.path.join(DATA_DIRECTORY, "transaction.manifest")
+DATABASE_FILE = os.path.join(DATA_DIRECTORY, "event_organizer.db")
+
+# File backend options.
+CACHED = True
+JOURNALED = True
+
+# Console commands taking at least this many milliseconds are appended to SLOW_COMMAND_LOG (unset: no log).
+SLOW_COMMAND_MS = os.environ.get("EVENT_ORGANIZER_SLOW_MS")
+SLOW_COMMAND_LOG = os.path.join(DATA_DIRECTORY, "slow_commands.log")
+
+# Attendance file format of the file backend: "text" (person_event.txt) or "binary" (person_event.bin,
+# converted from the text file on first use).
+ATTENDANCE_FORMAT = os.environ.get("EVENT_ORGANIZER_ATTENDANCE_FORMAT", "text")
+
+# Attendance analytics over NumPy arrays loaded from PERSON_EVENT_FILE (file backend, needs numpy).
+COLUMNAR_ANALYTICS = os.environ.get("EVENT_ORGANIZER_COLUMNAR", "0") == "1"
@@ -99,4 +99,97 @@ class TopEventsDTO:
         Return: str
         """
 
-        return f" - - > Description: {self.__event_description} \n - - > Number of persons: {self.__nr_persons} \n"
\ No newline at end of file
+        return f" - - > Description: {self.__event_description} \n - - > Number of persons: {self.__nr_persons} \n"
+
+
+class ImportReportDTO:
+
+    def __init__(self, kind: str, rows: int, imported: int, skipped: int, rejected: list, seconds: float) -> None:
+        """
+        Constructor for ImportReportDTO object.
+
+        Args:
+            kind (str): kind of imported records ('persons', 'events' or 'attendance')
+            rows (int): number of rows read
+            imported (int): number of rows stored
+            skipped (int): number of rows already stored
+            rejected (list): (line number, error message) pairs of invalid rows
+            seconds (float): duration of the import
+
+        Return: None
+        """
+
+        self.__kind = kind
+        self.__rows = rows
+        self.__imported = imported
+        self.__skipped = skipped
+        self.__rejected = rejected
+        self.__seconds = seconds
+
+    def get_rows(self) -> int:
+        """
+        Return number of rows read.
+
+        Args: None
+
+        Return: int
+        """
+
+        return self.__rows
+
+    def get_imported(self) -> int:
+        """
+        Return number of rows stored.
+
+        Args: None
+
+        Return: int
+        """
+
+        return self.__imported
+
+    def get_skipped(self) -> int:
+        """
+        Return number of rows already stored.
+
+        Args: None
+
+        Return: int
+        """
+
+        return self.__skipped
+
+    def get_rejected(self) -> list:
+        """
+        Return (line number, error message) pairs of invalid rows.
+
+        Args: None
+
+        Return: list
+        """
+
+        return self.__rejected
+
+    def get_rows_per_second(self) -> float:
+        """
+        Return import throughput.
+
+        Args: None
+
+        Return: float
+        """
+
+        return self.__rows / self.__seconds if self.__seconds > 0 else float(self.__rows)
+
+    def __str__(self) -> str:
+        """
+        Return reader-friendly string representation of ImportReportDTO object.
+
+        Args: None
+
+        Return: str
+        """
+
+        return f" - - > Imported {self.__kind}: {self.__imported} of {self.__rows} rows \n" \
+               f" - - > Skipped: {self.__skipped} \n - - > Rejected: {len(self.__rejected)} \n" \
+               f" - - > Throughput: {self.get_rows_per_second():.0f} rows/s ({self.__seconds:.3f} s) \n"
@@ -1,5 +1,69 @@
+import datetime
+import sys
+
+MINUTES_PER_DAY = 1440
+
+
+def parse_date(date: str) -> int:
+    """
+    Convert 'year-month-day' date to its proleptic Gregorian ordinal.
+
+    Args:
+        date (str): date to convert
+
+    Raises:
+        ValueError: date is not a valid 'year-month-day' date
+
+    Return: int
+    """
+
+    year, month, day = date.split("-")
+
+    return datetime.date(int(year), int(month), int(day)).toordinal()
+
+
+def format_date(ordinal: int) -> str:
+    """
+    Convert proleptic Gregorian ordinal to 'year-month-day' date.
+
+    Args:
+        ordinal (int): ordinal to convert (see parse_date)
+
+    Return: str
+    """
+
+    date = datetime.date.fromordinal(ordinal)
+
+    return f"{date.year}-{date.month}-{date.day}"
+
+
+def parse_time(time: str) -> int:
+    """
+    Convert 'hour:minute' time to minutes since midnight.
+
+    Args:
+        time (str): time to convert
+
+    Raises:
+        ValueError: time is not a valid 'hour:minute' time
+
+    Return: int
+    """
+
+    hour, minute = time.split(":")
+    hour = int(hour)
+    minute = int(minute)
+
+    if not 0 <= hour < 24 or not 0 <= minute < 60:
+        raise ValueError(f"invalid time '{time}'")
+
+    return hour * 60 + minute
+
+
 class Event:
 
+    __slots__ = ("__id", "__date", "__time", "__description", "__date_key", "__time_key")
+
     def __init__(self, id: int, date: str, time: str, description: str) -> None:
         """
         Constructor for Person object.
@@ -14,9 +78,12 @@ class Event:
         """
 
         self.__id = id
-        self.__date = date
-        self.__time = time
+        # Many events share a date or a time, so loaded copies are folded into one string each.
+        self.__date = sys.intern(date)
+        self.__time = sys.intern(time)
         self.__description = description
+        self.__date_key = None
+        self.__time_key = None
 
     def __str__(self) -> str:
         """
@@ -73,6 +140,45 @@ class Event:
 
         return self.__time
 
+    def get_date_key(self) -> int:
+        """
+        Return Event object 'date' as ordinal day number, parsed once and cached.
+
+        Args: None
+
+        Return: int
+        """
+
+        if self.__date_key is None:
+            self.__date_key = parse_date(self.__date)
+
+        return self.__date_key
+
+    def get_time_key(self) -> int:
+        """
+        Return Event object 'time' as minutes since midnight, parsed once and cached.
+
+        Args: None
+
+        Return: int
+        """
+
+        if self.__time_key is None:
+            self.__time_key = parse_time(self.__time)
+
+        return self.__time_key
+
+    def get_timestamp(self) -> int:
+        """
+        Return Event object 'date' and 'time' as minutes since day 1, sortable as a single integer.
+
+        Args: None
+
+        Return: int
+        """
+
+        return self.get_date_key() * MINUTES_PER_DAY + self.get_time_key()
+
     def get_description(self) -> str:
         """
         Return Event object 'description' attribute.
@@ -94,7 +200,8 @@ class Event:
         Return: None
         """
 
-        self.__date = new_date
+        self.__date = sys.intern(new_date)
+        self.__date_key = None
 
     def set_time(self, new_time: str) -> None:
         """
@@ -106,7 +213,8 @@ class Event:
         Return: None
         """
 
-        self.__time = new_time
+        self.__time = sys.intern(new_time)
+        self.__time_key = None
 
     def set_description(self, new_description: str) -> None:
         """
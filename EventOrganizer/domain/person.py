@@ -1,5 +1,7 @@
 class Person:
 
+    __slots__ = ("__id", "__name", "__address")
+
     def __init__(self, id: int, name: str, address: str) -> None:
         """
         Constructor for Person object.
@@ -1,5 +1,7 @@
 class PersonEvent:
 
+    __slots__ = ("__person_id", "__event_id")
+
     def __init__(self, person_id: int, event_id: int) -> None:
         """
         Constructor for PersonEvent object.
@@ -32,6 +34,38 @@ class PersonEvent:
 
         return self.__event_id
 
+    def get_key(self) -> tuple:
+        """
+        Return (person_id, event_id) pair identifying the attendance
+
+        Return: tuple
+        """
+
+        return self.__person_id, self.__event_id
+
+    def __eq__(self, entity) -> bool:
+        """
+        Return if two PersonEvent objects are equal by 'person_id' and 'event_id'.
+
+        Args:
+            entity (PersonEvent): PersonEvent object
+
+        Return: bool
+        """
+
+        return self.__person_id == entity.__person_id and self.__event_id == entity.__event_id
+
+    def __hash__(self) -> int:
+        """
+        Return hash of PersonEvent object by 'person_id' and 'event_id'.
+
+        Args: None
+
+        Return: int
+        """
+
+        return hash((self.__person_id, self.__event_id))
+
     def __str__(self) -> str:
         """
         Return reader-friendly string representation of PersonEvent object.
@@ -1,16 +1,82 @@
+import config
+import os
 from tests.testing import Tests
 from validation.person_validator import PersonValidator
 from validation.event_validator import EventValidator
 from infrastructure.person_repository import FilePersonRepository
+from infrastructure.person_repository import SqlitePersonRepository
 from infrastructure.event_repository import FileEventRepository
+from infrastructure.event_repository import SqliteEventRepository
 from infrastructure.person_event_repository import FilePersonEventRepository
+from infrastructure.person_event_repository import SqlitePersonEventRepository
+from infrastructure.binary_person_event_repository import BinaryPersonEventRepository
+from infrastructure import sqlite_connection
+from infrastructure.unit_of_work import UnitOfWork
+from infrastructure.columnar_person_event_repository import ColumnarPersonEventRepository
 from service.person_service import PersonService
 from service.event_service import EventService
 from service.person_event_service import PersonEventService
+from service.analytics_service import AnalyticsService
+from service.import_service import ImportService
+from service.export_service import ExportService
 from ui.console import Console
+from ui.command_stats import CommandStats
 from ui.console import clear_screen
 
 
+def create_repositories() -> tuple:
+    """
+    Create repositories of the storage backend selected in 'config'.
+
+    Return: tuple (person repository, event repository, person_event repository)
+    """
+
+    if config.STORAGE == "sqlite":
+        connection = sqlite_connection.connect(config.DATABASE_FILE)
+        return (SqlitePersonRepository(connection), SqliteEventRepository(connection),
+                SqlitePersonEventRepository(connection))
+
+    if config.STORAGE != "file":
+        raise ValueError(f"ERROR: unknown storage '{config.STORAGE}'...")
+
+    if config.ATTENDANCE_FORMAT == "binary":
+        UnitOfWork.recover(config.PERSON_EVENT_BINARY_FILE + ".manifest")
+        if not os.path.exists(config.PERSON_EVENT_BINARY_FILE):
+            BinaryPersonEventRepository.convert_from_text(config.PERSON_EVENT_FILE, config.PERSON_EVENT_BINARY_FILE)
+        person_event_repository = BinaryPersonEventRepository(config.PERSON_EVENT_BINARY_FILE)
+    elif config.ATTENDANCE_FORMAT == "text":
+        person_event_repository = FilePersonEventRepository(config.PERSON_EVENT_FILE, cached=config.CACHED,
+                                                            journaled=config.JOURNALED)
+    else:
+        raise ValueError(f"ERROR: unknown attendance format '{config.ATTENDANCE_FORMAT}'...")
+
+    return (FilePersonRepository(config.PERSONS_FILE, cached=config.CACHED),
+            FileEventRepository(config.EVENTS_FILE, cached=config.CACHED),
+            person_event_repository)
+
+
+def create_command_stats() -> CommandStats:
+    """
+    Create CommandStats with the slow command log configured in 'config'.
+
+    Return: CommandStats
+    """
+
+    if config.SLOW_COMMAND_MS is None:
+        return CommandStats()
+
+    try:
+        slow_ms = float(config.SLOW_COMMAND_MS)
+    except ValueError:
+        slow_ms = -1
+
+    if not slow_ms >= 0:
+        raise ValueError(f"ERROR: EVENT_ORGANIZER_SLOW_MS must be a non-negative number of milliseconds, "
+                         f"not '{config.SLOW_COMMAND_MS}'...")
+
+    return CommandStats(slow_ms / 1000, config.SLOW_COMMAND_LOG)
+
+
 def main() -> None:
     """
     Main function of the application.
@@ -25,18 +91,28 @@ def main() -> None:
     person_validator = PersonValidator()
     event_validator = EventValidator()
 
-    person_repository = FilePersonRepository(
-        r"C:\Users\margi\PycharmProjects\EventOrganizer\infrastructure\persons.txt")
-    event_repository = FileEventRepository(
-        r"C:\Users\margi\PycharmProjects\EventOrganizer\infrastructure\events.txt")
-    person_event_repository = FilePersonEventRepository(
-        r"C:\Users\margi\PycharmProjects\EventOrganizer\infrastructure\person_event.txt")
+    person_repository, event_repository, person_event_repository = create_repositories()
+    unit_of_work = UnitOfWork(person_repository, event_repository, person_event_repository,
+                              config.TRANSACTION_MANIFEST)
 
     person_service = PersonService(person_repository, person_validator)
     event_service = EventService(event_repository, event_validator)
     person_event_service = PersonEventService(person_repository, event_repository, person_event_repository)
 
-    console = Console(person_service, event_service, person_event_service)
+    analytics_service = None
+    if config.COLUMNAR_ANALYTICS and config.STORAGE == "file" and config.ATTENDANCE_FORMAT == "text":
+        analytics_service = AnalyticsService(person_repository, event_repository,
+                                             ColumnarPersonEventRepository(config.PERSON_EVENT_FILE))
+
+    import_service = ImportService(person_repository, event_repository, person_event_repository, person_validator,
+                                   event_validator, unit_of_work)
+
+    export_service = ExportService(person_repository, event_repository, person_event_repository, person_event_service)
+
+    command_stats = create_command_stats()
+
+    console = Console(person_service, event_service, person_event_service, unit_of_work, analytics_service,
+                      import_service, export_service, command_stats)
     console.run()
 
 
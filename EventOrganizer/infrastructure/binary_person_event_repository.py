@@ -0,0 +1,669 @@
+from domain.person_event import PersonEvent
+from domain.person import Person
+from domain.event import Event
+from exceptions.repo_exc import RepoError
+from infrastructure.file_cache import FileCache
+from infrastructure.person_event_repository import FilePersonEventRepository
+from infrastructure.unit_of_work import UnitOfWork
+from infrastructure import io_stats
+import bisect
+import heapq
+import mmap
+import os
+import struct
+
+RECORD = struct.Struct("<ii")
+
+# Greatest id fitting in a record.
+MAX_ID = 2 ** 31 - 1
+
+
+def check_ids(person_id: int, event_id: int) -> None:
+    """
+    Check that the ids of an attendance fit in a record.
+
+    Args:
+        person_id (int): id of Person object
+        event_id (int): id of Event object
+
+    Raises:
+        RepoError: an id is negative or greater than MAX_ID
+
+    Return: None
+    """
+
+    if not (0 <= person_id <= MAX_ID and 0 <= event_id <= MAX_ID):
+        raise RepoError(f"ERROR: ids of the binary attendance file must be between 0 and {MAX_ID}...")
+
+
+class BinaryRecords:
+    """
+    Class definition for BinaryRecords.
+
+    Read-only sequence of the (int, int) records of a fixed-width binary buffer, records are unpacked
+    on access only, so 'bisect' searches the buffer without parsing it.
+    """
+
+    def __init__(self, buffer) -> None:
+        """
+        Constructor for BinaryRecords object.
+
+        Args:
+            buffer (mmap.mmap | bytes): buffer of packed records
+
+        Return: None
+        """
+
+        self.__buffer = buffer
+
+    def __len__(self) -> int:
+        """
+        Return number of records.
+
+        Return: int
+        """
+
+        return len(self.__buffer) // RECORD.size
+
+    def __getitem__(self, index: int) -> tuple:
+        """
+        Return record at given index.
+
+        Args:
+            index (int): index of record
+
+        Return: tuple
+        """
+
+        return RECORD.unpack_from(self.__buffer, index * RECORD.size)
+
+    def get_buffer(self):
+        """
+        Return buffer of packed records.
+
+        Return: mmap.mmap | bytes
+        """
+
+        return self.__buffer
+
+    def find_range(self, key: int) -> tuple:
+        """
+        Return [start, end) index range of the records whose first value is 'key'.
+
+        Time Complexity:
+            O(log n)
+
+        Args:
+            key (int): first value of the records
+
+        Return: tuple
+        """
+
+        return bisect.bisect_left(self, (key,)), bisect.bisect_left(self, (key + 1,))
+
+    def find(self, record: tuple) -> int:
+        """
+        Return index of a record, or -1 if it is not stored.
+
+        Args:
+            record (tuple): record to search
+
+        Return: int
+        """
+
+        index = bisect.bisect_left(self, record)
+        if index < len(self) and self[index] == record:
+            return index
+
+        return -1
+
+    def second_values(self, start: int, end: int) -> list:
+        """
+        Return second values of the records in [start, end).
+
+        Args:
+            start (int): first index
+            end (int): index after the last one
+
+        Return: list
+        """
+
+        return [record[1] for record in RECORD.iter_unpack(self.__buffer[start * RECORD.size:end * RECORD.size])]
+
+    def inserted(self, index: int, record: tuple) -> bytes:
+        """
+        Return the packed records with a record inserted at given index.
+
+        Args:
+            index (int): index of the new record
+            record (tuple): record to insert
+
+        Return: bytes
+        """
+
+        offset = index * RECORD.size
+
+        return self.__buffer[:offset] + RECORD.pack(*record) + self.__buffer[offset:]
+
+    def without(self, indexes: list) -> bytes:
+        """
+        Return the packed records without the records at given indexes.
+
+        Args:
+            indexes (list): indexes of the records to drop
+
+        Return: bytes
+        """
+
+        segments = []
+        start = 0
+
+        for index in sorted(indexes):
+            segments.append(self.__buffer[start * RECORD.size:index * RECORD.size])
+            start = index + 1
+
+        segments.append(self.__buffer[start * RECORD.size:])
+
+        return b"".join(segments)
+
+
+class BinaryPersonEventRepository:
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Constructor for BinaryPersonEventRepository object.
+
+        Attendances are stored as fixed-width little-endian (person_id, event_id) int32 records in a
+        file sorted by person, and as (event_id, person_id) records in a '.by_event' sidecar sorted
+        by event. Both files are memory-mapped, so lookups by person or by event are binary searches
+        that never parse nor load the whole file. A change writes both files next to their targets
+        and renames them through a manifest, like a UnitOfWork commit.
+
+        Args:
+            file_path (str): file path of binary file
+
+        Return: None
+        """
+
+        self.__file_path = file_path
+        self.__event_file_path = file_path + ".by_event"
+        self.__manifest_path = file_path + ".manifest"
+        self.__cache = FileCache(self.__file_path, self.__event_file_path)
+        self.__by_person = BinaryRecords(b"")
+        self.__by_event = BinaryRecords(b"")
+        self.__in_transaction = False
+        self.__dirty = False
+        UnitOfWork.recover(self.__manifest_path)
+
+    @staticmethod
+    def convert_from_text(text_file_path: str, binary_file_path: str) -> int:
+        """
+        Write the attendances of a 'person_event' text file (and its journal) to a binary file and its sidecar.
+
+        Both files are written next to their targets and renamed through a manifest, so an interrupted
+        conversion never leaves a binary file without its sidecar.
+
+        Args:
+            text_file_path (str): file path of text file
+            binary_file_path (str): file path of binary file to write
+
+        Return: int (number of attendances written)
+        """
+
+        text_repository = FilePersonEventRepository(text_file_path, journaled=True)
+        pairs = sorted(person_event.get_key() for person_event in text_repository.iter_person_events())
+        for person_id, event_id in pairs:
+            check_ids(person_id, event_id)
+
+        by_person = b"".join(RECORD.pack(person_id, event_id) for person_id, event_id in pairs)
+        pairs.sort(key=lambda pair: (pair[1], pair[0]))
+        by_event = b"".join(RECORD.pack(event_id, person_id) for person_id, event_id in pairs)
+
+        renames = [(binary_file_path + ".tmp", binary_file_path),
+                   (binary_file_path + ".by_event.tmp", binary_file_path + ".by_event")]
+        BinaryPersonEventRepository.__write_file(renames[0][0], by_person)
+        BinaryPersonEventRepository.__write_file(renames[1][0], by_event)
+        BinaryPersonEventRepository.__commit_renames(binary_file_path + ".manifest", renames)
+
+        return len(pairs)
+
+    @staticmethod
+    def __commit_renames(manifest_path: str, renames: list) -> None:
+        """
+        Rename temporary files over their targets at once, through a manifest finished by UnitOfWork.recover.
+
+        Args:
+            manifest_path (str): file path of the manifest
+            renames (list): (temporary file path, target file path) pairs
+
+        Return: None
+        """
+
+        with io_stats.open_file(manifest_path + ".tmp", "w") as f:
+            for temporary_path, target_path in renames:
+                f.write(f"{temporary_path}\t{target_path}\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(manifest_path + ".tmp", manifest_path)
+        UnitOfWork.recover(manifest_path)
+
+    @staticmethod
+    def __write_file(file_path: str, data: bytes) -> None:
+        """
+        Durably write packed records to a binary file.
+
+        Args:
+            file_path (str): file path of binary file
+            data (bytes): packed records
+
+        Return: None
+        """
+
+        try:
+            f = io_stats.open_file(file_path, "wb")
+        except IOError:
+            raise RepoError(f"ERROR: path '{file_path}' does not exist..")
+
+        with f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def __map_file(file_path: str) -> BinaryRecords:
+        """
+        Memory-map a binary file read-only.
+
+        Args:
+            file_path (str): file path of binary file
+
+        Return: BinaryRecords
+        """
+
+        try:
+            f = io_stats.open_file(file_path, "rb")
+        except IOError:
+            raise RepoError(f"ERROR: path '{file_path}' does not exist..")
+
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return BinaryRecords(b"")
+            return BinaryRecords(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __unmap_files(self) -> None:
+        """
+        Close the memory maps of both binary files.
+
+        Args: None
+
+        Return: None
+        """
+
+        for records in (self.__by_person, self.__by_event):
+            if isinstance(records.get_buffer(), mmap.mmap):
+                records.get_buffer().close()
+
+        self.__by_person = BinaryRecords(b"")
+        self.__by_event = BinaryRecords(b"")
+
+    def __map_files(self) -> None:
+        """
+        Memory-map both binary files again if they changed since they were mapped.
+
+        Args: None
+
+        Return: None
+        """
+
+        if self.__in_transaction or self.__cache.is_fresh():
+            return
+
+        self.__unmap_files()
+        self.__by_person = self.__map_file(self.__file_path)
+        self.__by_event = self.__map_file(self.__event_file_path)
+        self.__cache.mark_loaded()
+
+    def __replace(self, by_person: bytes, by_event: bytes) -> None:
+        """
+        Write new contents of both binary files and map them.
+
+        Outside a transaction both files are renamed over their targets at once through the manifest;
+        inside one they stay next to their targets until the UnitOfWork commits.
+
+        Args:
+            by_person (bytes): packed records sorted by person
+            by_event (bytes): packed records sorted by event
+
+        Return: None
+        """
+
+        self.__unmap_files()
+        self.__write_file(self.__file_path + ".tmp", by_person)
+        self.__write_file(self.__event_file_path + ".tmp", by_event)
+
+        if self.__in_transaction:
+            self.__dirty = True
+            self.__by_person = self.__map_file(self.__file_path + ".tmp")
+            self.__by_event = self.__map_file(self.__event_file_path + ".tmp")
+            return
+
+        self.__commit_renames(self.__manifest_path, self.__renames())
+        self.__cache.invalidate()
+        self.__map_files()
+
+    def __renames(self) -> list:
+        """
+        Return (temporary file path, target file path) pairs of both binary files.
+
+        Args: None
+
+        Return: list
+        """
+
+        return [(self.__file_path + ".tmp", self.__file_path),
+                (self.__event_file_path + ".tmp", self.__event_file_path)]
+
+    def begin_transaction(self) -> None:
+        """
+        Map both binary files and stage all following changes in temporary files.
+
+        Args: None
+
+        Return: None
+        """
+
+        if self.__in_transaction:
+            raise RepoError("ERROR: transaction already in progress...")
+
+        self.__map_files()
+        self.__in_transaction = True
+        self.__dirty = False
+
+    def prepare_commit(self) -> list:
+        """
+        Return the staged temporary files to rename on commit.
+
+        Args: None
+
+        Return: list of (temporary file path, target file path) pairs
+        """
+
+        if not self.__in_transaction or not self.__dirty:
+            return []
+
+        self.__unmap_files()
+
+        return self.__renames()
+
+    def end_transaction(self, committed: bool) -> None:
+        """
+        Leave transaction mode; staged changes are dropped unless they were committed.
+
+        Args:
+            committed (bool): whether the staged files were renamed over the binary files
+
+        Return: None
+        """
+
+        self.__unmap_files()
+
+        if not committed:
+            for temporary_path, _ in self.__renames():
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+
+        self.__in_transaction = False
+        self.__dirty = False
+        self.__cache.invalidate()
+
+    def store(self, person_event: PersonEvent, exist_ok: bool = False) -> bool:
+        """
+        Add PersonEvent object to the binary files.
+
+        Args:
+            person_event (PersonEvent): PersonEvent object to add
+            exist_ok (bool): silently ignore an already stored attendance instead of raising
+
+        Return: bool (True if the attendance was added)
+        """
+
+        self.__map_files()
+        person_id, event_id = person_event.get_key()
+        check_ids(person_id, event_id)
+
+        if self.__by_person.find((person_id, event_id)) != -1:
+            if exist_ok:
+                return False
+            raise RepoError("ERROR: person already attends the event...")
+
+        person_index = bisect.bisect_left(self.__by_person, (person_id, event_id))
+        event_index = bisect.bisect_left(self.__by_event, (event_id, person_id))
+        self.__replace(self.__by_person.inserted(person_index, (person_id, event_id)),
+                       self.__by_event.inserted(event_index, (event_id, person_id)))
+
+        return True
+
+    def store_all(self, person_events: list) -> list:
+        """
+        Add PersonEvent objects that are not stored yet to the binary files with a single rewrite.
+
+        The new records are sorted and merged with the stored ones in one pass over each file.
+
+        Args:
+            person_events (list): PersonEvent objects to add
+
+        Return: list (the PersonEvent objects that were added)
+        """
+
+        self.__map_files()
+        added = {}
+
+        for person_event in person_events:
+            check_ids(*person_event.get_key())
+
+        for person_event in person_events:
+            key = person_event.get_key()
+            if key not in added and self.__by_person.find(key) == -1:
+                added[key] = person_event
+
+        if len(added) == 0:
+            return []
+
+        new_by_person = sorted(added)
+        new_by_event = sorted((event_id, person_id) for person_id, event_id in added)
+        self.__replace(self.__merged(self.__by_person, new_by_person), self.__merged(self.__by_event, new_by_event))
+
+        return list(added.values())
+
+    @staticmethod
+    def __merged(records: BinaryRecords, new_records: list) -> bytes:
+        """
+        Return the packed stored records merged with sorted new records.
+
+        Args:
+            records (BinaryRecords): sorted stored records
+            new_records (list): sorted records to add
+
+        Return: bytes
+        """
+
+        merged = heapq.merge(RECORD.iter_unpack(records.get_buffer()), new_records)
+
+        return b"".join(RECORD.pack(*record) for record in merged)
+
+    def iter_person_events(self):
+        """
+        Yield stored PersonEvent objects, by person.
+
+        Args: None
+
+        Return: generator of PersonEvent objects
+        """
+
+        self.__map_files()
+        for person_id, event_id in RECORD.iter_unpack(self.__by_person.get_buffer()):
+            yield PersonEvent(person_id, event_id)
+
+    def get_person_events(self, person: Person) -> list:
+        """
+        Return ids of Event objects Person object attends, ascending.
+
+        Args:
+            person (Person): Person object to search attending Event objects
+
+        Return: list
+        """
+
+        self.__map_files()
+        start, end = self.__by_person.find_range(person.get_id())
+
+        return self.__by_person.second_values(start, end)
+
+    def get_event_persons(self, event: Event) -> list:
+        """
+        Return ids of Person objects attending Event object, ascending.
+
+        Args:
+            event (Event): Event object to search attending Person objects
+
+        Return: list
+        """
+
+        self.__map_files()
+        start, end = self.__by_event.find_range(event.get_id())
+
+        return self.__by_event.second_values(start, end)
+
+    def count_person_events(self, person: Person) -> int:
+        """
+        Return number of Event objects Person object attends.
+
+        Args:
+            person (Person): Person object
+
+        Return: int
+        """
+
+        self.__map_files()
+        start, end = self.__by_person.find_range(person.get_id())
+
+        return end - start
+
+    def count_event_persons(self, event: Event) -> int:
+        """
+        Return number of Person objects attending Event object.
+
+        Args:
+            event (Event): Event object
+
+        Return: int
+        """
+
+        self.__map_files()
+        start, end = self.__by_event.find_range(event.get_id())
+
+        return end - start
+
+    @staticmethod
+    def __count_runs(records: BinaryRecords) -> dict:
+        """
+        Return number of records of every first value of sorted records.
+
+        Args:
+            records (BinaryRecords): sorted records
+
+        Return: dict
+        """
+
+        counts = {}
+        for key, _ in RECORD.iter_unpack(records.get_buffer()):
+            counts[key] = counts.get(key, 0) + 1
+
+        return counts
+
+    def get_person_event_counts(self) -> dict:
+        """
+        Return number of attended Event objects for every Person id attending at least one.
+
+        Args: None
+
+        Return: dict
+        """
+
+        self.__map_files()
+        return self.__count_runs(self.__by_person)
+
+    def get_event_person_counts(self) -> dict:
+        """
+        Return number of attending Person objects for every Event id attended at least once.
+
+        Args: None
+
+        Return: dict
+        """
+
+        self.__map_files()
+        return self.__count_runs(self.__by_event)
+
+    def delete(self, person_event: PersonEvent) -> None:
+        """
+        Delete PersonEvent object from the binary files.
+
+        Args:
+            person_event (PersonEvent): PersonEvent object to delete
+
+        Return: None
+        """
+
+        self.__map_files()
+        person_id, event_id = person_event.get_key()
+
+        person_index = self.__by_person.find((person_id, event_id))
+        if person_index == -1:
+            raise RepoError("ERROR: person does not attend the event...")
+
+        event_index = self.__by_event.find((event_id, person_id))
+        self.__replace(self.__by_person.without([person_index]), self.__by_event.without([event_index]))
+
+    def update_deleted_person(self, person: Person) -> None:
+        """
+        Update the binary files after Person object deletion.
+
+        Args:
+            person (Person): deleted Person object
+
+        Return: None
+        """
+
+        self.__map_files()
+        person_id = person.get_id()
+        start, end = self.__by_person.find_range(person_id)
+
+        if start == end:
+            return
+
+        event_indexes = [self.__by_event.find((event_id, person_id))
+                         for event_id in self.__by_person.second_values(start, end)]
+        self.__replace(self.__by_person.without(list(range(start, end))), self.__by_event.without(event_indexes))
+
+    def update_deleted_event(self, event: Event) -> None:
+        """
+        Update the binary files after Event object deletion.
+
+        Args:
+            event (Event): deleted Event object
+
+        Return: None
+        """
+
+        self.__map_files()
+        event_id = event.get_id()
+        start, end = self.__by_event.find_range(event_id)
+
+        if start == end:
+            return
+
+        person_indexes = [self.__by_person.find((person_id, event_id))
+                          for person_id in self.__by_event.second_values(start, end)]
+        self.__replace(self.__by_person.without(person_indexes), self.__by_event.without(list(range(start, end))))
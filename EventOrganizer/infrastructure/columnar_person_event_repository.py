@@ -0,0 +1,356 @@
+from exceptions.repo_exc import RepoError
+from infrastructure.file_cache import FileCache
+from infrastructure import io_stats
+import warnings
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Ids are kept as int32 and used as bincount indexes, so they must lie in this range.
+MAX_ID = 2 ** 31 - 1
+
+
+class ColumnarPersonEventRepository:
+
+    def __init__(self, file_path: str) -> None:
+        """
+        Constructor for ColumnarPersonEventRepository object.
+
+        Read-only view of 'person_event' text file (and its journal, if any) kept as two parallel
+        int32 arrays of person ids and event ids, so attendance aggregates are computed with
+        vectorized NumPy operations instead of Python loops over PersonEvent objects. The arrays
+        are loaded in bulk and loaded again only when the text files change.
+
+        Args:
+            file_path (str): file path of 'person_event' text file
+
+        Return: None
+        """
+
+        if numpy is None:
+            raise RepoError("ERROR: columnar analytics require the 'numpy' package...")
+
+        self.__file_path = file_path
+        self.__journal_path = file_path + ".journal"
+        self.__cache = FileCache(file_path, self.__journal_path)
+        self.__person_ids = numpy.zeros(0, dtype=numpy.int32)
+        self.__event_ids = numpy.zeros(0, dtype=numpy.int32)
+        self.__person_counts = None
+        self.__event_counts = None
+
+    @staticmethod
+    def __encode(person_ids, event_ids):
+        """
+        Combine (person_id, event_id) columns into one int64 key per attendance.
+
+        Args:
+            person_ids (numpy.ndarray): person ids
+            event_ids (numpy.ndarray): event ids
+
+        Return: numpy.ndarray
+        """
+
+        return (person_ids.astype(numpy.int64) << 32) | event_ids.astype(numpy.int64)
+
+    def __read_person_event_from_file(self) -> None:
+        """
+        Load 'person_event' text file in bulk and apply its journal records, if the files changed.
+
+        Args: None
+
+        Return: None
+        """
+
+        if self.__cache.is_fresh():
+            return
+
+        try:
+            f = io_stats.open_file(self.__file_path, "r")
+        except IOError:
+            raise RepoError(f"ERROR: path '{self.__file_path}' does not exist..")
+
+        with f, warnings.catch_warnings():
+            # An empty file is an empty attendance, not worth numpy's "input contained no data" warning.
+            warnings.simplefilter("ignore", UserWarning)
+            try:
+                pairs = numpy.loadtxt(f, delimiter=",", dtype=numpy.int64, ndmin=2)
+            except ValueError as error:
+                raise RepoError(f"ERROR: '{self.__file_path}' is malformed ({error})...")
+
+        if pairs.size == 0:
+            pairs = pairs.reshape(0, 2)
+        elif pairs.shape[1] != 2:
+            raise RepoError(f"ERROR: '{self.__file_path}' is malformed (lines must be 'person_id,event_id')...")
+
+        person_ids = pairs[:, 0]
+        event_ids = pairs[:, 1]
+
+        journal = self.__read_journal()
+        if len(journal) > 0:
+            keys = numpy.fromiter(journal.keys(), dtype=numpy.int64, count=len(journal))
+            added = numpy.fromiter((key for key, sign in journal.items() if sign == "+"), dtype=numpy.int64)
+            kept = ~numpy.isin(self.__encode(person_ids, event_ids), keys)
+            person_ids = numpy.concatenate((person_ids[kept], added >> 32))
+            event_ids = numpy.concatenate((event_ids[kept], added & 0xFFFFFFFF))
+
+        for ids in (person_ids, event_ids):
+            if len(ids) > 0 and (int(ids.min()) < 0 or int(ids.max()) > MAX_ID):
+                raise RepoError(f"ERROR: ids of '{self.__file_path}' must be between 0 and {MAX_ID}...")
+
+        self.__person_ids = person_ids.astype(numpy.int32)
+        self.__event_ids = event_ids.astype(numpy.int32)
+        self.__person_counts = None
+        self.__event_counts = None
+        self.__cache.mark_loaded()
+
+    def __read_journal(self) -> dict:
+        """
+        Return the last '+' / '-' record of every attendance in the journal file.
+
+        Args: None
+
+        Return: dict
+        """
+
+        journal = {}
+
+        try:
+            f = io_stats.open_file(self.__journal_path, "r")
+        except IOError:
+            return journal
+
+        with f:
+            for line in f:
+                line = line.strip()
+                if line == "":
+                    continue
+
+                tokens = line.split(",")
+                try:
+                    journal[(int(tokens[1]) << 32) | int(tokens[2])] = tokens[0]
+                except (IndexError, ValueError):
+                    raise RepoError(f"ERROR: '{self.__journal_path}' is malformed at '{line}'...")
+
+        return journal
+
+    def __get_person_counts(self):
+        """
+        Return number of events of every person id, indexed by id.
+
+        Args: None
+
+        Return: numpy.ndarray
+        """
+
+        self.__read_person_event_from_file()
+        if self.__person_counts is None:
+            self.__person_counts = numpy.bincount(self.__person_ids)
+
+        return self.__person_counts
+
+    def __get_event_counts(self):
+        """
+        Return number of persons of every event id, indexed by id.
+
+        Args: None
+
+        Return: numpy.ndarray
+        """
+
+        self.__read_person_event_from_file()
+        if self.__event_counts is None:
+            self.__event_counts = numpy.bincount(self.__event_ids)
+
+        return self.__event_counts
+
+    @staticmethod
+    def __count(counts, identifier: int) -> int:
+        """
+        Return count of an id, 0 for ids without attendances.
+
+        Args:
+            counts (numpy.ndarray): counts indexed by id
+            identifier (int): id
+
+        Return: int
+        """
+
+        if 0 <= identifier < len(counts):
+            return int(counts[identifier])
+
+        return 0
+
+    @staticmethod
+    def __top(counts, k: int, include_ties: bool = False) -> list:
+        """
+        Return the k ids with the greatest counts, best first, ties broken by smallest id.
+
+        Time Complexity:
+            O(n + k log k)
+
+        Args:
+            counts (numpy.ndarray): counts indexed by id
+            k (int): number of ids to return
+            include_ties (bool): also return the ids tied with the last selected one
+
+        Return: list of (id, count) tuples
+        """
+
+        k = min(k, int(numpy.count_nonzero(counts)))
+        if k <= 0:
+            return []
+
+        ids = numpy.arange(len(counts), dtype=numpy.int64)
+        keys = counts.astype(numpy.int64) * len(counts) + (len(counts) - 1 - ids)
+        best = numpy.argpartition(-keys, k - 1)[:k]
+        if include_ties:
+            best = numpy.flatnonzero(counts >= counts[best].min())
+        best = best[numpy.argsort(-keys[best])]
+
+        return [(int(identifier), int(counts[identifier])) for identifier in best]
+
+    @staticmethod
+    def __as_dict(counts) -> dict:
+        """
+        Return the non-zero counts as a dictionary.
+
+        Args:
+            counts (numpy.ndarray): counts indexed by id
+
+        Return: dict
+        """
+
+        ids = numpy.flatnonzero(counts)
+
+        return dict(zip(ids.tolist(), counts[ids].tolist()))
+
+    def get_size(self) -> int:
+        """
+        Return number of attendances.
+
+        Args: None
+
+        Return: int
+        """
+
+        self.__read_person_event_from_file()
+        return len(self.__person_ids)
+
+    def count_person_events(self, person_id: int) -> int:
+        """
+        Return number of events attended by a person.
+
+        Args:
+            person_id (int): id of Person object
+
+        Return: int
+        """
+
+        return self.__count(self.__get_person_counts(), person_id)
+
+    def count_event_persons(self, event_id: int) -> int:
+        """
+        Return number of persons attending an event.
+
+        Args:
+            event_id (int): id of Event object
+
+        Return: int
+        """
+
+        return self.__count(self.__get_event_counts(), event_id)
+
+    def get_person_event_counts(self) -> dict:
+        """
+        Return number of events of every person with attendances.
+
+        Args: None
+
+        Return: dict
+        """
+
+        return self.__as_dict(self.__get_person_counts())
+
+    def get_event_person_counts(self) -> dict:
+        """
+        Return number of persons of every event with attendances.
+
+        Args: None
+
+        Return: dict
+        """
+
+        return self.__as_dict(self.__get_event_counts())
+
+    def top_persons(self, k: int, include_ties: bool = False) -> list:
+        """
+        Return the k persons attending most events, best first.
+
+        Args:
+            k (int): number of persons
+            include_ties (bool): also return the persons tied with the last one
+
+        Return: list of (person_id, count) tuples
+        """
+
+        return self.__top(self.__get_person_counts(), k, include_ties)
+
+    def top_events(self, k: int, include_ties: bool = False) -> list:
+        """
+        Return the k events with most persons, best first.
+
+        Args:
+            k (int): number of events
+            include_ties (bool): also return the events tied with the last one
+
+        Return: list of (event_id, count) tuples
+        """
+
+        return self.__top(self.__get_event_counts(), k, include_ties)
+
+    def persons_attending_at_least(self, count: int) -> list:
+        """
+        Return ids of the persons attending at least 'count' events, ascending.
+
+        Args:
+            count (int): minimum number of events
+
+        Return: list
+        """
+
+        counts = self.__get_person_counts()
+
+        return numpy.flatnonzero((counts >= count) & (counts > 0)).tolist()
+
+    def count_by_event_date(self, event_dates: dict) -> dict:
+        """
+        Return number of attendances of every date.
+
+        Args:
+            event_dates (dict): date key (see Event.get_date_key) of every event id
+
+        Return: dict of date key -> number of attendances
+        """
+
+        self.__read_person_event_from_file()
+
+        if len(event_dates) == 0 or len(self.__event_ids) == 0:
+            return {}
+
+        size = max(max(event_dates), int(self.__event_ids.max())) + 1
+        dates = numpy.full(size, -1, dtype=numpy.int64)
+        dates[numpy.fromiter(event_dates.keys(), dtype=numpy.int64, count=len(event_dates))] = \
+            numpy.fromiter(event_dates.values(), dtype=numpy.int64, count=len(event_dates))
+
+        attendance_dates = dates[self.__event_ids]
+        attendance_dates = attendance_dates[attendance_dates >= 0]
+        if len(attendance_dates) == 0:
+            return {}
+
+        first = int(attendance_dates.min())
+        counts = numpy.bincount(attendance_dates - first)
+        keys = numpy.flatnonzero(counts)
+
+        return dict(zip((keys + first).tolist(), counts[keys].tolist()))
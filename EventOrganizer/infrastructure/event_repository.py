@@ -1,5 +1,12 @@
 from domain.event import Event
 from exceptions.repo_exc import RepoError
+from infrastructure.file_cache import FileCache
+from infrastructure.text_index import InvertedIndex
+from infrastructure import text_index
+from infrastructure import sqlite_connection
+from infrastructure import io_stats
+import bisect
+import os
 
 
 class EventRepository:
@@ -8,6 +15,10 @@ class EventRepository:
         """
         Constructor for EventRepository object.
 
+        Besides the Event objects by id, a chronological index of (timestamp, id) pairs sorted by
+        date and time is kept up to date, so date-range queries are answered by bisection, and an
+        inverted index maps the words of the descriptions to event ids for text search.
+
         Args: None
 
         Return: None
@@ -16,6 +27,67 @@ class EventRepository:
         self._events = {
 
         }
+        self._chronology = [
+
+        ]
+        self._descriptions = InvertedIndex()
+
+    def _clear_events(self) -> None:
+        """
+        Remove all Event objects and their indexes.
+
+        Args: None
+
+        Return: None
+        """
+
+        self._events.clear()
+        self._chronology.clear()
+        self._descriptions.clear()
+
+    def _put_event(self, event: Event) -> None:
+        """
+        Store Event object and index it, replacing the stored Event object with the same id.
+
+        Args:
+            event (Event): Event object to store
+
+        Return: None
+        """
+
+        event_id = event.get_id()
+        if event_id in self._events:
+            self._drop_event(event_id)
+
+        self._events[event_id] = event
+        self._descriptions.add(event_id, event.get_description())
+
+        try:
+            bisect.insort(self._chronology, (event.get_timestamp(), event_id))
+        except ValueError:
+            pass
+
+    def _drop_event(self, event_id: int) -> None:
+        """
+        Remove stored Event object and its index entries.
+
+        Args:
+            event_id (int): id of stored Event object
+
+        Return: None
+        """
+
+        event = self._events.pop(event_id)
+        self._descriptions.remove(event_id, event.get_description())
+
+        try:
+            entry = (event.get_timestamp(), event_id)
+        except ValueError:
+            return
+
+        index = bisect.bisect_left(self._chronology, entry)
+        if index < len(self._chronology) and self._chronology[index] == entry:
+            del self._chronology[index]
 
     def add_event(self, event: Event) -> None:
         """
@@ -27,10 +99,10 @@ class EventRepository:
         Return: None
         """
 
-        if id in self._events.keys():
+        if event.get_id() in self._events.keys():
             raise RepoError("ERROR: event already exists...")
 
-        self._events[event.get_id()] = event
+        self._put_event(event)
 
     def get_events(self) -> list:
         """
@@ -43,6 +115,17 @@ class EventRepository:
 
         return [self._events[identifier] for identifier in self._events.keys()]
 
+    def iter_events(self):
+        """
+        Yield Event objects from 'events' one at a time.
+
+        Args: None
+
+        Return: generator of Event objects
+        """
+
+        yield from self._events.values()
+
     def delete_event(self, event) -> None:
         """
         Delete Event object from 'events'.
@@ -57,7 +140,7 @@ class EventRepository:
         if event_id not in self._events.keys():
             raise RepoError("ERROR: event does not exist...")
 
-        self._events.pop(event_id)
+        self._drop_event(event_id)
 
     def modify_event(self, event: Event) -> None:
         """
@@ -73,7 +156,7 @@ class EventRepository:
         if event_id not in self._events.keys():
             raise RepoError("ERROR: event does not exist...")
 
-        self._events[event.get_id()] = event
+        self._put_event(event)
 
     def search_event(self, id: int) -> Event:
         """
@@ -90,21 +173,110 @@ class EventRepository:
 
         return self._events[id]
 
+    def search_events(self, ids: list) -> list:
+        """
+        Search several Event objects in 'events' at once.
+
+        Args:
+            ids (list): ids of Event objects to search
+
+        Return: list
+        """
+
+        events = []
+
+        for id in ids:
+            if id not in self._events.keys():
+                raise RepoError("ERROR: event does not exist...")
+            events.append(self._events[id])
+
+        return events
+
+    def events_between(self, start: int, end: int) -> list:
+        """
+        Return Event objects taking place between two timestamps (inclusive), chronologically.
+
+        Time Complexity:
+            O(log n + k)
+
+        Args:
+            start (int): first timestamp (see Event.get_timestamp)
+            end (int): last timestamp (see Event.get_timestamp)
+
+        Return: list
+        """
+
+        first = bisect.bisect_left(self._chronology, (start,))
+        last = bisect.bisect_left(self._chronology, (end + 1,))
+
+        return [self._events[event_id] for _, event_id in self._chronology[first:last]]
+
+    def upcoming_events(self, start: int, count: int) -> list:
+        """
+        Return the next Event objects taking place from a timestamp on, chronologically.
+
+        Time Complexity:
+            O(log n + count)
+
+        Args:
+            start (int): timestamp to search from (see Event.get_timestamp)
+            count (int): maximum number of Event objects to return
+
+        Return: list
+        """
+
+        first = bisect.bisect_left(self._chronology, (start,))
+
+        return [self._events[event_id] for _, event_id in self._chronology[first:first + count]]
+
+    def search_events_text(self, query: str) -> list:
+        """
+        Return Event objects whose description matches a text query, by id.
+
+        Words of the query must all appear in the description, 'OR' separates alternative groups of
+        words and a trailing '*' matches any word starting with it (e.g. 'kitsch party OR hack*').
+
+        Args:
+            query (str): text query
+
+        Return: list
+        """
+
+        return [self._events[event_id] for event_id in self._descriptions.search(query)]
+
 
 class FileEventRepository(EventRepository):
 
-    def __init__(self, file_path: str) -> None:
+    def __init__(self, file_path: str, cached: bool = False) -> None:
         """
         Constructor for FileEventRepository object.
 
         Args:
             file_path (str): file path of text file
+            cached (bool): keep parsed data in memory until the text file changes
 
         Return: None
         """
 
         EventRepository.__init__(self)
         self.__file_path = file_path
+        self.__cache = FileCache(file_path) if cached else None
+        self.__in_transaction = False
+        self.__dirty = False
+
+    def get_cache_stats(self) -> dict:
+        """
+        Return hit/miss counters of the in-memory cache.
+
+        Args: None
+
+        Return: dict
+        """
+
+        if self.__cache is None:
+            return {"enabled": False, "hits": 0, "misses": 0}
+
+        return self.__cache.get_stats()
 
     def __read_events_from_file(self) -> None:
         """
@@ -115,12 +287,18 @@ class FileEventRepository(EventRepository):
         Return: None
         """
 
+        if self.__in_transaction:
+            return
+
+        if self.__cache is not None and self.__cache.is_fresh():
+            return
+
         try:
-            f = open(self.__file_path, "r")
+            f = io_stats.open_file(self.__file_path, "r")
         except IOError:
             raise RepoError(f"ERROR: path '{self.__file_path}' does not exist..")
 
-        self._events.clear()
+        self._clear_events()
         lines = f.readlines()
 
         for line in lines:
@@ -132,29 +310,108 @@ class FileEventRepository(EventRepository):
                 event_time = tokens[2]
                 event_description = tokens[3]
                 event = Event(event_id, event_date, event_time, event_description)
-                self._events[event_id] = event
+                self._put_event(event)
 
         f.close()
 
-    def __write_events_to_file(self) -> None:
+        if self.__cache is not None:
+            self.__cache.mark_loaded()
+
+    def __write_snapshot(self, file_path: str, durable: bool = False) -> None:
         """
-        Write data to 'events' text file.
+        Write data of 'events' to given text file.
 
-        Args: None
+        Args:
+            file_path (str): file path of text file
+            durable (bool): flush the file to disk before returning
 
         Return: None
         """
 
         try:
-            f = open(self.__file_path, "w")
+            f = io_stats.open_file(file_path, "w")
         except IOError:
-            raise RepoError(f"ERROR: path '{self.__file_path}' does not exist..")
+            raise RepoError(f"ERROR: path '{file_path}' does not exist..")
 
         for event in self._events.values():
             f.write(f"{event.get_id()},{event.get_date()},{event.get_time()},{event.get_description()}" + "\n")
 
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
         f.close()
 
+    def __write_events_to_file(self) -> None:
+        """
+        Write data to 'events' text file, or only mark it as changed inside a transaction.
+
+        Args: None
+
+        Return: None
+        """
+
+        if self.__in_transaction:
+            self.__dirty = True
+            return
+
+        self.__write_snapshot(self.__file_path)
+
+        if self.__cache is not None:
+            self.__cache.mark_written()
+
+    def begin_transaction(self) -> None:
+        """
+        Load 'events' text file once and stage all following changes in memory.
+
+        Args: None
+
+        Return: None
+        """
+
+        if self.__in_transaction:
+            raise RepoError("ERROR: transaction already in progress...")
+
+        self.__read_events_from_file()
+        self.__in_transaction = True
+        self.__dirty = False
+
+    def prepare_commit(self) -> list:
+        """
+        Write staged changes to a temporary file next to 'events' text file.
+
+        Args: None
+
+        Return: list of (temporary file path, text file path) pairs to rename on commit
+        """
+
+        if not self.__in_transaction or not self.__dirty:
+            return []
+
+        temporary_path = self.__file_path + ".tmp"
+        self.__write_snapshot(temporary_path, durable=True)
+
+        return [(temporary_path, self.__file_path)]
+
+    def end_transaction(self, committed: bool) -> None:
+        """
+        Leave transaction mode; staged changes are dropped unless they were committed.
+
+        Args:
+            committed (bool): whether the staged changes were written to the text file
+
+        Return: None
+        """
+
+        self.__in_transaction = False
+        self.__dirty = False
+
+        if self.__cache is not None:
+            if committed:
+                self.__cache.mark_written()
+            else:
+                self.__cache.invalidate()
+
     def add_event(self, event: Event) -> None:
         """
         Add Event object to 'events' text file.
@@ -181,6 +438,36 @@ class FileEventRepository(EventRepository):
         self.__read_events_from_file()
         return EventRepository.get_events(self)
 
+    def iter_events(self):
+        """
+        Yield Event objects from 'events' text file one at a time.
+
+        The file is streamed line by line, so memory stays bounded regardless of its size;
+        already cached data is served from memory instead.
+
+        Args: None
+
+        Return: generator of Event objects
+        """
+
+        if self.__in_transaction or (self.__cache is not None and self.__cache.is_fresh()):
+            yield from EventRepository.iter_events(self)
+            return
+
+        try:
+            f = io_stats.open_file(self.__file_path, "r")
+        except IOError:
+            raise RepoError(f"ERROR: path '{self.__file_path}' does not exist..")
+
+        with f:
+            for line in f:
+                line = line.strip()
+                if line == "":
+                    continue
+
+                tokens = line.split(",")
+                yield Event(int(tokens[0]), tokens[1], tokens[2], tokens[3])
+
     def delete_event(self, event: Event) -> None:
         """
         Delete Event object from 'events' text file.
@@ -220,4 +507,383 @@ class FileEventRepository(EventRepository):
         """
 
         self.__read_events_from_file()
-        return EventRepository.search_event(self, event_id)
\ No newline at end of file
+        return EventRepository.search_event(self, event_id)
+
+    def search_events(self, ids: list) -> list:
+        """
+        Search several Event objects in 'events' text file with a single read.
+
+        Args:
+            ids (list): ids of Event objects to search
+
+        Return: list
+        """
+
+        self.__read_events_from_file()
+        return EventRepository.search_events(self, ids)
+
+    def events_between(self, start: int, end: int) -> list:
+        """
+        Return Event objects from 'events' text file taking place between two timestamps (inclusive).
+
+        Args:
+            start (int): first timestamp (see Event.get_timestamp)
+            end (int): last timestamp (see Event.get_timestamp)
+
+        Return: list
+        """
+
+        self.__read_events_from_file()
+        return EventRepository.events_between(self, start, end)
+
+    def upcoming_events(self, start: int, count: int) -> list:
+        """
+        Return the next Event objects from 'events' text file taking place from a timestamp on.
+
+        Args:
+            start (int): timestamp to search from (see Event.get_timestamp)
+            count (int): maximum number of Event objects to return
+
+        Return: list
+        """
+
+        self.__read_events_from_file()
+        return EventRepository.upcoming_events(self, start, count)
+
+    def search_events_text(self, query: str) -> list:
+        """
+        Return Event objects from 'events' text file whose description matches a text query.
+
+        Args:
+            query (str): text query (see EventRepository.search_events_text)
+
+        Return: list
+        """
+
+        self.__read_events_from_file()
+        return EventRepository.search_events_text(self, query)
+
+
+class SqliteEventRepository:
+
+    def __init__(self, connection) -> None:
+        """
+        Constructor for SqliteEventRepository object.
+
+        Args:
+            connection (sqlite3.Connection): connection returned by 'sqlite_connection.connect'
+
+        Return: None
+        """
+
+        self.__connection = connection
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            "id INTEGER PRIMARY KEY, date TEXT NOT NULL, time TEXT NOT NULL, description TEXT NOT NULL, "
+            "timestamp INTEGER)")
+        self.__add_timestamp_column()
+        self.__connection.execute("CREATE INDEX IF NOT EXISTS events_by_timestamp ON events (timestamp, id)")
+        self.__create_terms()
+
+    def __create_terms(self) -> None:
+        """
+        Create the 'event_terms' inverted index of descriptions and fill it for existing events.
+
+        Args: None
+
+        Return: None
+        """
+
+        exists = self.__connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'event_terms'").fetchone()
+        if exists is not None:
+            return
+
+        sqlite_connection.begin_transaction(self.__connection)
+        self.__connection.execute(
+            "CREATE TABLE event_terms ("
+            "term TEXT NOT NULL, event_id INTEGER NOT NULL, PRIMARY KEY (term, event_id)) WITHOUT ROWID")
+        self.__connection.execute("CREATE INDEX event_terms_by_event ON event_terms (event_id)")
+        for row in self.__connection.execute("SELECT id, description FROM events").fetchall():
+            self.__index_terms(row[0], row[1])
+        sqlite_connection.end_transaction(self.__connection, True)
+
+    def __index_terms(self, event_id: int, description: str) -> None:
+        """
+        Store the words of an event description in 'event_terms'.
+
+        Args:
+            event_id (int): id of Event object
+            description (str): description of Event object
+
+        Return: None
+        """
+
+        self.__connection.executemany("INSERT OR IGNORE INTO event_terms (term, event_id) VALUES (?, ?)",
+                                      [(term, event_id) for term in set(text_index.tokenize(description))])
+
+    def __lookup_term(self, term: str) -> set:
+        """
+        Return the ids of the events whose description contains a term, or a word starting with it if it ends with '*'.
+
+        Args:
+            term (str): lowercase term
+
+        Return: set
+        """
+
+        if not term.endswith("*"):
+            rows = self.__connection.execute("SELECT event_id FROM event_terms WHERE term = ?", (term,))
+        else:
+            prefix = term[:-1]
+            upper_bound = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            rows = self.__connection.execute(
+                "SELECT event_id FROM event_terms WHERE term >= ? AND term < ?", (prefix, upper_bound))
+
+        return {row[0] for row in rows}
+
+    def __add_timestamp_column(self) -> None:
+        """
+        Add and fill the 'timestamp' column of 'events' tables created before it existed.
+
+        Args: None
+
+        Return: None
+        """
+
+        columns = [row[1] for row in self.__connection.execute("PRAGMA table_info(events)")]
+        if "timestamp" in columns:
+            return
+
+        sqlite_connection.begin_transaction(self.__connection)
+        self.__connection.execute("ALTER TABLE events ADD COLUMN timestamp INTEGER")
+        rows = self.__connection.execute("SELECT id, date, time, description FROM events").fetchall()
+        self.__connection.executemany("UPDATE events SET timestamp = ? WHERE id = ?",
+                                      [(self.__timestamp(Event(row[0], row[1], row[2], row[3])), row[0])
+                                       for row in rows])
+        sqlite_connection.end_transaction(self.__connection, True)
+
+    @staticmethod
+    def __timestamp(event: Event):
+        """
+        Return timestamp of Event object, or None if its date or time cannot be parsed.
+
+        Args:
+            event (Event): Event object
+
+        Return: int or None
+        """
+
+        try:
+            return event.get_timestamp()
+        except ValueError:
+            return None
+
+    def add_event(self, event: Event) -> None:
+        """
+        Add Event object to 'events' table.
+
+        Args:
+            event (Event): Event object to add
+
+        Return: None
+        """
+
+        if self.__connection.execute("SELECT 1 FROM events WHERE id = ?", (event.get_id(),)).fetchone() is not None:
+            raise RepoError("ERROR: event already exists...")
+
+        def write() -> None:
+            self.__connection.execute(
+                "INSERT INTO events (id, date, time, description, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (event.get_id(), event.get_date(), event.get_time(), event.get_description(), self.__timestamp(event)))
+            self.__index_terms(event.get_id(), event.get_description())
+
+        sqlite_connection.write_atomically(self.__connection, write)
+
+    def get_events(self) -> list:
+        """
+        Return Event objects from 'events' table.
+
+        Args: None
+
+        Return: list
+        """
+
+        return list(self.iter_events())
+
+    def iter_events(self):
+        """
+        Yield Event objects from 'events' table one at a time.
+
+        Args: None
+
+        Return: generator of Event objects
+        """
+
+        for row in self.__connection.execute("SELECT id, date, time, description FROM events ORDER BY id"):
+            yield Event(row[0], row[1], row[2], row[3])
+
+    def delete_event(self, event: Event) -> None:
+        """
+        Delete Event object from 'events' table.
+
+        Args:
+            event (Event): Event object to delete
+
+        Return: None
+        """
+
+        def write() -> None:
+            cursor = self.__connection.execute("DELETE FROM events WHERE id = ?", (event.get_id(),))
+            if cursor.rowcount == 0:
+                raise RepoError("ERROR: event does not exist...")
+
+            self.__connection.execute("DELETE FROM event_terms WHERE event_id = ?", (event.get_id(),))
+
+        sqlite_connection.write_atomically(self.__connection, write)
+
+    def modify_event(self, event: Event) -> None:
+        """
+        Modify Event object attributes in 'events' table.
+
+        Args:
+            event (Event): Event object to modify
+
+        Return: None
+        """
+
+        def write() -> None:
+            cursor = self.__connection.execute(
+                "UPDATE events SET date = ?, time = ?, description = ?, timestamp = ? WHERE id = ?",
+                (event.get_date(), event.get_time(), event.get_description(), self.__timestamp(event), event.get_id()))
+            if cursor.rowcount == 0:
+                raise RepoError("ERROR: event does not exist...")
+
+            self.__connection.execute("DELETE FROM event_terms WHERE event_id = ?", (event.get_id(),))
+            self.__index_terms(event.get_id(), event.get_description())
+
+        sqlite_connection.write_atomically(self.__connection, write)
+
+    def search_event(self, id: int) -> Event:
+        """
+        Search Event object in 'events' table.
+
+        Args:
+            id (int): id of Event object to search
+
+        Return: Event
+        """
+
+        row = self.__connection.execute("SELECT id, date, time, description FROM events WHERE id = ?",
+                                        (id,)).fetchone()
+        if row is None:
+            raise RepoError("ERROR: event does not exist...")
+
+        return Event(row[0], row[1], row[2], row[3])
+
+    def search_events(self, ids: list) -> list:
+        """
+        Search several Event objects in 'events' table with a single query.
+
+        Args:
+            ids (list): ids of Event objects to search
+
+        Return: list
+        """
+
+        events = {}
+        unique_ids = list(dict.fromkeys(ids))
+
+        for start in range(0, len(unique_ids), sqlite_connection.SQLITE_MAX_PARAMETERS):
+            chunk = unique_ids[start:start + sqlite_connection.SQLITE_MAX_PARAMETERS]
+            placeholders = ",".join("?" * len(chunk))
+            query = f"SELECT id, date, time, description FROM events WHERE id IN ({placeholders})"
+            for row in self.__connection.execute(query, chunk):
+                events[row[0]] = Event(row[0], row[1], row[2], row[3])
+
+        if len(events) != len(unique_ids):
+            raise RepoError("ERROR: event does not exist...")
+
+        return [events[id] for id in ids]
+
+    def events_between(self, start: int, end: int) -> list:
+        """
+        Return Event objects from 'events' table taking place between two timestamps (inclusive).
+
+        Args:
+            start (int): first timestamp (see Event.get_timestamp)
+            end (int): last timestamp (see Event.get_timestamp)
+
+        Return: list
+        """
+
+        rows = self.__connection.execute(
+            "SELECT id, date, time, description FROM events WHERE timestamp BETWEEN ? AND ? ORDER BY timestamp, id",
+            (start, end))
+
+        return [Event(row[0], row[1], row[2], row[3]) for row in rows]
+
+    def upcoming_events(self, start: int, count: int) -> list:
+        """
+        Return the next Event objects from 'events' table taking place from a timestamp on.
+
+        Args:
+            start (int): timestamp to search from (see Event.get_timestamp)
+            count (int): maximum number of Event objects to return
+
+        Return: list
+        """
+
+        rows = self.__connection.execute(
+            "SELECT id, date, time, description FROM events WHERE timestamp >= ? ORDER BY timestamp, id LIMIT ?",
+            (start, count))
+
+        return [Event(row[0], row[1], row[2], row[3]) for row in rows]
+
+    def search_events_text(self, query: str) -> list:
+        """
+        Return Event objects from 'events' table whose description matches a text query, by id.
+
+        Args:
+            query (str): text query (see EventRepository.search_events_text)
+
+        Return: list
+        """
+
+        event_ids = text_index.match(text_index.parse_query(query), self.__lookup_term)
+
+        return self.search_events(event_ids)
+
+    def begin_transaction(self) -> None:
+        """
+        Open a transaction on the shared connection, if none is open yet.
+
+        Args: None
+
+        Return: None
+        """
+
+        sqlite_connection.begin_transaction(self.__connection)
+
+    def prepare_commit(self) -> list:
+        """
+        Nothing to stage on disk, SQLite commits the transaction itself.
+
+        Args: None
+
+        Return: list
+        """
+
+        return []
+
+    def end_transaction(self, committed: bool) -> None:
+        """
+        Commit or roll back the transaction of the shared connection, if still open.
+
+        Args:
+            committed (bool): whether the staged changes must be kept
+
+        Return: None
+        """
+
+        sqlite_connection.end_transaction(self.__connection, committed)
\ No newline at end of file
@@ -0,0 +1,111 @@
+import os
+
+
+class FileCache:
+
+    def __init__(self, *file_paths: str) -> None:
+        """
+        Constructor for FileCache object.
+
+        Args:
+            file_paths (str): file paths of the text files backing the cached data
+
+        Return: None
+        """
+
+        self.__file_paths = file_paths
+        self.__fingerprint = None
+        self.__observed = None
+        self.__hits = 0
+        self.__misses = 0
+
+    @staticmethod
+    def __stat_file(file_path: str):
+        """
+        Return (mtime, size, inode) fingerprint of a text file.
+
+        Args:
+            file_path (str): file path of text file
+
+        Return: tuple or None if the file does not exist
+        """
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def __stat(self) -> tuple:
+        """
+        Return fingerprints of all text files.
+
+        Args: None
+
+        Return: tuple
+        """
+
+        return tuple(self.__stat_file(file_path) for file_path in self.__file_paths)
+
+    def is_fresh(self) -> bool:
+        """
+        Check if the loaded data still matches the text files and count a hit or a miss.
+
+        Args: None
+
+        Return: bool
+        """
+
+        self.__observed = self.__stat()
+
+        if self.__fingerprint is not None and self.__observed == self.__fingerprint:
+            self.__hits += 1
+            return True
+
+        self.__misses += 1
+        return False
+
+    def mark_loaded(self) -> None:
+        """
+        Remember the fingerprint observed right before the text files were parsed.
+
+        Args: None
+
+        Return: None
+        """
+
+        self.__fingerprint = self.__observed
+
+    def mark_written(self) -> None:
+        """
+        Remember the fingerprint of the text file right after it was written.
+
+        Args: None
+
+        Return: None
+        """
+
+        self.__fingerprint = self.__stat()
+
+    def invalidate(self) -> None:
+        """
+        Force the next access to parse the text files again.
+
+        Args: None
+
+        Return: None
+        """
+
+        self.__fingerprint = None
+
+    def get_stats(self) -> dict:
+        """
+        Return hit/miss counters of the cache.
+
+        Args: None
+
+        Return: dict
+        """
+
+        return {"enabled": True, "hits": self.__hits, "misses": self.__misses}
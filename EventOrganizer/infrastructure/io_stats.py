@@ -0,0 +1,116 @@
+import builtins
+
+
+class IOCounters:
+
+    def __init__(self) -> None:
+        """
+        Constructor for IOCounters object.
+
+        Counts data files opened for reading and for writing by the repositories, and the bytes moved
+        between them and the operating system. Bytes of memory-mapped files are not counted, as pages
+        are only read when touched.
+
+        Args: None
+
+        Return: None
+        """
+
+        self.reads = 0
+        self.writes = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def snapshot(self) -> tuple:
+        """
+        Return current counters.
+
+        Args: None
+
+        Return: tuple (reads, writes, bytes read, bytes written)
+        """
+
+        return self.reads, self.writes, self.bytes_read, self.bytes_written
+
+
+COUNTERS = IOCounters()
+
+
+class CountedFile:
+
+    def __init__(self, f, writing: bool) -> None:
+        """
+        Constructor for CountedFile object.
+
+        Wraps an opened file and adds the bytes it moved to COUNTERS once it is closed. Every other
+        attribute (read, readlines, write, fileno, iteration...) is the one of the wrapped file.
+
+        Args:
+            f (file): opened file
+            writing (bool): whether the file was opened for writing or appending
+
+        Return: None
+        """
+
+        self.__file = f
+        self.__writing = writing
+        self.__raw = f.buffer.raw if hasattr(f, "buffer") else getattr(f, "raw", None)
+        self.__start = self.__raw.tell() if self.__raw is not None else 0
+
+    def __getattr__(self, name: str):
+        return getattr(self.__file, name)
+
+    def __iter__(self):
+        return iter(self.__file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the wrapped file and count its bytes.
+
+        Args: None
+
+        Return: None
+        """
+
+        if self.__file.closed:
+            return
+
+        if self.__raw is not None:
+            if self.__writing:
+                self.__file.flush()
+            moved = self.__raw.tell() - self.__start
+            if self.__writing:
+                COUNTERS.bytes_written += moved
+            else:
+                COUNTERS.bytes_read += moved
+
+        self.__file.close()
+
+
+def open_file(file_path: str, mode: str = "r", **kwargs) -> CountedFile:
+    """
+    Open a data file like the builtin open, counting it in COUNTERS.
+
+    Args:
+        file_path (str): file path
+        mode (str): mode of the builtin open
+        kwargs: other arguments of the builtin open
+
+    Return: CountedFile
+    """
+
+    f = builtins.open(file_path, mode, **kwargs)
+    writing = any(flag in mode for flag in "wax+")
+
+    if writing:
+        COUNTERS.writes += 1
+    else:
+        COUNTERS.reads += 1
+
+    return CountedFile(f, writing)
@@ -2,6 +2,10 @@ from domain.person_event import PersonEvent
 from domain.person import Person
 from domain.event import Event
 from exceptions.repo_exc import RepoError
+from infrastructure.file_cache import FileCache
+from infrastructure import sqlite_connection
+from infrastructure import io_stats
+import os
 
 
 class PersonEventRepository:
@@ -10,18 +14,30 @@ class PersonEventRepository:
         """
         Constructor for PersonEventRepository object.
 
+        PersonEvent objects are kept by their (person_id, event_id) pair, so duplicate checks and
+        deletions are O(1). Two adjacency maps (person id -> event ids and
+        event id -> person ids) are kept up to date on every change, so attendance lookups cost
+        O(number of attendances of the entity) instead of a scan of all PersonEvent objects, and their
+        sizes are the attendance counters of every Person / Event object.
+
         Args: None
 
         Return: None
         """
 
-        self._person_event_maps = [
+        self._person_event_maps = {
+
+        }
+        self._person_events = {
 
-        ]
+        }
+        self._event_persons = {
 
-    def store(self, person_event: PersonEvent) -> None:
+        }
+
+    def _add_person_event_map(self, person_event: PersonEvent) -> None:
         """
-        Add PersonEvent object.
+        Add PersonEvent object and link it in the adjacency maps.
 
         Args:
             person_event (PersonEvent): PersonEvent object to add
@@ -29,10 +45,104 @@ class PersonEventRepository:
         Return: None
         """
 
-        if person_event in self._person_event_maps:
+        person_id = person_event.get_person_id()
+        event_id = person_event.get_event_id()
+
+        self._person_event_maps[(person_id, event_id)] = person_event
+        self._person_events.setdefault(person_id, {})[event_id] = None
+        self._event_persons.setdefault(event_id, {})[person_id] = None
+
+    def _unlink_person_event_map(self, person_id: int, event_id: int) -> None:
+        """
+        Remove attendance from the adjacency maps.
+
+        Args:
+            person_id (int): id of Person object
+            event_id (int): id of Event object
+
+        Return: None
+        """
+
+        event_ids = self._person_events.get(person_id)
+        if event_ids is not None:
+            event_ids.pop(event_id, None)
+            if len(event_ids) == 0:
+                self._person_events.pop(person_id)
+
+        person_ids = self._event_persons.get(event_id)
+        if person_ids is not None:
+            person_ids.pop(person_id, None)
+            if len(person_ids) == 0:
+                self._event_persons.pop(event_id)
+
+    def _remove_person_event_map(self, person_event: PersonEvent) -> None:
+        """
+        Remove PersonEvent object and unlink it from the adjacency maps.
+
+        Args:
+            person_event (PersonEvent): stored PersonEvent object to remove
+
+        Return: None
+        """
+
+        self._person_event_maps.pop(person_event.get_key())
+        self._unlink_person_event_map(person_event.get_person_id(), person_event.get_event_id())
+
+    def _clear_person_event_maps(self) -> None:
+        """
+        Remove all PersonEvent objects and adjacency maps.
+
+        Args: None
+
+        Return: None
+        """
+
+        self._person_event_maps.clear()
+        self._person_events.clear()
+        self._event_persons.clear()
+
+    def store(self, person_event: PersonEvent, exist_ok: bool = False) -> bool:
+        """
+        Add PersonEvent object.
+
+        Args:
+            person_event (PersonEvent): PersonEvent object to add
+            exist_ok (bool): silently ignore an already stored attendance instead of raising
+
+        Return: bool (True if the attendance was added)
+        """
+
+        if person_event.get_key() in self._person_event_maps:
+            if exist_ok:
+                return False
             raise RepoError("ERROR: person already attends the event...")
 
-        self._person_event_maps.append(person_event)
+        self._add_person_event_map(person_event)
+        return True
+
+    def store_all(self, person_events: list) -> list:
+        """
+        Add PersonEvent objects that are not stored yet.
+
+        Args:
+            person_events (list): PersonEvent objects to add
+
+        Return: list (the PersonEvent objects that were added)
+        """
+
+        return [person_event for person_event in person_events
+                if PersonEventRepository.store(self, person_event, exist_ok=True)]
+
+    def iter_person_events(self):
+        """
+        Yield stored PersonEvent objects one at a time.
+
+        Args: None
+
+        Return: generator of PersonEvent objects
+        """
+
+        yield from self._person_event_maps.values()
 
     def get_person_events(self, person: Person) -> list:
         """
@@ -44,14 +154,7 @@ class PersonEventRepository:
         Return: list
         """
 
-        person_id = person.get_id()
-        event_ids = []
-
-        for person_event_map in self._person_event_maps:
-            if person_event_map.get_person_id() == person_id:
-                event_ids.append(person_event_map.get_event_id())
-
-        return event_ids
+        return list(self._person_events.get(person.get_id(), ()))
 
     def get_event_persons(self, event: Event) -> list:
         """
@@ -63,14 +166,53 @@ class PersonEventRepository:
         Return: list
         """
 
-        event_id = event.get_id()
-        person_ids = []
+        return list(self._event_persons.get(event.get_id(), ()))
+
+    def count_person_events(self, person: Person) -> int:
+        """
+        Return number of Event objects Person object attends.
+
+        Args:
+            person (Person): Person object
+
+        Return: int
+        """
+
+        return len(self._person_events.get(person.get_id(), ()))
 
-        for person_event_map in self._person_event_maps:
-            if person_event_map.get_event_id() == event_id:
-                person_ids.append(person_event_map.get_person_id())
+    def count_event_persons(self, event: Event) -> int:
+        """
+        Return number of Person objects attending Event object.
+
+        Args:
+            event (Event): Event object
 
-        return person_ids
+        Return: int
+        """
+
+        return len(self._event_persons.get(event.get_id(), ()))
+
+    def get_person_event_counts(self) -> dict:
+        """
+        Return number of attended Event objects for every Person id attending at least one.
+
+        Args: None
+
+        Return: dict
+        """
+
+        return {person_id: len(event_ids) for person_id, event_ids in self._person_events.items()}
+
+    def get_event_person_counts(self) -> dict:
+        """
+        Return number of attending Person objects for every Event id attended at least once.
+
+        Args: None
+
+        Return: dict
+        """
+
+        return {event_id: len(person_ids) for event_id, person_ids in self._event_persons.items()}
 
     def delete(self, person_event: PersonEvent) -> None:
         """
@@ -82,10 +224,10 @@ class PersonEventRepository:
         Return: None
         """
 
-        if person_event not in self._person_event_maps:
+        if person_event.get_key() not in self._person_event_maps:
             raise RepoError("ERROR: person does not attend the event...")
 
-        self._person_event_maps.remove(person_event)
+        self._remove_person_event_map(person_event)
 
     def update_deleted_person(self, person: Person) -> None:
         """
@@ -98,10 +240,14 @@ class PersonEventRepository:
         """
 
         person_id = person.get_id()
+        event_ids = self._person_events.get(person_id, {})
+
+        if len(event_ids) == 0:
+            return
 
-        for person_event_map in self._person_event_maps:
-            if person_event_map.get_person_id() == person_id:
-                self._person_event_maps.remove(person_event_map)
+        for event_id in list(event_ids):
+            self._person_event_maps.pop((person_id, event_id))
+            self._unlink_person_event_map(person_id, event_id)
 
     def update_deleted_event(self, event: Event) -> None:
         """
@@ -114,42 +260,95 @@ class PersonEventRepository:
         """
 
         event_id = event.get_id()
+        person_ids = self._event_persons.get(event_id, {})
 
-        for person_event_map in self._person_event_maps:
-            if person_event_map.get_event_id() == event_id:
-                self._person_event_maps.remove(person_event_map)
+        if len(person_ids) == 0:
+            return
+
+        for person_id in list(person_ids):
+            self._person_event_maps.pop((person_id, event_id))
+            self._unlink_person_event_map(person_id, event_id)
 
 
 class FilePersonEventRepository(PersonEventRepository):
 
-    def __init__(self, file_path: str) -> None:
+    def __init__(self, file_path: str, cached: bool = False, journaled: bool = False,
+                 compact_threshold: int = 10000) -> None:
         """
         Constructor for FilePersonEventRepository object.
 
+        In journaled mode every registration or removal is appended to a '.journal' file next to the
+        text file instead of rewriting it; the journal is folded back into the text file by 'compact'.
+
         Args:
             file_path (str): file path of text file
+            cached (bool): keep parsed data in memory until the text file changes
+            journaled (bool): append changes to a journal file instead of rewriting the text file
+            compact_threshold (int): number of journal records that triggers an automatic compaction
 
         Return: None
         """
 
         PersonEventRepository.__init__(self)
         self.__file_path = file_path
+        self.__journal_path = file_path + ".journal"
+        self.__journaled = journaled
+        self.__compact_threshold = compact_threshold
+        self.__journal_records = 0
+        self.__in_transaction = False
+        self.__dirty = False
+        if journaled:
+            self.__cache = FileCache(file_path, self.__journal_path) if cached else None
+        else:
+            self.__cache = FileCache(file_path) if cached else None
+
+    def get_cache_stats(self) -> dict:
+        """
+        Return hit/miss counters of the in-memory cache.
+
+        Args: None
+
+        Return: dict
+        """
+
+        if self.__cache is None:
+            return {"enabled": False, "hits": 0, "misses": 0}
+
+        return self.__cache.get_stats()
+
+    def get_journal_size(self) -> int:
+        """
+        Return number of records appended to the journal since the last compaction.
+
+        Args: None
+
+        Return: int
+        """
+
+        self.__read_person_event_maps_from_file()
+        return self.__journal_records
 
     def __read_person_event_maps_from_file(self) -> None:
         """
-        Read data form 'person_event' text file.
+        Read data form 'person_event' text file and replay its journal.
 
         Args: None
 
         Return: None
         """
 
+        if self.__in_transaction:
+            return
+
+        if self.__cache is not None and self.__cache.is_fresh():
+            return
+
         try:
-            f = open(self.__file_path, "r")
+            f = io_stats.open_file(self.__file_path, "r")
         except IOError:
             raise RepoError(f"ERROR: path '{self.__file_path}' does not exist..")
 
-        self._person_event_maps.clear()
+        self._clear_person_event_maps()
         lines = f.readlines()
 
         for line in lines:
@@ -158,43 +357,277 @@ class FilePersonEventRepository(PersonEventRepository):
                 tokens = line.split(",")
                 person_id = int(tokens[0])
                 event_id = int(tokens[1])
-                person_event_map = PersonEvent(person_id, event_id)
-                self._person_event_maps.append(person_event_map)
+                if (person_id, event_id) not in self._person_event_maps:
+                    self._add_person_event_map(PersonEvent(person_id, event_id))
 
         f.close()
 
-    def __write_person_event_maps_to_file(self) -> None:
+        if self.__journaled:
+            self.__replay_journal()
+
+        if self.__cache is not None:
+            self.__cache.mark_loaded()
+
+    def __replay_journal(self) -> None:
         """
-        Write data to 'person_event' text file.
+        Apply '+' / '-' records of the journal file over the data read from the text file.
 
         Args: None
 
         Return: None
         """
 
+        self.__journal_records = 0
+
         try:
-            f = open(self.__file_path, "w")
+            f = io_stats.open_file(self.__journal_path, "r")
         except IOError:
-            raise RepoError(f"ERROR: path '{self.__file_path}' does not exist..")
+            return
+
+        for line in f:
+            line = line.strip()
+            if line == "":
+                continue
+
+            tokens = line.split(",")
+            person_event_map = PersonEvent(int(tokens[1]), int(tokens[2]))
+            stored = person_event_map.get_key() in self._person_event_maps
+
+            if tokens[0] == "+" and not stored:
+                self._add_person_event_map(person_event_map)
+            elif tokens[0] == "-" and stored:
+                self._remove_person_event_map(person_event_map)
+
+            self.__journal_records += 1
+
+        f.close()
+
+    def __write_snapshot(self, file_path: str, durable: bool = False) -> None:
+        """
+        Write data of 'person_event' to given text file.
+
+        Args:
+            file_path (str): file path of text file
+            durable (bool): flush the file to disk before returning
+
+        Return: None
+        """
+
+        try:
+            f = io_stats.open_file(file_path, "w")
+        except IOError:
+            raise RepoError(f"ERROR: path '{file_path}' does not exist..")
 
-        for person_event_map in self._person_event_maps:
+        for person_event_map in self._person_event_maps.values():
             f.write(str(person_event_map) + "\n")
 
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
+        f.close()
+
+    def __write_person_event_maps_to_file(self) -> None:
+        """
+        Write data to 'person_event' text file.
+
+        Args: None
+
+        Return: None
+        """
+
+        self.__write_snapshot(self.__file_path)
+
+        if self.__cache is not None:
+            self.__cache.mark_written()
+
+    def __append_to_journal(self, sign: str, person_event_maps: list) -> None:
+        """
+        Append '+' (added) or '-' (removed) records to the journal file with a single write.
+
+        Args:
+            sign (str): '+' or '-'
+            person_event_maps (list): PersonEvent objects to record
+
+        Return: None
+        """
+
+        if len(person_event_maps) == 0:
+            return
+
+        records = "".join(f"{sign},{person_event_map}\n" for person_event_map in person_event_maps)
+
+        try:
+            f = io_stats.open_file(self.__journal_path, "a")
+        except IOError:
+            raise RepoError(f"ERROR: path '{self.__journal_path}' does not exist..")
+
+        f.write(records)
         f.close()
+        self.__journal_records += len(person_event_maps)
+
+        if self.__cache is not None:
+            self.__cache.mark_written()
+
+        if self.__journal_records >= self.__compact_threshold:
+            self.compact()
+
+    def __save(self, sign: str, person_event_maps: list) -> None:
+        """
+        Persist a change either as journal records or by rewriting the text file.
+
+        Args:
+            sign (str): '+' or '-'
+            person_event_maps (list): added or removed PersonEvent objects
+
+        Return: None
+        """
+
+        if self.__in_transaction:
+            self.__dirty = True
+        elif self.__journaled:
+            self.__append_to_journal(sign, person_event_maps)
+        else:
+            self.__write_person_event_maps_to_file()
+
+    def compact(self) -> None:
+        """
+        Fold the journal into a new 'person_event' text file snapshot and empty the journal.
+
+        The snapshot replaces the text file atomically; if the process stops before the journal is
+        emptied, replaying it again over the snapshot yields the same data.
+
+        Args: None
+
+        Return: None
+        """
+
+        if self.__in_transaction:
+            raise RepoError("ERROR: cannot compact during a transaction...")
+
+        self.__read_person_event_maps_from_file()
+
+        temporary_path = self.__file_path + ".tmp"
+        self.__write_snapshot(temporary_path, durable=True)
+        os.replace(temporary_path, self.__file_path)
+
+        if os.path.exists(self.__journal_path):
+            io_stats.open_file(self.__journal_path, "w").close()
+
+        self.__journal_records = 0
+
+        if self.__cache is not None:
+            self.__cache.mark_written()
+
+    def begin_transaction(self) -> None:
+        """
+        Load 'person_event' text file once and stage all following changes in memory.
+
+        Args: None
+
+        Return: None
+        """
+
+        if self.__in_transaction:
+            raise RepoError("ERROR: transaction already in progress...")
+
+        self.__read_person_event_maps_from_file()
+        self.__in_transaction = True
+        self.__dirty = False
+
+    def prepare_commit(self) -> list:
+        """
+        Write staged changes to temporary files next to 'person_event' text file.
+
+        In journaled mode the snapshot already contains the journal, so an empty journal replaces it.
+
+        Args: None
+
+        Return: list of (temporary file path, target file path) pairs to rename on commit
+        """
+
+        if not self.__in_transaction or not self.__dirty:
+            return []
+
+        temporary_path = self.__file_path + ".tmp"
+        self.__write_snapshot(temporary_path, durable=True)
+        renames = [(temporary_path, self.__file_path)]
+
+        if self.__journaled:
+            temporary_journal_path = self.__journal_path + ".tmp"
+            io_stats.open_file(temporary_journal_path, "w").close()
+            renames.append((temporary_journal_path, self.__journal_path))
+
+        return renames
+
+    def end_transaction(self, committed: bool) -> None:
+        """
+        Leave transaction mode; staged changes are dropped unless they were committed.
+
+        Args:
+            committed (bool): whether the staged changes were written to the text file
 
-    def store(self, person_event: PersonEvent) -> None:
+        Return: None
+        """
+
+        if committed and self.__dirty:
+            self.__journal_records = 0
+
+        self.__in_transaction = False
+        self.__dirty = False
+
+        if self.__cache is not None:
+            if committed:
+                self.__cache.mark_written()
+            else:
+                self.__cache.invalidate()
+
+    def store(self, person_event: PersonEvent, exist_ok: bool = False) -> bool:
         """
         Add PersonEvent object to 'person_event' text file.
 
         Args:
             person_event (PersonEvent): PersonEvent object to add
+            exist_ok (bool): silently ignore an already stored attendance instead of raising
 
-        Return: None
+        Return: bool (True if the attendance was added)
+        """
+
+        self.__read_person_event_maps_from_file()
+        if not PersonEventRepository.store(self, person_event, exist_ok):
+            return False
+
+        self.__save("+", [person_event])
+        return True
+
+    def store_all(self, person_events: list) -> list:
+        """
+        Add PersonEvent objects that are not stored yet to 'person_event' text file with a single write.
+
+        Args:
+            person_events (list): PersonEvent objects to add
+
+        Return: list (the PersonEvent objects that were added)
         """
 
         self.__read_person_event_maps_from_file()
-        PersonEventRepository.store(self, person_event)
-        self.__write_person_event_maps_to_file()
+        added = PersonEventRepository.store_all(self, person_events)
+        if len(added) > 0:
+            self.__save("+", added)
+
+        return added
+
+    def iter_person_events(self):
+        """
+        Yield PersonEvent objects from 'person_event' text file one at a time.
+
+        Args: None
+
+        Return: generator of PersonEvent objects
+        """
+
+        self.__read_person_event_maps_from_file()
+        yield from PersonEventRepository.iter_person_events(self)
 
     def get_person_events(self, person: Person) -> list:
         """
@@ -222,6 +655,56 @@ class FilePersonEventRepository(PersonEventRepository):
         self.__read_person_event_maps_from_file()
         return PersonEventRepository.get_event_persons(self, event)
 
+    def count_person_events(self, person: Person) -> int:
+        """
+        Return number of Event objects Person object attends from 'person_event' text file.
+
+        Args:
+            person (Person): Person object
+
+        Return: int
+        """
+
+        self.__read_person_event_maps_from_file()
+        return PersonEventRepository.count_person_events(self, person)
+
+    def count_event_persons(self, event: Event) -> int:
+        """
+        Return number of Person objects attending Event object from 'person_event' text file.
+
+        Args:
+            event (Event): Event object
+
+        Return: int
+        """
+
+        self.__read_person_event_maps_from_file()
+        return PersonEventRepository.count_event_persons(self, event)
+
+    def get_person_event_counts(self) -> dict:
+        """
+        Return number of attended Event objects for every Person id from 'person_event' text file.
+
+        Args: None
+
+        Return: dict
+        """
+
+        self.__read_person_event_maps_from_file()
+        return PersonEventRepository.get_person_event_counts(self)
+
+    def get_event_person_counts(self) -> dict:
+        """
+        Return number of attending Person objects for every Event id from 'person_event' text file.
+
+        Args: None
+
+        Return: dict
+        """
+
+        self.__read_person_event_maps_from_file()
+        return PersonEventRepository.get_event_person_counts(self)
+
     def delete(self, person_event: PersonEvent) -> None:
         """
         Delete PersonEvent object from 'person_event' text file.
@@ -234,7 +717,7 @@ class FilePersonEventRepository(PersonEventRepository):
 
         self.__read_person_event_maps_from_file()
         PersonEventRepository.delete(self, person_event)
-        self.__write_person_event_maps_to_file()
+        self.__save("-", [person_event])
 
     def update_deleted_person(self, person: Person) -> None:
         """
@@ -247,8 +730,9 @@ class FilePersonEventRepository(PersonEventRepository):
         """
 
         self.__read_person_event_maps_from_file()
+        event_ids = PersonEventRepository.get_person_events(self, person)
         PersonEventRepository.update_deleted_person(self, person)
-        self.__write_person_event_maps_to_file()
+        self.__save("-", [PersonEvent(person.get_id(), event_id) for event_id in event_ids])
 
     def update_deleted_event(self, event: Event) -> None:
         """
@@ -261,5 +745,267 @@ class FilePersonEventRepository(PersonEventRepository):
         """
 
         self.__read_person_event_maps_from_file()
+        person_ids = PersonEventRepository.get_event_persons(self, event)
         PersonEventRepository.update_deleted_event(self, event)
-        self.__write_person_event_maps_to_file()
\ No newline at end of file
+        self.__save("-", [PersonEvent(person_id, event.get_id()) for person_id in person_ids])
+
+
+class SqlitePersonEventRepository:
+
+    def __init__(self, connection) -> None:
+        """
+        Constructor for SqlitePersonEventRepository object.
+
+        Attendances are unique by (person_id, event_id); a second index by (event_id, person_id)
+        serves the reverse lookup. Per-person and per-event attendance counters are kept in their own
+        tables by triggers, and rebuilt once from 'person_event' when they are first created.
+
+        Args:
+            connection (sqlite3.Connection): connection returned by 'sqlite_connection.connect'
+
+        Return: None
+        """
+
+        self.__connection = connection
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS person_event ("
+            "person_id INTEGER NOT NULL, event_id INTEGER NOT NULL, UNIQUE (person_id, event_id))")
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS person_event_by_event ON person_event (event_id, person_id)")
+        self.__create_counters()
+
+    def __create_counters(self) -> None:
+        """
+        Create attendance counter tables and the triggers keeping them up to date.
+
+        Args: None
+
+        Return: None
+        """
+
+        exists = self.__connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'person_attendance_counts'").fetchone()
+        if exists is not None:
+            return
+
+        self.__connection.executescript("""
+            BEGIN;
+            CREATE TABLE person_attendance_counts (person_id INTEGER PRIMARY KEY, count INTEGER NOT NULL);
+            CREATE TABLE event_attendance_counts (event_id INTEGER PRIMARY KEY, count INTEGER NOT NULL);
+            INSERT INTO person_attendance_counts (person_id, count)
+                SELECT person_id, COUNT(*) FROM person_event GROUP BY person_id;
+            INSERT INTO event_attendance_counts (event_id, count)
+                SELECT event_id, COUNT(*) FROM person_event GROUP BY event_id;
+            CREATE TRIGGER person_event_counts_insert AFTER INSERT ON person_event BEGIN
+                INSERT INTO person_attendance_counts (person_id, count) VALUES (NEW.person_id, 1)
+                    ON CONFLICT (person_id) DO UPDATE SET count = count + 1;
+                INSERT INTO event_attendance_counts (event_id, count) VALUES (NEW.event_id, 1)
+                    ON CONFLICT (event_id) DO UPDATE SET count = count + 1;
+            END;
+            CREATE TRIGGER person_event_counts_delete AFTER DELETE ON person_event BEGIN
+                UPDATE person_attendance_counts SET count = count - 1 WHERE person_id = OLD.person_id;
+                DELETE FROM person_attendance_counts WHERE person_id = OLD.person_id AND count = 0;
+                UPDATE event_attendance_counts SET count = count - 1 WHERE event_id = OLD.event_id;
+                DELETE FROM event_attendance_counts WHERE event_id = OLD.event_id AND count = 0;
+            END;
+            COMMIT;
+        """)
+
+    def store(self, person_event: PersonEvent, exist_ok: bool = False) -> bool:
+        """
+        Add PersonEvent object to 'person_event' table.
+
+        Args:
+            person_event (PersonEvent): PersonEvent object to add
+            exist_ok (bool): silently ignore an already stored attendance instead of raising
+
+        Return: bool (True if the attendance was added)
+        """
+
+        cursor = self.__connection.execute("INSERT OR IGNORE INTO person_event (person_id, event_id) VALUES (?, ?)",
+                                           person_event.get_key())
+        if cursor.rowcount == 0:
+            if exist_ok:
+                return False
+            raise RepoError("ERROR: person already attends the event...")
+
+        return True
+
+    def store_all(self, person_events: list) -> list:
+        """
+        Add PersonEvent objects that are not stored yet to 'person_event' table.
+
+        Args:
+            person_events (list): PersonEvent objects to add
+
+        Return: list (the PersonEvent objects that were added)
+        """
+
+        return [person_event for person_event in person_events if self.store(person_event, exist_ok=True)]
+
+    def iter_person_events(self):
+        """
+        Yield PersonEvent objects from 'person_event' table one at a time.
+
+        Args: None
+
+        Return: generator of PersonEvent objects
+        """
+
+        for row in self.__connection.execute("SELECT person_id, event_id FROM person_event ORDER BY rowid"):
+            yield PersonEvent(row[0], row[1])
+
+    def get_person_events(self, person: Person) -> list:
+        """
+        Return Event objects Person object attends from 'person_event' table.
+
+        Args:
+            person (Person): Person object to search attending Event objects
+
+        Return: list
+        """
+
+        rows = self.__connection.execute("SELECT event_id FROM person_event WHERE person_id = ? ORDER BY rowid",
+                                         (person.get_id(),))
+
+        return [row[0] for row in rows]
+
+    def get_event_persons(self, event: Event) -> list:
+        """
+        Return Person objects attending Event object from 'person_event' table.
+
+        Args:
+            event (Event): Event object to search attending Person objects
+
+        Return: list
+        """
+
+        rows = self.__connection.execute("SELECT person_id FROM person_event WHERE event_id = ? ORDER BY rowid",
+                                         (event.get_id(),))
+
+        return [row[0] for row in rows]
+
+    def count_person_events(self, person: Person) -> int:
+        """
+        Return number of Event objects Person object attends from 'person_attendance_counts' table.
+
+        Args:
+            person (Person): Person object
+
+        Return: int
+        """
+
+        row = self.__connection.execute("SELECT count FROM person_attendance_counts WHERE person_id = ?",
+                                        (person.get_id(),)).fetchone()
+
+        return 0 if row is None else row[0]
+
+    def count_event_persons(self, event: Event) -> int:
+        """
+        Return number of Person objects attending Event object from 'event_attendance_counts' table.
+
+        Args:
+            event (Event): Event object
+
+        Return: int
+        """
+
+        row = self.__connection.execute("SELECT count FROM event_attendance_counts WHERE event_id = ?",
+                                        (event.get_id(),)).fetchone()
+
+        return 0 if row is None else row[0]
+
+    def get_person_event_counts(self) -> dict:
+        """
+        Return number of attended Event objects for every Person id from 'person_attendance_counts' table.
+
+        Args: None
+
+        Return: dict
+        """
+
+        return dict(self.__connection.execute("SELECT person_id, count FROM person_attendance_counts"))
+
+    def get_event_person_counts(self) -> dict:
+        """
+        Return number of attending Person objects for every Event id from 'event_attendance_counts' table.
+
+        Args: None
+
+        Return: dict
+        """
+
+        return dict(self.__connection.execute("SELECT event_id, count FROM event_attendance_counts"))
+
+    def delete(self, person_event: PersonEvent) -> None:
+        """
+        Delete PersonEvent object from 'person_event' table.
+
+        Args:
+            person_event (PersonEvent): PersonEvent object to delete
+
+        Return: None
+        """
+
+        cursor = self.__connection.execute("DELETE FROM person_event WHERE person_id = ? AND event_id = ?",
+                                           person_event.get_key())
+        if cursor.rowcount == 0:
+            raise RepoError("ERROR: person does not attend the event...")
+
+    def update_deleted_person(self, person: Person) -> None:
+        """
+        Update 'person_event' table after Person object deletion.
+
+        Args:
+            person (Person): deleted Person object
+
+        Return: None
+        """
+
+        self.__connection.execute("DELETE FROM person_event WHERE person_id = ?", (person.get_id(),))
+
+    def update_deleted_event(self, event: Event) -> None:
+        """
+        Update 'person_event' table after Event object deletion.
+
+        Args:
+            event (Event): deleted Event object
+
+        Return: None
+        """
+
+        self.__connection.execute("DELETE FROM person_event WHERE event_id = ?", (event.get_id(),))
+
+    def begin_transaction(self) -> None:
+        """
+        Open a transaction on the shared connection, if none is open yet.
+
+        Args: None
+
+        Return: None
+        """
+
+        sqlite_connection.begin_transaction(self.__connection)
+
+    def prepare_commit(self) -> list:
+        """
+        Nothing to stage on disk, SQLite commits the transaction itself.
+
+        Args: None
+
+        Return: list
+        """
+
+        return []
+
+    def end_transaction(self, committed: bool) -> None:
+        """
+        Commit or roll back the transaction of the shared connection, if still open.
+
+        Args:
+            committed (bool): whether the staged changes must be kept
+
+        Return: None
+        """
+
+        sqlite_connection.end_transaction(self.__connection, committed)
\ No newline at end of file
@@ -1,5 +1,11 @@
 from domain.person import Person
 from exceptions.repo_exc import RepoError
+from infrastructure.file_cache import FileCache
+from infrastructure.trigram_index import TrigramIndex
+from infrastructure import trigram_index
+from infrastructure import sqlite_connection
+from infrastructure import io_stats
+import os
 
 
 class PersonRepository:
@@ -8,6 +14,9 @@ class PersonRepository:
         """
         Constructor for PersonRepository object.
 
+        Besides the Person objects by id, an index of unique addresses and a trigram index of names
+        (for typo-tolerant name lookups) are kept up to date.
+
         Args: None
 
         Return: None
@@ -16,6 +25,42 @@ class PersonRepository:
         self._persons = {
 
         }
+        self._addresses = {
+
+        }
+        self._names = TrigramIndex()
+
+    def _clear_persons(self) -> None:
+        """
+        Remove all Person objects and their indexes.
+
+        Args: None
+
+        Return: None
+        """
+
+        self._persons.clear()
+        self._addresses.clear()
+        self._names.clear()
+
+    def _put_person(self, person: Person) -> None:
+        """
+        Store Person object and index its address and name.
+
+        Args:
+            person (Person): Person object to store
+
+        Return: None
+        """
+
+        previous = self._persons.get(person.get_id())
+        if previous is not None:
+            self._addresses.pop(previous.get_address(), None)
+            self._names.remove(previous.get_id(), previous.get_name())
+
+        self._persons[person.get_id()] = person
+        self._addresses[person.get_address()] = person.get_id()
+        self._names.add(person.get_id(), person.get_name())
 
     def add_person(self, person: Person) -> None:
         """
@@ -33,40 +78,53 @@ class PersonRepository:
         if person_id in self._persons.keys():
             raise RepoError("ERROR: id already exists...")
 
-        for entity in self._persons.values():
-            if person_address == entity.get_address():
-                raise RepoError("ERROR: address already exists...")
+        if person_address in self._addresses:
+            raise RepoError("ERROR: address already exists...")
 
-        self._persons[person_id] = person
+        self._put_person(person)
 
-    """
-    def get_persons(self) -> list:
-    
-        return [self._persons[identifier] for identifier in self._persons.keys()]
-    """
-
-    def get_persons_recursive(self, identifiers=None, index=0) -> list:
+    @staticmethod
+    def _check_new_persons(persons: list, exists) -> None:
         """
-        Return Person objects from 'persons' recursively.
+        Check that ids and addresses of new Person objects are neither stored nor repeated in the batch.
 
         Args:
-            identifiers (list): A list to store identifiers.
-            index (int): Current index while traversing.
+            persons (list): Person objects to add
+            exists (function): exists(column, value) -> bool, True if 'id' or 'address' value is stored
 
-        Return: list
+        Raises:
+            RepoError: an id or address already exists
+
+        Return: None
         """
-        if identifiers is None:
-            identifiers = list(self._persons.keys())
 
-        if index == len(identifiers):
-            return []
+        ids = set()
+        addresses = set()
+
+        for person in persons:
+            if person.get_id() in ids or exists("id", person.get_id()):
+                raise RepoError("ERROR: id already exists...")
+            if person.get_address() in addresses or exists("address", person.get_address()):
+                raise RepoError("ERROR: address already exists...")
+
+            ids.add(person.get_id())
+            addresses.add(person.get_address())
+
+    def add_persons(self, persons: list) -> None:
+        """
+        Add Person objects to 'persons', none of them if any id or address already exists.
 
-        current_identifier = identifiers[index]
-        person_object = self._persons[current_identifier]
+        Args:
+            persons (list): Person objects to add
+
+        Return: None
+        """
 
-        remaining_persons = self.get_persons_recursive(identifiers, index + 1)
+        self._check_new_persons(persons, lambda column, value:
+                                value in (self._persons if column == "id" else self._addresses))
 
-        return [person_object] + remaining_persons
+        for person in persons:
+            self._put_person(person)
 
     def get_persons(self) -> list:
         """
@@ -76,7 +134,19 @@ class PersonRepository:
 
         Return: list
         """
-        return self.get_persons_recursive()
+
+        return list(self._persons.values())
+
+    def iter_persons(self):
+        """
+        Yield Person objects from 'persons' one at a time.
+
+        Args: None
+
+        Return: generator of Person objects
+        """
+
+        yield from self._persons.values()
 
     def delete_person(self, person) -> None:
         """
@@ -92,7 +162,9 @@ class PersonRepository:
         if person_id not in self._persons.keys():
             raise RepoError("ERROR: person does not exist...")
 
-        self._persons.pop(person_id)
+        deleted_person = self._persons.pop(person_id)
+        self._addresses.pop(deleted_person.get_address(), None)
+        self._names.remove(person_id, deleted_person.get_name())
 
     def modify_person(self, person: Person) -> None:
         """
@@ -108,11 +180,11 @@ class PersonRepository:
         if person_id not in self._persons.keys():
             raise RepoError("ERROR: person does not exist...")
 
-        for entity in self._persons.values():
-            if person.get_id() != entity.get_id() and person.get_address() == entity.get_address():
-                raise RepoError("ERROR: address already exists...")
+        owner_id = self._addresses.get(person.get_address())
+        if owner_id is not None and owner_id != person_id:
+            raise RepoError("ERROR: address already exists...")
 
-        self._persons[person.get_id()] = person
+        self._put_person(person)
 
     def search_person(self, id: int) -> Person:
         """
@@ -129,21 +201,88 @@ class PersonRepository:
 
         return self._persons[id]
 
+    def search_persons(self, ids: list) -> list:
+        """
+        Search several Person objects in 'persons' at once.
+
+        Args:
+            ids (list): ids of Person objects to search
+
+        Return: list
+        """
+
+        persons = []
+
+        for id in ids:
+            if id not in self._persons.keys():
+                raise RepoError("ERROR: person does not exist...")
+            persons.append(self._persons[id])
+
+        return persons
+
+    def search_person_by_address(self, address: str) -> Person:
+        """
+        Search Person object in 'persons' by its unique address.
+
+        Args:
+            address (str): address of Person object to search
+
+        Return: Person
+        """
+
+        if address not in self._addresses:
+            raise RepoError("ERROR: person does not exist...")
+
+        return self._persons[self._addresses[address]]
+
+    def search_person_by_name(self, name: str, limit: int = trigram_index.DEFAULT_LIMIT) -> list:
+        """
+        Search Person objects in 'persons' whose name is similar to the given one, best match first.
+
+        Only persons sharing trigrams with the name are scored, by Jaccard similarity of their trigrams.
+
+        Args:
+            name (str): name, possibly misspelled, of Person objects to search
+            limit (int): maximum number of Person objects to return
+
+        Return: list
+        """
+
+        return [self._persons[person_id] for person_id in self._names.search(name, limit)]
+
 
 class FilePersonRepository(PersonRepository):
 
-    def __init__(self, file_path: str) -> None:
+    def __init__(self, file_path: str, cached: bool = False) -> None:
         """
         Constructor for FilePersonRepository object.
 
         Args:
             file_path (str): file path of text file
+            cached (bool): keep parsed data in memory until the text file changes
 
         Return: None
         """
 
         PersonRepository.__init__(self)
         self.__file_path = file_path
+        self.__cache = FileCache(file_path) if cached else None
+        self.__in_transaction = False
+        self.__dirty = False
+
+    def get_cache_stats(self) -> dict:
+        """
+        Return hit/miss counters of the in-memory cache.
+
+        Args: None
+
+        Return: dict
+        """
+
+        if self.__cache is None:
+            return {"enabled": False, "hits": 0, "misses": 0}
+
+        return self.__cache.get_stats()
 
     def __read_persons_from_file(self) -> None:
         """
@@ -154,12 +293,18 @@ class FilePersonRepository(PersonRepository):
         Return: None
         """
 
+        if self.__in_transaction:
+            return
+
+        if self.__cache is not None and self.__cache.is_fresh():
+            return
+
         try:
-            f = open(self.__file_path, "r")
+            f = io_stats.open_file(self.__file_path, "r")
         except IOError:
             raise RepoError(f"ERROR: path '{self.__file_path}' does not exist..")
 
-        self._persons.clear()
+        self._clear_persons()
         lines = f.readlines()
 
         for i in range(0, len(lines), 3):
@@ -167,29 +312,108 @@ class FilePersonRepository(PersonRepository):
             person_name = lines[i + 1].strip()
             person_address = lines[i + 2].strip()
             person = Person(person_id, person_name, person_address)
-            self._persons[person_id] = person
+            self._put_person(person)
 
         f.close()
 
-    def __write_persons_to_file(self) -> None:
+        if self.__cache is not None:
+            self.__cache.mark_loaded()
+
+    def __write_snapshot(self, file_path: str, durable: bool = False) -> None:
         """
-        Write data to 'persons' text file.
+        Write data of 'persons' to given text file.
 
-        Args: None
+        Args:
+            file_path (str): file path of text file
+            durable (bool): flush the file to disk before returning
 
         Return: None
         """
 
         try:
-            f = open(self.__file_path, "w")
+            f = io_stats.open_file(file_path, "w")
         except IOError:
-            raise RepoError(f"ERROR: path '{self.__file_path}' does not exist..")
+            raise RepoError(f"ERROR: path '{file_path}' does not exist..")
 
         for person in self._persons.values():
             f.write(f"{person.get_id()}\n{person.get_name()}\n{person.get_address()}\n")
 
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
         f.close()
 
+    def __write_persons_to_file(self) -> None:
+        """
+        Write data to 'persons' text file, or only mark it as changed inside a transaction.
+
+        Args: None
+
+        Return: None
+        """
+
+        if self.__in_transaction:
+            self.__dirty = True
+            return
+
+        self.__write_snapshot(self.__file_path)
+
+        if self.__cache is not None:
+            self.__cache.mark_written()
+
+    def begin_transaction(self) -> None:
+        """
+        Load 'persons' text file once and stage all following changes in memory.
+
+        Args: None
+
+        Return: None
+        """
+
+        if self.__in_transaction:
+            raise RepoError("ERROR: transaction already in progress...")
+
+        self.__read_persons_from_file()
+        self.__in_transaction = True
+        self.__dirty = False
+
+    def prepare_commit(self) -> list:
+        """
+        Write staged changes to a temporary file next to 'persons' text file.
+
+        Args: None
+
+        Return: list of (temporary file path, text file path) pairs to rename on commit
+        """
+
+        if not self.__in_transaction or not self.__dirty:
+            return []
+
+        temporary_path = self.__file_path + ".tmp"
+        self.__write_snapshot(temporary_path, durable=True)
+
+        return [(temporary_path, self.__file_path)]
+
+    def end_transaction(self, committed: bool) -> None:
+        """
+        Leave transaction mode; staged changes are dropped unless they were committed.
+
+        Args:
+            committed (bool): whether the staged changes were written to the text file
+
+        Return: None
+        """
+
+        self.__in_transaction = False
+        self.__dirty = False
+
+        if self.__cache is not None:
+            if committed:
+                self.__cache.mark_written()
+            else:
+                self.__cache.invalidate()
+
     def add_person(self, person: Person) -> None:
         """
         Add Person object to 'persons' text file.
@@ -204,6 +428,20 @@ class FilePersonRepository(PersonRepository):
         PersonRepository.add_person(self, person)
         self.__write_persons_to_file()
 
+    def add_persons(self, persons: list) -> None:
+        """
+        Add Person objects to 'persons' text file with a single write.
+
+        Args:
+            persons (list): Person objects to add
+
+        Return: None
+        """
+
+        self.__read_persons_from_file()
+        PersonRepository.add_persons(self, persons)
+        self.__write_persons_to_file()
+
     def get_persons(self) -> list:
         """
         Return Person objects from 'persons' text file.
@@ -216,6 +454,37 @@ class FilePersonRepository(PersonRepository):
         self.__read_persons_from_file()
         return PersonRepository.get_persons(self)
 
+    def iter_persons(self):
+        """
+        Yield Person objects from 'persons' text file one at a time.
+
+        The file is streamed record by record, so memory stays bounded regardless of its size;
+        already cached data is served from memory instead.
+
+        Args: None
+
+        Return: generator of Person objects
+        """
+
+        if self.__in_transaction or (self.__cache is not None and self.__cache.is_fresh()):
+            yield from PersonRepository.iter_persons(self)
+            return
+
+        try:
+            f = io_stats.open_file(self.__file_path, "r")
+        except IOError:
+            raise RepoError(f"ERROR: path '{self.__file_path}' does not exist..")
+
+        with f:
+            for line in f:
+                if line.strip() == "":
+                    continue
+
+                person_id = int(line.strip())
+                person_name = f.readline().strip()
+                person_address = f.readline().strip()
+                yield Person(person_id, person_name, person_address)
+
     def delete_person(self, person: Person) -> None:
         """
         Delete Person object from 'persons' text file.
@@ -256,3 +525,342 @@ class FilePersonRepository(PersonRepository):
 
         self.__read_persons_from_file()
         return PersonRepository.search_person(self, person_id)
+
+    def search_persons(self, ids: list) -> list:
+        """
+        Search several Person objects in 'persons' text file with a single read.
+
+        Args:
+            ids (list): ids of Person objects to search
+
+        Return: list
+        """
+
+        self.__read_persons_from_file()
+        return PersonRepository.search_persons(self, ids)
+
+    def search_person_by_address(self, address: str) -> Person:
+        """
+        Search Person object in 'persons' text file by its unique address.
+
+        Args:
+            address (str): address of Person object to search
+
+        Return: Person
+        """
+
+        self.__read_persons_from_file()
+        return PersonRepository.search_person_by_address(self, address)
+
+    def search_person_by_name(self, name: str, limit: int = trigram_index.DEFAULT_LIMIT) -> list:
+        """
+        Search Person objects in 'persons' text file whose name is similar to the given one, best match first.
+
+        Args:
+            name (str): name, possibly misspelled, of Person objects to search
+            limit (int): maximum number of Person objects to return
+
+        Return: list
+        """
+
+        self.__read_persons_from_file()
+        return PersonRepository.search_person_by_name(self, name, limit)
+
+
+class SqlitePersonRepository:
+
+    def __init__(self, connection) -> None:
+        """
+        Constructor for SqlitePersonRepository object.
+
+        Args:
+            connection (sqlite3.Connection): connection returned by 'sqlite_connection.connect'
+
+        Return: None
+        """
+
+        self.__connection = connection
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS persons ("
+            "id INTEGER PRIMARY KEY, name TEXT NOT NULL, address TEXT NOT NULL UNIQUE)")
+        self.__create_trigrams()
+
+    def __create_trigrams(self) -> None:
+        """
+        Create the 'person_trigrams' index of names and fill it for existing persons.
+
+        Args: None
+
+        Return: None
+        """
+
+        exists = self.__connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'person_trigrams'").fetchone()
+        if exists is not None:
+            return
+
+        sqlite_connection.begin_transaction(self.__connection)
+        self.__connection.execute(
+            "CREATE TABLE person_trigrams ("
+            "trigram TEXT NOT NULL, person_id INTEGER NOT NULL, PRIMARY KEY (trigram, person_id)) WITHOUT ROWID")
+        self.__connection.execute("CREATE INDEX person_trigrams_by_person ON person_trigrams (person_id)")
+        for row in self.__connection.execute("SELECT id, name FROM persons").fetchall():
+            self.__index_name(row[0], row[1])
+        sqlite_connection.end_transaction(self.__connection, True)
+
+    def __index_name(self, person_id: int, name: str) -> None:
+        """
+        Store the trigrams of a person name in 'person_trigrams'.
+
+        Args:
+            person_id (int): id of Person object
+            name (str): name of Person object
+
+        Return: None
+        """
+
+        self.__connection.executemany("INSERT INTO person_trigrams (trigram, person_id) VALUES (?, ?)",
+                                      [(gram, person_id) for gram in trigram_index.trigrams(name)])
+
+    def add_person(self, person: Person) -> None:
+        """
+        Add Person object to 'persons' table and its name trigrams to 'person_trigrams', in one transaction.
+
+        Args:
+            person (Person): Person object to add
+
+        Return: None
+        """
+
+        if self.__find_id("SELECT id FROM persons WHERE id = ?", person.get_id()) is not None:
+            raise RepoError("ERROR: id already exists...")
+
+        if self.__find_id("SELECT id FROM persons WHERE address = ?", person.get_address()) is not None:
+            raise RepoError("ERROR: address already exists...")
+
+        def write() -> None:
+            self.__connection.execute("INSERT INTO persons (id, name, address) VALUES (?, ?, ?)",
+                                      (person.get_id(), person.get_name(), person.get_address()))
+            self.__index_name(person.get_id(), person.get_name())
+
+        sqlite_connection.write_atomically(self.__connection, write)
+
+    def add_persons(self, persons: list) -> None:
+        """
+        Add Person objects to 'persons' table in one transaction, none of them if any id or address already exists.
+
+        Args:
+            persons (list): Person objects to add
+
+        Return: None
+        """
+
+        PersonRepository._check_new_persons(persons, lambda column, value: self.__find_id(
+            f"SELECT id FROM persons WHERE {column} = ?", value) is not None)
+
+        def write() -> None:
+            self.__connection.executemany("INSERT INTO persons (id, name, address) VALUES (?, ?, ?)",
+                                          [(person.get_id(), person.get_name(), person.get_address())
+                                           for person in persons])
+            for person in persons:
+                self.__index_name(person.get_id(), person.get_name())
+
+        sqlite_connection.write_atomically(self.__connection, write)
+
+    def get_persons(self) -> list:
+        """
+        Return Person objects from 'persons' table.
+
+        Args: None
+
+        Return: list
+        """
+
+        return list(self.iter_persons())
+
+    def iter_persons(self):
+        """
+        Yield Person objects from 'persons' table one at a time.
+
+        Args: None
+
+        Return: generator of Person objects
+        """
+
+        for row in self.__connection.execute("SELECT id, name, address FROM persons ORDER BY id"):
+            yield Person(row[0], row[1], row[2])
+
+    def delete_person(self, person: Person) -> None:
+        """
+        Delete Person object from 'persons' table.
+
+        Args:
+            person (Person): Person object
+
+        Return: None
+        """
+
+        def write() -> None:
+            cursor = self.__connection.execute("DELETE FROM persons WHERE id = ?", (person.get_id(),))
+            if cursor.rowcount == 0:
+                raise RepoError("ERROR: person does not exist...")
+
+            self.__connection.execute("DELETE FROM person_trigrams WHERE person_id = ?", (person.get_id(),))
+
+        sqlite_connection.write_atomically(self.__connection, write)
+
+    def modify_person(self, person: Person) -> None:
+        """
+        Modify Person object attributes in 'persons' table.
+
+        Args:
+            person: Person object to modify
+
+        Return: None
+        """
+
+        if self.__find_id("SELECT id FROM persons WHERE id = ?", person.get_id()) is None:
+            raise RepoError("ERROR: person does not exist...")
+
+        owner_id = self.__find_id("SELECT id FROM persons WHERE address = ?", person.get_address())
+        if owner_id is not None and owner_id != person.get_id():
+            raise RepoError("ERROR: address already exists...")
+
+        def write() -> None:
+            self.__connection.execute("UPDATE persons SET name = ?, address = ? WHERE id = ?",
+                                      (person.get_name(), person.get_address(), person.get_id()))
+            self.__connection.execute("DELETE FROM person_trigrams WHERE person_id = ?", (person.get_id(),))
+            self.__index_name(person.get_id(), person.get_name())
+
+        sqlite_connection.write_atomically(self.__connection, write)
+
+    def search_person(self, id: int) -> Person:
+        """
+        Search Person object in 'persons' table.
+
+        Args:
+            id (int): id of Person object to search
+
+        Return: Person
+        """
+
+        row = self.__connection.execute("SELECT id, name, address FROM persons WHERE id = ?", (id,)).fetchone()
+        if row is None:
+            raise RepoError("ERROR: person does not exist...")
+
+        return Person(row[0], row[1], row[2])
+
+    def search_persons(self, ids: list) -> list:
+        """
+        Search several Person objects in 'persons' table with a single query.
+
+        Args:
+            ids (list): ids of Person objects to search
+
+        Return: list
+        """
+
+        persons = {}
+        unique_ids = list(dict.fromkeys(ids))
+
+        for start in range(0, len(unique_ids), sqlite_connection.SQLITE_MAX_PARAMETERS):
+            chunk = unique_ids[start:start + sqlite_connection.SQLITE_MAX_PARAMETERS]
+            placeholders = ",".join("?" * len(chunk))
+            query = f"SELECT id, name, address FROM persons WHERE id IN ({placeholders})"
+            for row in self.__connection.execute(query, chunk):
+                persons[row[0]] = Person(row[0], row[1], row[2])
+
+        if len(persons) != len(unique_ids):
+            raise RepoError("ERROR: person does not exist...")
+
+        return [persons[id] for id in ids]
+
+    def search_person_by_address(self, address: str) -> Person:
+        """
+        Search Person object in 'persons' table by its unique address.
+
+        Args:
+            address (str): address of Person object to search
+
+        Return: Person
+        """
+
+        row = self.__connection.execute("SELECT id, name, address FROM persons WHERE address = ?",
+                                        (address,)).fetchone()
+        if row is None:
+            raise RepoError("ERROR: person does not exist...")
+
+        return Person(row[0], row[1], row[2])
+
+    def search_person_by_name(self, name: str, limit: int = trigram_index.DEFAULT_LIMIT) -> list:
+        """
+        Search Person objects in 'persons' table whose name is similar to the given one, best match first.
+
+        Args:
+            name (str): name, possibly misspelled, of Person objects to search
+            limit (int): maximum number of Person objects to return
+
+        Return: list
+        """
+
+        grams = list(trigram_index.trigrams(name))
+        if len(grams) == 0:
+            return []
+
+        placeholders = ",".join("?" * len(grams))
+        rows = self.__connection.execute(
+            "SELECT person_id, COUNT(*), "
+            "(SELECT COUNT(*) FROM person_trigrams AS own WHERE own.person_id = shared.person_id) "
+            f"FROM person_trigrams AS shared WHERE trigram IN ({placeholders}) GROUP BY person_id", grams)
+        scores = {row[0]: trigram_index.similarity(row[1], len(grams), row[2]) for row in rows}
+
+        return self.search_persons(trigram_index.best_matches(scores, limit))
+
+    def begin_transaction(self) -> None:
+        """
+        Open a transaction on the shared connection, if none is open yet.
+
+        Args: None
+
+        Return: None
+        """
+
+        sqlite_connection.begin_transaction(self.__connection)
+
+    def prepare_commit(self) -> list:
+        """
+        Nothing to stage on disk, SQLite commits the transaction itself.
+
+        Args: None
+
+        Return: list
+        """
+
+        return []
+
+    def end_transaction(self, committed: bool) -> None:
+        """
+        Commit or roll back the transaction of the shared connection, if still open.
+
+        Args:
+            committed (bool): whether the staged changes must be kept
+
+        Return: None
+        """
+
+        sqlite_connection.end_transaction(self.__connection, committed)
+
+    def __find_id(self, query: str, value):
+        """
+        Return id selected by a single-parameter query.
+
+        Args:
+            query (str): SELECT id query with one parameter
+            value: query parameter
+
+        Return: int or None
+        """
+
+        row = self.__connection.execute(query, (value,)).fetchone()
+
+        return None if row is None else row[0]
@@ -0,0 +1,79 @@
+import sqlite3
+
+SQLITE_MAX_PARAMETERS = 900
+
+
+def connect(database_path: str) -> sqlite3.Connection:
+    """
+    Open SQLite database shared by the Sqlite*Repository objects.
+
+    The connection runs in autocommit mode, so every statement is its own transaction unless a
+    UnitOfWork opens an explicit one, and uses write-ahead logging for cheap incremental writes.
+
+    Args:
+        database_path (str): file path of SQLite database
+
+    Return: sqlite3.Connection
+    """
+
+    connection = sqlite3.connect(database_path, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+
+    return connection
+
+
+def begin_transaction(connection: sqlite3.Connection) -> None:
+    """
+    Open a transaction on the shared connection, if none is open yet.
+
+    Args:
+        connection (sqlite3.Connection): shared connection
+
+    Return: None
+    """
+
+    if not connection.in_transaction:
+        connection.execute("BEGIN")
+
+
+def end_transaction(connection: sqlite3.Connection, committed: bool) -> None:
+    """
+    Commit or roll back the transaction of the shared connection, if still open.
+
+    Args:
+        connection (sqlite3.Connection): shared connection
+        committed (bool): whether the changes made in the transaction must be kept
+
+    Return: None
+    """
+
+    if connection.in_transaction:
+        connection.execute("COMMIT" if committed else "ROLLBACK")
+
+
+def write_atomically(connection: sqlite3.Connection, write) -> None:
+    """
+    Run a write made of several statements in one transaction, so a failing statement keeps none of them.
+
+    A transaction already open on the shared connection (a UnitOfWork) is used as is and left open.
+
+    Args:
+        connection (sqlite3.Connection): shared connection
+        write (function): function running the statements
+
+    Return: None
+    """
+
+    if connection.in_transaction:
+        write()
+        return
+
+    begin_transaction(connection)
+    try:
+        write()
+    except Exception:
+        end_transaction(connection, False)
+        raise
+
+    end_transaction(connection, True)
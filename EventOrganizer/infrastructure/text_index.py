@@ -0,0 +1,193 @@
+import bisect
+import re
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list:
+    """
+    Split text into lowercase word terms.
+
+    Args:
+        text (str): text to split
+
+    Return: list
+    """
+
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query: str) -> list:
+    """
+    Parse a text query into groups of terms.
+
+    Words are matched together (AND), the 'OR' keyword starts a new group of words and a trailing
+    '*' matches every term starting with the word, e.g. 'kitsch party OR hack*' is parsed into
+    [['kitsch', 'party'], ['hack*']].
+
+    Args:
+        query (str): text query
+
+    Return: list
+    """
+
+    groups = [[]]
+
+    for word in query.split():
+        if word == "OR":
+            groups.append([])
+            continue
+        if word == "AND":
+            continue
+
+        terms = tokenize(word)
+        if len(terms) > 0 and word.endswith("*"):
+            terms[-1] += "*"
+        groups[-1].extend(terms)
+
+    return [group for group in groups if len(group) > 0]
+
+
+def match(groups: list, lookup) -> list:
+    """
+    Return the sorted ids of the documents matching any group of terms.
+
+    The terms of a group are intersected starting with the shortest posting set, so a rare term
+    bounds the cost of the whole group.
+
+    Args:
+        groups (list): groups of terms returned by 'parse_query'
+        lookup (function): function returning the set of document ids containing a term
+
+    Return: list
+    """
+
+    result = set()
+
+    for group in groups:
+        postings = sorted((lookup(term) for term in group), key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            if len(matches) == 0:
+                break
+            matches.intersection_update(posting)
+        result.update(matches)
+
+    return sorted(result)
+
+
+class InvertedIndex:
+    """
+    Class definition for InvertedIndex.
+
+    Maps every term to the set of ids of the documents containing it; the vocabulary is also kept
+    sorted, so prefix terms are expanded by bisection instead of scanning all terms. The terms of a
+    document are computed again from its text when it is removed, instead of being stored twice.
+
+    Methods:
+        add: index the terms of a document
+        remove: drop the terms of a document from the index
+        clear: drop all documents from the index
+        lookup: return the ids of the documents containing a term
+        search: return the ids of the documents matching a text query
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor for InvertedIndex object.
+
+        Args: None
+
+        Return: None
+        """
+
+        self.__postings = {
+
+        }
+        self.__vocabulary = [
+
+        ]
+
+    def add(self, document_id: int, text: str) -> None:
+        """
+        Index the terms of a document that is not indexed yet.
+
+        Args:
+            document_id (int): id of the document
+            text (str): text of the document
+
+        Return: None
+        """
+
+        for term in set(tokenize(text)):
+            posting = self.__postings.get(term)
+            if posting is None:
+                posting = self.__postings[term] = set()
+                bisect.insort(self.__vocabulary, term)
+            posting.add(document_id)
+
+    def remove(self, document_id: int, text: str) -> None:
+        """
+        Drop the terms of a document from the index.
+
+        Args:
+            document_id (int): id of the document
+            text (str): text the document was indexed with
+
+        Return: None
+        """
+
+        for term in set(tokenize(text)):
+            posting = self.__postings.get(term)
+            if posting is None or document_id not in posting:
+                continue
+            posting.discard(document_id)
+            if len(posting) == 0:
+                del self.__postings[term]
+                del self.__vocabulary[bisect.bisect_left(self.__vocabulary, term)]
+
+    def clear(self) -> None:
+        """
+        Drop all documents from the index.
+
+        Args: None
+
+        Return: None
+        """
+
+        self.__postings.clear()
+        self.__vocabulary.clear()
+
+    def lookup(self, term: str) -> set:
+        """
+        Return the ids of the documents containing a term, or any term starting with it if it ends with '*'.
+
+        Args:
+            term (str): lowercase term
+
+        Return: set
+        """
+
+        if not term.endswith("*"):
+            return self.__postings.get(term, set())
+
+        prefix = term[:-1]
+        result = set()
+        index = bisect.bisect_left(self.__vocabulary, prefix)
+        while index < len(self.__vocabulary) and self.__vocabulary[index].startswith(prefix):
+            result.update(self.__postings[self.__vocabulary[index]])
+            index += 1
+
+        return result
+
+    def search(self, query: str) -> list:
+        """
+        Return the sorted ids of the documents matching a text query (see 'parse_query').
+
+        Args:
+            query (str): text query
+
+        Return: list
+        """
+
+        return match(parse_query(query), self.lookup)
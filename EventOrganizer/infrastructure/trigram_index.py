@@ -0,0 +1,172 @@
+import heapq
+
+MIN_SIMILARITY = 0.2
+DEFAULT_LIMIT = 5
+
+
+def trigrams(text: str) -> frozenset:
+    """
+    Return the set of trigrams of a text.
+
+    Every lowercase word is padded with two leading blanks and one trailing blank, so short words
+    and word beginnings still produce trigrams (e.g. 'Alx' -> '  a', ' al', 'alx', 'lx ').
+
+    Args:
+        text (str): text to split
+
+    Return: frozenset
+    """
+
+    result = set()
+
+    for word in text.lower().split():
+        padded = "  " + word + " "
+        for i in range(len(padded) - 2):
+            result.add(padded[i:i + 3])
+
+    return frozenset(result)
+
+
+def similarity(shared: int, size_1: int, size_2: int) -> float:
+    """
+    Return Jaccard similarity of two trigram sets from their sizes and the number of shared trigrams.
+
+    Args:
+        shared (int): number of trigrams found in both sets
+        size_1 (int): size of first set
+        size_2 (int): size of second set
+
+    Return: float
+    """
+
+    return shared / (size_1 + size_2 - shared)
+
+
+def best_matches(scores: dict, limit: int, min_similarity: float = MIN_SIMILARITY) -> list:
+    """
+    Return the ids with the greatest similarity, best first, ties broken by smallest id.
+
+    Args:
+        scores (dict): similarity of every candidate id
+        limit (int): maximum number of ids to return
+        min_similarity (float): candidates less similar than this are dropped
+
+    Return: list
+    """
+
+    candidates = [item for item in scores.items() if item[1] >= min_similarity]
+    best = heapq.nlargest(limit, candidates, key=lambda item: (item[1], -item[0]))
+
+    return [item[0] for item in best]
+
+
+class TrigramIndex:
+    """
+    Class definition for TrigramIndex.
+
+    Maps every trigram to the set of ids of the documents containing it, so fuzzy lookups only score
+    the documents sharing at least one trigram with the searched text instead of all of them. Only
+    the number of trigrams of every document is kept besides, the trigrams themselves are computed
+    again from the document text when it is removed.
+
+    Methods:
+        add: index the trigrams of a document
+        remove: drop the trigrams of a document from the index
+        clear: drop all documents from the index
+        search: return the ids of the documents most similar to a text
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor for TrigramIndex object.
+
+        Args: None
+
+        Return: None
+        """
+
+        self.__postings = {
+
+        }
+        self.__sizes = {
+
+        }
+
+    def add(self, document_id: int, text: str) -> None:
+        """
+        Index the trigrams of a document that is not indexed yet.
+
+        Args:
+            document_id (int): id of the document
+            text (str): text of the document
+
+        Return: None
+        """
+
+        grams = trigrams(text)
+        self.__sizes[document_id] = len(grams)
+
+        for gram in grams:
+            posting = self.__postings.get(gram)
+            if posting is None:
+                posting = self.__postings[gram] = set()
+            posting.add(document_id)
+
+    def remove(self, document_id: int, text: str) -> None:
+        """
+        Drop the trigrams of a document from the index.
+
+        Args:
+            document_id (int): id of the document
+            text (str): text the document was indexed with
+
+        Return: None
+        """
+
+        if self.__sizes.pop(document_id, None) is None:
+            return
+
+        for gram in trigrams(text):
+            posting = self.__postings[gram]
+            posting.discard(document_id)
+            if len(posting) == 0:
+                del self.__postings[gram]
+
+    def clear(self) -> None:
+        """
+        Drop all documents from the index.
+
+        Args: None
+
+        Return: None
+        """
+
+        self.__postings.clear()
+        self.__sizes.clear()
+
+    def search(self, text: str, limit: int = DEFAULT_LIMIT, min_similarity: float = MIN_SIMILARITY) -> list:
+        """
+        Return the ids of the documents most similar to a text, best first.
+
+        Time Complexity:
+            O(c + c log limit), c being the number of (trigram, document) pairs shared with the text
+
+        Args:
+            text (str): text to search
+            limit (int): maximum number of ids to return
+            min_similarity (float): documents less similar than this are dropped
+
+        Return: list
+        """
+
+        grams = trigrams(text)
+        shared = {}
+
+        for gram in grams:
+            for document_id in self.__postings.get(gram, ()):
+                shared[document_id] = shared.get(document_id, 0) + 1
+
+        scores = {document_id: similarity(count, len(grams), self.__sizes[document_id])
+                  for document_id, count in shared.items()}
+
+        return best_matches(scores, limit, min_similarity)
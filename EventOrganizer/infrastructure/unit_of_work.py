@@ -0,0 +1,177 @@
+from exceptions.repo_exc import RepoError
+from infrastructure import io_stats
+import os
+
+
+class UnitOfWork:
+
+    def __init__(self, person_repository, event_repository, person_event_repository, manifest_path: str) -> None:
+        """
+        Constructor for UnitOfWork object.
+
+        Changes made through the repositories between 'begin' and 'commit' are staged in memory and
+        written with one file per touched repository. Every file is first written next to its target,
+        then a manifest listing the pending renames is made durable and the files are renamed over
+        their targets. A crash before the manifest exists leaves the old data untouched, a crash after
+        it is rolled forward by 'recover', so no partial commit (e.g. attendances of a deleted person)
+        is ever observed.
+
+        Args:
+            person_repository (FilePersonRepository): FilePersonRepository object
+            event_repository (FileEventRepository): FileEventRepository object
+            person_event_repository (FilePersonEventRepository): FilePersonEventRepository object
+            manifest_path (str): file path of the commit manifest
+
+        Return: None
+        """
+
+        self.__repositories = [person_repository, event_repository, person_event_repository]
+        self.__manifest_path = manifest_path
+        self.__active = False
+        UnitOfWork.recover(manifest_path)
+
+    @staticmethod
+    def recover(manifest_path: str) -> None:
+        """
+        Finish the renames of a commit that was interrupted after its manifest was written.
+
+        Args:
+            manifest_path (str): file path of the commit manifest
+
+        Return: None
+        """
+
+        if not os.path.exists(manifest_path):
+            return
+
+        with io_stats.open_file(manifest_path, "r") as f:
+            lines = f.readlines()
+
+        for line in lines:
+            line = line.rstrip("\n")
+            if line == "":
+                continue
+
+            temporary_path, target_path = line.split("\t")
+            if os.path.exists(temporary_path):
+                os.replace(temporary_path, target_path)
+
+        os.remove(manifest_path)
+
+    def begin(self) -> None:
+        """
+        Start staging changes of all repositories in memory.
+
+        Args: None
+
+        Return: None
+        """
+
+        if self.__active:
+            raise RepoError("ERROR: transaction already in progress...")
+
+        UnitOfWork.recover(self.__manifest_path)
+
+        started = []
+        try:
+            for repository in self.__repositories:
+                repository.begin_transaction()
+                started.append(repository)
+        except Exception:
+            for repository in started:
+                repository.end_transaction(False)
+            raise
+
+        self.__active = True
+
+    def commit(self) -> None:
+        """
+        Write all staged changes, one file per touched repository, and leave the transaction.
+
+        Args: None
+
+        Return: None
+        """
+
+        if not self.__active:
+            raise RepoError("ERROR: no transaction in progress...")
+
+        renames = []
+        try:
+            for repository in self.__repositories:
+                renames.extend(repository.prepare_commit())
+        except Exception:
+            for temporary_path, _ in renames:
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+            self.rollback()
+            raise
+
+        if len(renames) > 0:
+            self.__write_manifest(renames)
+            UnitOfWork.recover(self.__manifest_path)
+
+        for repository in self.__repositories:
+            repository.end_transaction(True)
+
+        self.__active = False
+
+    def rollback(self) -> None:
+        """
+        Drop all staged changes and leave the transaction.
+
+        Args: None
+
+        Return: None
+        """
+
+        if not self.__active:
+            return
+
+        for repository in self.__repositories:
+            repository.end_transaction(False)
+
+        self.__active = False
+
+    def __write_manifest(self, renames: list) -> None:
+        """
+        Durably write the list of pending renames.
+
+        Args:
+            renames (list): (temporary file path, target file path) pairs
+
+        Return: None
+        """
+
+        temporary_manifest_path = self.__manifest_path + ".tmp"
+        with io_stats.open_file(temporary_manifest_path, "w") as f:
+            for temporary_path, target_path in renames:
+                f.write(f"{temporary_path}\t{target_path}\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temporary_manifest_path, self.__manifest_path)
+
+    def __enter__(self):
+        """
+        Begin transaction when entering a 'with' block.
+
+        Return: UnitOfWork
+        """
+
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        """
+        Commit transaction when the 'with' block succeeds, roll it back otherwise.
+
+        Return: bool
+        """
+
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+        return False
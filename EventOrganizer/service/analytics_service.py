@@ -0,0 +1,131 @@
+from domain.dtos import TopPersonsDTO
+from domain.dtos import TopEventsDTO
+from domain.event import format_date
+from service.ranking import DEFAULT_TOP_PERCENT
+
+
+class AnalyticsService:
+    """
+    Class definition for AnalyticsService.
+
+    Attendance aggregates answered by a ColumnarPersonEventRepository with vectorized operations,
+    only the selected Person and Event objects are read from their repositories.
+
+    Methods:
+        get_top_persons: get the Person objects attending most events
+        get_top_events: get the Event objects with most attending persons
+        persons_attending_at_least: get the Person objects attending at least a number of events
+        attendance_by_date: get the number of attendances of every date
+    """
+
+    def __init__(self, person_repository, event_repository, columnar_repository) -> None:
+        """
+        Constructor for AnalyticsService object.
+
+        Args:
+            person_repository (PersonRepository): PersonRepository object
+            event_repository (EventRepository): EventRepository object
+            columnar_repository (ColumnarPersonEventRepository): ColumnarPersonEventRepository object
+
+        Return: None
+        """
+
+        self.__person_repository = person_repository
+        self.__event_repository = event_repository
+        self.__columnar_repository = columnar_repository
+
+    @staticmethod
+    def __get_k(k: int, percent: int, size) -> int:
+        """
+        Return number of items to rank, like RankingEngine.select.
+
+        Args:
+            k (int): number of items (top-k mode)
+            percent (int): percentage of all items (used when k is None)
+            size (function): function returning the number of all items
+
+        Return: int
+        """
+
+        if k is not None:
+            return k
+
+        return size() * (DEFAULT_TOP_PERCENT if percent is None else percent) // 100
+
+    def get_top_persons(self, k: int = None, percent: int = None, include_ties: bool = False) -> list:
+        """
+        Return the Person objects attending most events, best first, top 20% by default.
+
+        Same contract as PersonEventService.get_top_persons, except that persons attending no
+        event are never ranked.
+
+        Args:
+            k (int): number of Person objects to return
+            percent (int): percentage of Person objects to return (used when k is None)
+            include_ties (bool): also return Person objects tied with the last one
+
+        Return: list of TopPersonsDTO objects
+        """
+
+        k = self.__get_k(k, percent, lambda: len(self.__person_repository.get_persons()))
+        ranking = self.__columnar_repository.top_persons(k, include_ties)
+        persons = self.__person_repository.search_persons([person_id for person_id, _ in ranking])
+
+        return [TopPersonsDTO(person, count) for person, (_, count) in zip(persons, ranking)]
+
+    def get_top_events(self, k: int = None, percent: int = None, include_ties: bool = False) -> list:
+        """
+        Return the Event objects with most attending persons, best first, top 20% by default.
+
+        Same contract as PersonEventService.get_top_events, except that events without persons are
+        never ranked.
+
+        Args:
+            k (int): number of Event objects to return
+            percent (int): percentage of Event objects to return (used when k is None)
+            include_ties (bool): also return Event objects tied with the last one
+
+        Return: list of TopEventsDTO objects
+        """
+
+        k = self.__get_k(k, percent, lambda: len(self.__event_repository.get_events()))
+        ranking = self.__columnar_repository.top_events(k, include_ties)
+        events = self.__event_repository.search_events([event_id for event_id, _ in ranking])
+
+        return [TopEventsDTO(event.get_description(), count) for event, (_, count) in zip(events, ranking)]
+
+    def persons_attending_at_least(self, count: int) -> list:
+        """
+        Return the Person objects attending at least 'count' events, by id.
+
+        Args:
+            count (int): minimum number of events
+
+        Return: list of TopPersonsDTO objects
+        """
+
+        person_ids = self.__columnar_repository.persons_attending_at_least(count)
+        persons = self.__person_repository.search_persons(person_ids)
+
+        return [TopPersonsDTO(person, self.__columnar_repository.count_person_events(person.get_id()))
+                for person in persons]
+
+    def attendance_by_date(self) -> list:
+        """
+        Return the number of attendances of every date with attendances, chronologically.
+
+        Args: None
+
+        Return: list of (date, count) tuples
+        """
+
+        event_dates = {}
+        for event in self.__event_repository.get_events():
+            try:
+                event_dates[event.get_id()] = event.get_date_key()
+            except ValueError:
+                continue
+
+        counts = self.__columnar_repository.count_by_event_date(event_dates)
+
+        return [(format_date(date_key), counts[date_key]) for date_key in sorted(counts)]
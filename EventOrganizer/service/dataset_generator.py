@@ -0,0 +1,244 @@
+from domain.person import Person
+from domain.event import Event
+from exceptions.valid_exc import ValidError
+import argparse
+import itertools
+import os
+import random
+import time
+
+DEFAULT_SEED = 0
+
+# Exponent s of the Zipf law: the event of popularity rank r is picked with probability proportional to 1 / r ** s.
+DEFAULT_ZIPF_EXPONENT = 1.0
+
+# Number of records formatted before each write.
+WRITE_CHUNK_SIZE = 100000
+
+PERSONS_FILE_NAME = "persons.txt"
+EVENTS_FILE_NAME = "events.txt"
+PERSON_EVENT_FILE_NAME = "person_event.txt"
+PERSON_EVENT_BINARY_FILE_NAME = "person_event.bin"
+
+# Files derived from the attendance text file; stale copies would be served instead of the new dataset.
+DERIVED_FILE_NAMES = (PERSON_EVENT_BINARY_FILE_NAME, PERSON_EVENT_BINARY_FILE_NAME + ".by_event",
+                      PERSON_EVENT_BINARY_FILE_NAME + ".manifest", PERSON_EVENT_BINARY_FILE_NAME + ".tmp",
+                      PERSON_EVENT_BINARY_FILE_NAME + ".by_event.tmp")
+
+SYLLABLES = ("al", "an", "da", "el", "ex", "ia", "ma", "na", "ri", "ro", "se", "ta", "to", "vi", "vl", "ad")
+
+# Generated addresses start with this prefix, so they never collide with addresses of real data
+# (such as the shipped 'AurelVlaicu184') when generated people are added next to it.
+ADDRESS_PREFIX = "Generated"
+
+STREETS = ("AurelVlaicu", "Vantului", "Tudor", "Principala", "Motilor", "Dorobantilor", "Horea", "Memorandumului",
+           "Eroilor", "Fabricii", "Observatorului", "Republicii")
+
+EVENT_KINDS = ("Party", "Concert", "Hackathon", "Workshop", "Conference", "Meetup", "Festival", "Treasure Hunt")
+
+EVENT_PLACES = ("FMI", "UBB", "Cluj Napoca", "Form Club", "Campus", "Central Park", "Iulius Mall", "Opera")
+
+FIRST_YEAR = 2020
+YEARS = 7
+
+
+def generate_persons(count: int, seed=DEFAULT_SEED, first_id: int = 1):
+    """
+    Yield random Person objects with consecutive ids, so ids never collide.
+
+    Names are 2 or 3 random syllables, addresses ADDRESS_PREFIX and a street name followed by the id
+    of the person, so addresses are unique as well, and distinct from the addresses of real data.
+
+    Args:
+        count (int): number of Person objects
+        seed (int): seed of the random generator (None for a different dataset every call)
+        first_id (int): id of the first Person object
+
+    Return: generator of Person objects
+    """
+
+    generator = random.Random(seed)
+
+    for person_id in range(first_id, first_id + count):
+        name = "".join(generator.choices(SYLLABLES, k=generator.randint(2, 3))).capitalize()
+        yield Person(person_id, name, f"{ADDRESS_PREFIX}{generator.choice(STREETS)}{person_id}")
+
+
+def generate_events(count: int, seed=DEFAULT_SEED, first_id: int = 1):
+    """
+    Yield random Event objects with consecutive ids, dated between FIRST_YEAR and FIRST_YEAR + YEARS - 1.
+
+    Args:
+        count (int): number of Event objects
+        seed (int): seed of the random generator
+        first_id (int): id of the first Event object
+
+    Return: generator of Event objects
+    """
+
+    generator = random.Random(seed)
+
+    for event_id in range(first_id, first_id + count):
+        date = f"{FIRST_YEAR + generator.randrange(YEARS)}-{generator.randint(1, 12)}-{generator.randint(1, 28)}"
+        event_time = f"{generator.randint(0, 23)}:{generator.choice(('00', '15', '30', '45'))}"
+        description = f"{generator.choice(EVENT_PLACES)} - {generator.choice(EVENT_KINDS)} {event_id}"
+        yield Event(event_id, date, event_time, description)
+
+
+def generate_attendance(count: int, persons: int, events: int, seed=DEFAULT_SEED,
+                        exponent: float = DEFAULT_ZIPF_EXPONENT):
+    """
+    Yield distinct (person_id, event_id) pairs, grouped by person, ids in 1..persons and 1..events.
+
+    Every person attends count // persons or one more events. Event popularity follows a Zipf law over
+    a random ranking of the events, so a few events draw most of the attendance, as in real data.
+
+    Args:
+        count (int): number of attendances
+        persons (int): number of persons
+        events (int): number of events
+        seed (int): seed of the random generator
+        exponent (float): exponent of the Zipf law (0 for uniform popularity)
+
+    Raises:
+        ValidError: more attendances than (person, event) pairs
+
+    Return: generator of (int, int) tuples
+    """
+
+    if count > persons * events:
+        raise ValidError(f"ERROR: {persons} persons and {events} events allow at most {persons * events} "
+                         "attendances...")
+
+    if count <= 0:
+        return
+
+    generator = random.Random(seed)
+    ranking = list(range(1, events + 1))
+    generator.shuffle(ranking)
+    cum_weights = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, events + 1)))
+
+    per_person, remainder = divmod(count, persons)
+    busier = set(generator.sample(range(1, persons + 1), remainder))
+
+    for person_id in range(1, persons + 1):
+        degree = per_person + (person_id in busier)
+        if degree == 0:
+            continue
+
+        # Drawing distinct events from a skewed law gets slow once most events are taken; a person
+        # attending more than half of them gets a uniform sample instead.
+        if degree * 2 > events:
+            chosen = generator.sample(ranking, degree)
+        else:
+            chosen = set()
+            while len(chosen) < degree:
+                chosen.update(generator.choices(ranking, cum_weights=cum_weights, k=degree - len(chosen)))
+
+        for event_id in sorted(chosen):
+            yield person_id, event_id
+
+
+def write_lines(file_path: str, lines) -> int:
+    """
+    Write lines to a text file, WRITE_CHUNK_SIZE lines at a time.
+
+    Args:
+        file_path (str): file path of text file
+        lines (generator): lines to write, without line endings
+
+    Return: int (number of lines written)
+    """
+
+    count = 0
+
+    with open(file_path, "w") as f:
+        while True:
+            chunk = list(itertools.islice(lines, WRITE_CHUNK_SIZE))
+            if len(chunk) == 0:
+                break
+
+            f.write("\n".join(chunk) + "\n")
+            count += len(chunk)
+
+    return count
+
+
+def write_dataset(directory: str, persons: int, events: int, attendances: int, seed=DEFAULT_SEED,
+                  exponent: float = DEFAULT_ZIPF_EXPONENT) -> dict:
+    """
+    Write persons, events and attendance text files of the file backend to a directory.
+
+    Existing data files (and their journals) in the directory are replaced, and the binary attendance
+    files are removed, so the application converts the new attendance on its next start.
+
+    Args:
+        directory (str): directory of the text files, created if missing
+        persons (int): number of persons
+        events (int): number of events
+        attendances (int): number of attendances
+        seed (int): seed of the random generator, the same seed always gives the same files
+        exponent (float): exponent of the Zipf law of event popularity
+
+    Return: dict of file path -> number of records written
+    """
+
+    if persons < 0 or events < 0 or attendances < 0:
+        raise ValidError("ERROR: dataset sizes must be positive numeric values...")
+
+    os.makedirs(directory, exist_ok=True)
+    written = {}
+
+    for file_name in DERIVED_FILE_NAMES:
+        file_path = os.path.join(directory, file_name)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    person_lines = (f"{person.get_id()}\n{person.get_name()}\n{person.get_address()}"
+                    for person in generate_persons(persons, seed))
+    event_lines = (f"{event.get_id()},{event.get_date()},{event.get_time()},{event.get_description()}"
+                   for event in generate_events(events, seed))
+    attendance_lines = (f"{person_id},{event_id}"
+                        for person_id, event_id in generate_attendance(attendances, persons, events, seed, exponent))
+
+    for file_name, lines in ((PERSONS_FILE_NAME, person_lines), (EVENTS_FILE_NAME, event_lines),
+                             (PERSON_EVENT_FILE_NAME, attendance_lines)):
+        file_path = os.path.join(directory, file_name)
+        if os.path.exists(file_path + ".journal"):
+            os.remove(file_path + ".journal")
+        written[file_path] = write_lines(file_path, lines)
+
+    return written
+
+
+def main() -> None:
+    """
+    Generate a dataset from the command line arguments and print what was written.
+
+    Return: None
+    """
+
+    parser = argparse.ArgumentParser(description="Generate a reproducible synthetic dataset for the file backend.")
+    parser.add_argument("directory", help="output directory (point EVENT_ORGANIZER_DATA at it to use the dataset)")
+    parser.add_argument("--persons", type=int, default=1000, help="number of persons (default: 1000)")
+    parser.add_argument("--events", type=int, default=100, help="number of events (default: 100)")
+    parser.add_argument("--attendances", type=int, default=10000, help="number of attendances (default: 10000)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"random seed (default: {DEFAULT_SEED})")
+    parser.add_argument("--zipf", type=float, default=DEFAULT_ZIPF_EXPONENT,
+                        help=f"Zipf exponent of event popularity, 0 for uniform (default: {DEFAULT_ZIPF_EXPONENT})")
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        written = write_dataset(arguments.directory, arguments.persons, arguments.events, arguments.attendances,
+                                arguments.seed, arguments.zipf)
+    except ValidError as error:
+        parser.error(str(error))
+
+    for file_path, count in written.items():
+        print(f"{file_path}: {count} records")
+    print(f"generated in {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
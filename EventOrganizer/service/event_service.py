@@ -1,5 +1,10 @@
 from validation.functions import Functions
 from domain.event import Event
+from domain.event import parse_date
+from domain.event import parse_time
+from domain.event import MINUTES_PER_DAY
+from exceptions.valid_exc import ValidError
+from infrastructure import text_index
 
 
 class EventService(Functions):
@@ -22,6 +27,10 @@ class EventService(Functions):
         modify_event_time: update Event object 'time' attribute
         modify_event_description: update Event object 'description' attribute
         search_event: search Event object
+        search_events: search several Event objects at once
+        events_between: get Event objects taking place between two dates
+        upcoming_events: get the next Event objects from a date and time on
+        search_events_text: get Event objects whose description matches a text query
     """
 
     def __init__(self, event_repository, event_validator) -> None:
@@ -140,3 +149,69 @@ class EventService(Functions):
 
         return event
 
+    def search_events(self, ids: list) -> list:
+        """
+        Search several Event objects at once.
+
+        Args:
+            ids (list): ids of Event objects
+
+        Return: list
+        """
+
+        return self.__event_repository.search_events(ids)
+
+    def events_between(self, start_date: str, end_date: str) -> list:
+        """
+        Get Event objects taking place between two dates (both inclusive), chronologically.
+
+        Args:
+            start_date (str): first date, 'year-month-day'
+            end_date (str): last date, 'year-month-day'
+
+        Return: list
+        """
+
+        if not self.validate_date(start_date) or not self.validate_date(end_date):
+            raise ValidError("ERROR: 'date' must have valid 'year-month-day' format...")
+
+        start = parse_date(start_date) * MINUTES_PER_DAY
+        end = parse_date(end_date) * MINUTES_PER_DAY + MINUTES_PER_DAY - 1
+
+        return self.__event_repository.events_between(start, end)
+
+    def upcoming_events(self, date: str, time: str, count: int) -> list:
+        """
+        Get the next Event objects taking place from a date and time on, chronologically.
+
+        Args:
+            date (str): date to search from, 'year-month-day'
+            time (str): time to search from, 'hour:minute'
+            count (int): maximum number of Event objects
+
+        Return: list
+        """
+
+        if not self.validate_date(date):
+            raise ValidError("ERROR: 'date' must have valid 'year-month-day' format...")
+        if not self.validate_time(time):
+            raise ValidError("ERROR: 'time' must have valid 'hour:minute' format...")
+
+        start = parse_date(date) * MINUTES_PER_DAY + parse_time(time)
+
+        return self.__event_repository.upcoming_events(start, count)
+
+    def search_events_text(self, query: str) -> list:
+        """
+        Get Event objects whose description matches a text query, by id.
+
+        Args:
+            query (str): words to match, 'OR' between alternatives and a trailing '*' for prefixes
+
+        Return: list
+        """
+
+        if len(text_index.parse_query(query)) == 0:
+            raise ValidError("ERROR: search query must contain at least one word...")
+
+        return self.__event_repository.search_events_text(query)
@@ -0,0 +1,298 @@
+from exceptions.repo_exc import RepoError
+from exceptions.valid_exc import ValidError
+import csv
+import datetime
+import json
+import os
+import time
+
+WRITE_BUFFER_SIZE = 1 << 20
+
+COLUMNS = {
+    "persons": ("id", "name", "address"),
+    "events": ("id", "date", "time", "description"),
+    "attendance": ("person_id", "name", "address", "event_id", "date", "time", "description"),
+    "top_persons": ("id", "name", "address", "events"),
+    "top_events": ("description", "persons"),
+}
+
+CALENDAR_KINDS = ("events", "attendance")
+
+# iCalendar content lines must not be longer than 75 octets, longer ones are folded.
+ICS_LINE_LIMIT = 75
+
+
+class ExportService:
+    """
+    Class definition for ExportService.
+
+    Records are produced by generators straight from the repositories and written through a large
+    buffer into a temporary file renamed over the target once complete, so exports never hold more than
+    one row (plus the Event objects, for attendance joins) in memory.
+
+    Methods:
+        export_file: export persons, events, attendance or rankings to a CSV, JSONL or iCalendar file
+    """
+
+    def __init__(self, person_repository, event_repository, person_event_repository, person_event_service) -> None:
+        """
+        Constructor for ExportService object.
+
+        Args:
+            person_repository (PersonRepository): PersonRepository object
+            event_repository (EventRepository): EventRepository object
+            person_event_repository (PersonEventRepository): PersonEventRepository object
+            person_event_service (PersonEventService): PersonEventService object computing the rankings
+
+        Return: None
+        """
+
+        self.__person_repository = person_repository
+        self.__event_repository = event_repository
+        self.__person_event_repository = person_event_repository
+        self.__person_event_service = person_event_service
+
+    def __iter_attendance(self):
+        """
+        Yield (Person, Event) pairs of every attendance, grouped by person.
+
+        Persons are streamed one at a time, only the Event objects are kept in memory for the join.
+        Attendances of missing persons or events are left out.
+
+        Args: None
+
+        Return: generator of (Person, Event) tuples
+        """
+
+        events = {event.get_id(): event for event in self.__event_repository.iter_events()}
+
+        for person in self.__person_repository.iter_persons():
+            for event_id in self.__person_event_repository.get_person_events(person):
+                event = events.get(event_id)
+                if event is not None:
+                    yield person, event
+
+    def __iter_rows(self, kind: str):
+        """
+        Yield rows of given kind, values in the order of COLUMNS[kind].
+
+        Args:
+            kind (str): kind of exported records
+
+        Return: generator of tuples
+        """
+
+        if kind == "persons":
+            for person in self.__person_repository.iter_persons():
+                yield person.get_id(), person.get_name(), person.get_address()
+        elif kind == "events":
+            for event in self.__event_repository.iter_events():
+                yield event.get_id(), event.get_date(), event.get_time(), event.get_description()
+        elif kind == "attendance":
+            for person, event in self.__iter_attendance():
+                yield (person.get_id(), person.get_name(), person.get_address(),
+                       event.get_id(), event.get_date(), event.get_time(), event.get_description())
+        elif kind == "top_persons":
+            for dto in self.__person_event_service.get_top_persons():
+                person = dto.get_person()
+                yield person.get_id(), person.get_name(), person.get_address(), dto.get_nr_events()
+        else:
+            for dto in self.__person_event_service.get_top_events():
+                yield dto.get_event_description(), dto.get_nr_persons()
+
+    @staticmethod
+    def __write_csv(f, columns: tuple, rows) -> int:
+        """
+        Write header and rows as CSV.
+
+        Args:
+            f (file): opened output file
+            columns (tuple): column names
+            rows (generator): rows to write
+
+        Return: int (number of rows written)
+        """
+
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        count = 0
+
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+
+        return count
+
+    @staticmethod
+    def __write_jsonl(f, columns: tuple, rows) -> int:
+        """
+        Write rows as one JSON object per line.
+
+        Args:
+            f (file): opened output file
+            columns (tuple): column names
+            rows (generator): rows to write
+
+        Return: int (number of rows written)
+        """
+
+        count = 0
+
+        for row in rows:
+            f.write(json.dumps(dict(zip(columns, row))) + "\n")
+            count += 1
+
+        return count
+
+    @staticmethod
+    def __escape_ics(text: str) -> str:
+        """
+        Escape an iCalendar TEXT value.
+
+        Args:
+            text (str): text to escape
+
+        Return: str
+        """
+
+        return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+    @staticmethod
+    def __fold_ics(line: str) -> str:
+        """
+        Fold an iCalendar content line longer than ICS_LINE_LIMIT octets and terminate it with CRLF.
+
+        Args:
+            line (str): content line
+
+        Return: str
+        """
+
+        parts = []
+        limit = ICS_LINE_LIMIT
+
+        while len(line.encode("utf-8")) > limit:
+            cut = limit
+            while len(line[:cut].encode("utf-8")) > limit:
+                cut -= 1
+            parts.append(line[:cut])
+            line = line[cut:]
+            limit = ICS_LINE_LIMIT - 1
+
+        parts.append(line)
+
+        return "\r\n ".join(parts) + "\r\n"
+
+    def __search_attendees(self, person_ids: list) -> list:
+        """
+        Return the stored Person objects among given ids; ids of missing persons are left out.
+
+        Args:
+            person_ids (list): ids of Person objects attending an event
+
+        Return: list
+        """
+
+        try:
+            return self.__person_repository.search_persons(person_ids)
+        except RepoError:
+            pass
+
+        persons = []
+
+        for person_id in person_ids:
+            try:
+                persons.append(self.__person_repository.search_person(person_id))
+            except RepoError:
+                continue
+
+        return persons
+
+    def __write_ics(self, f, kind: str) -> int:
+        """
+        Write events as iCalendar VEVENT components, attendance joins add one ATTENDEE per person.
+
+        Events whose date or time cannot be parsed are left out, and so are attendances of missing
+        persons, as in the CSV / JSONL attendance join.
+
+        Args:
+            f (file): opened output file
+            kind (str): 'events' or 'attendance'
+
+        Return: int (number of events written)
+        """
+
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        f.write("BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//EventOrganizer//Export//EN\r\n")
+        count = 0
+
+        for event in self.__event_repository.iter_events():
+            try:
+                date = datetime.date.fromordinal(event.get_date_key())
+                minutes = event.get_time_key()
+            except ValueError:
+                continue
+
+            lines = ["BEGIN:VEVENT",
+                     f"UID:event-{event.get_id()}@eventorganizer",
+                     f"DTSTAMP:{stamp}",
+                     f"DTSTART:{date.strftime('%Y%m%d')}T{minutes // 60:02d}{minutes % 60:02d}00",
+                     f"SUMMARY:{self.__escape_ics(event.get_description())}"]
+
+            if kind == "attendance":
+                person_ids = self.__person_event_repository.get_event_persons(event)
+                for person in self.__search_attendees(person_ids):
+                    name = person.get_name().replace('"', "'")
+                    lines.append(f'ATTENDEE;CN="{name}":urn:eventorganizer:person:{person.get_id()}')
+
+            lines.append("END:VEVENT")
+            f.write("".join(self.__fold_ics(line) for line in lines))
+            count += 1
+
+        f.write("END:VCALENDAR\r\n")
+
+        return count
+
+    def export_file(self, kind: str, file_path: str) -> tuple:
+        """
+        Export records to a '.csv', '.jsonl' or '.ics' file (iCalendar only for events and attendance).
+
+        Args:
+            kind (str): 'persons', 'events', 'attendance', 'top_persons' or 'top_events'
+            file_path (str): path of the output file
+
+        Return: tuple (number of rows written, duration in seconds)
+        """
+
+        if kind not in COLUMNS:
+            raise ValidError(f"ERROR: unknown export kind '{kind}'...")
+
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension not in (".csv", ".jsonl", ".ics"):
+            raise ValidError("ERROR: export file must be a '.csv', '.jsonl' or '.ics' file...")
+        if extension == ".ics" and kind not in CALENDAR_KINDS:
+            raise ValidError("ERROR: only events and attendance can be exported to iCalendar...")
+
+        start = time.perf_counter()
+        temporary_path = file_path + ".tmp"
+
+        try:
+            f = open(temporary_path, "w", buffering=WRITE_BUFFER_SIZE, newline="", encoding="utf-8")
+        except IOError:
+            raise RepoError(f"ERROR: path '{file_path}' does not exist..")
+
+        try:
+            with f:
+                if extension == ".csv":
+                    count = self.__write_csv(f, COLUMNS[kind], self.__iter_rows(kind))
+                elif extension == ".jsonl":
+                    count = self.__write_jsonl(f, COLUMNS[kind], self.__iter_rows(kind))
+                else:
+                    count = self.__write_ics(f, kind)
+        except Exception:
+            os.remove(temporary_path)
+            raise
+
+        os.replace(temporary_path, file_path)
+
+        return count, time.perf_counter() - start
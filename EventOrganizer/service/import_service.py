@@ -0,0 +1,333 @@
+from domain.person import Person
+from domain.event import Event
+from domain.person_event import PersonEvent
+from domain.dtos import ImportReportDTO
+from exceptions.repo_exc import RepoError
+from exceptions.valid_exc import ValidError
+from infrastructure.binary_person_event_repository import MAX_ID
+import contextlib
+import csv
+import json
+import os
+import time
+
+DEFAULT_CHUNK_SIZE = 1000
+
+COLUMNS = {
+    "persons": ("id", "name", "address"),
+    "events": ("id", "date", "time", "description"),
+    "attendance": ("person_id", "event_id"),
+}
+
+
+class ImportService:
+    """
+    Class definition for ImportService.
+
+    Rows are streamed from a CSV file (with a header naming the columns) or a JSONL file (one object
+    per line) and handled in chunks: every row is validated like a console command would be and checked
+    against the stored Person / Event objects, invalid rows are rejected with their line number and the
+    whole import is committed at once through the UnitOfWork, i.e. with a single write per file.
+
+    Methods:
+        import_file: import persons, events or attendance rows from a file
+    """
+
+    def __init__(self, person_repository, event_repository, person_event_repository, person_validator,
+                 event_validator, unit_of_work=None) -> None:
+        """
+        Constructor for ImportService object.
+
+        Args:
+            person_repository (PersonRepository): PersonRepository object
+            event_repository (EventRepository): EventRepository object
+            person_event_repository (PersonEventRepository): PersonEventRepository object
+            person_validator (PersonValidator): PersonValidator object
+            event_validator (EventValidator): EventValidator object
+            unit_of_work (UnitOfWork): UnitOfWork object grouping the import in one commit (optional)
+
+        Return: None
+        """
+
+        self.__person_repository = person_repository
+        self.__event_repository = event_repository
+        self.__person_event_repository = person_event_repository
+        self.__person_validator = person_validator
+        self.__event_validator = event_validator
+        self.__unit_of_work = unit_of_work
+
+    @staticmethod
+    def __read_csv(f):
+        """
+        Yield (line number, row) pairs of a CSV file with a header.
+
+        Args:
+            f (file): opened CSV file
+
+        Return: generator of (int, dict) tuples
+        """
+
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+
+    @staticmethod
+    def __read_jsonl(f):
+        """
+        Yield (line number, row) pairs of a JSONL file, rows that are not JSON objects are yielded as errors.
+
+        Args:
+            f (file): opened JSONL file
+
+        Return: generator of (int, dict or str) tuples
+        """
+
+        for line_number, line in enumerate(f, start=1):
+            if line.strip() == "":
+                continue
+
+            try:
+                row = json.loads(line)
+            except ValueError as error:
+                yield line_number, f"ERROR: invalid JSON ({error})..."
+                continue
+
+            if not isinstance(row, dict):
+                yield line_number, "ERROR: row must be a JSON object..."
+                continue
+
+            yield line_number, row
+
+    @staticmethod
+    def __read_chunks(rows, chunk_size: int):
+        """
+        Group rows in lists of at most 'chunk_size' rows.
+
+        Args:
+            rows (generator): rows to group
+            chunk_size (int): maximum number of rows of a chunk
+
+        Return: generator of lists
+        """
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+
+        if len(chunk) > 0:
+            yield chunk
+
+    @staticmethod
+    def __get_id(column: str, value) -> int:
+        """
+        Return an id value as int; ints, integral floats and integer strings are ids, bools and lists are not.
+
+        Ids must lie between 0 and MAX_ID, the range of the binary attendance file and of the columnar
+        analytics, so a bad row is rejected here instead of failing the write of its whole chunk.
+
+        Args:
+            column (str): name of the column
+            value: value read from file
+
+        Raises:
+            ValidError: the value is not an integer or is out of range
+
+        Return: int
+        """
+
+        number = None
+
+        if isinstance(value, int) and not isinstance(value, bool):
+            number = value
+        elif isinstance(value, float) and value.is_integer():
+            number = int(value)
+        elif isinstance(value, str):
+            try:
+                number = int(value)
+            except ValueError:
+                pass
+
+        if number is None:
+            raise ValidError(f"ERROR: '{column}' must be a numeric value...")
+
+        if not 0 <= number <= MAX_ID:
+            raise ValidError(f"ERROR: '{column}' must be between 0 and {MAX_ID}...")
+
+        return number
+
+    @staticmethod
+    def __get_values(kind: str, row: dict) -> list:
+        """
+        Return the column values of a row, ids converted to int.
+
+        Args:
+            kind (str): kind of imported records
+            row (dict): row read from file
+
+        Raises:
+            ValidError: a column is missing or an id is not an integer
+
+        Return: list
+        """
+
+        values = []
+
+        for column in COLUMNS[kind]:
+            value = row.get(column)
+            if value is None or str(value).strip() == "":
+                raise ValidError(f"ERROR: missing '{column}' value...")
+
+            if column.endswith("id"):
+                value = ImportService.__get_id(column, value)
+            elif isinstance(value, (str, int, float)) and not isinstance(value, bool):
+                value = str(value).strip()
+            else:
+                raise ValidError(f"ERROR: '{column}' must be a text value...")
+
+            values.append(value)
+
+        return values
+
+    def __import_person(self, values: list) -> None:
+        """
+        Validate and add one person row.
+
+        Args:
+            values (list): id, name and address
+
+        Return: None
+        """
+
+        person = Person(values[0], values[1].capitalize(), values[2])
+        self.__person_validator.validate_person(person)
+        self.__person_repository.add_person(person)
+
+    def __import_event(self, values: list) -> None:
+        """
+        Validate and add one event row.
+
+        Args:
+            values (list): id, date, time and description
+
+        Return: None
+        """
+
+        event = Event(values[0], values[1], values[2], values[3])
+        self.__event_validator.validate_event(event)
+        self.__event_repository.add_event(event)
+
+    def __import_attendance_chunk(self, chunk: list, rejected: list) -> tuple:
+        """
+        Check the referenced Person and Event objects of a chunk of attendance rows and add them at once.
+
+        Args:
+            chunk (list): (line number, values) pairs
+            rejected (list): (line number, error message) pairs to extend
+
+        Return: tuple (number of added rows, number of already stored rows)
+        """
+
+        person_events = []
+        known_persons = set()
+        known_events = set()
+
+        for line_number, (person_id, event_id) in chunk:
+            try:
+                if person_id not in known_persons:
+                    self.__person_repository.search_person(person_id)
+                    known_persons.add(person_id)
+                if event_id not in known_events:
+                    self.__event_repository.search_event(event_id)
+                    known_events.add(event_id)
+            except RepoError as error:
+                rejected.append((line_number, str(error)))
+                continue
+
+            person_events.append(PersonEvent(person_id, event_id))
+
+        added = self.__person_event_repository.store_all(person_events)
+
+        return len(added), len(person_events) - len(added)
+
+    def __transaction(self):
+        """
+        Return context manager committing the whole import at once.
+
+        Args: None
+
+        Return: UnitOfWork or a no-op context manager
+        """
+
+        if self.__unit_of_work is None:
+            return contextlib.nullcontext()
+
+        return self.__unit_of_work
+
+    def import_file(self, kind: str, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> ImportReportDTO:
+        """
+        Import persons, events or attendance rows from a CSV or JSONL file.
+
+        CSV files need a header naming the columns ('id,name,address' for persons,
+        'id,date,time,description' for events and 'person_id,event_id' for attendance), JSONL files
+        have one object per line with the same keys.
+
+        Args:
+            kind (str): 'persons', 'events' or 'attendance'
+            file_path (str): path of a '.csv' or '.jsonl' file
+            chunk_size (int): number of rows handled at once
+
+        Return: ImportReportDTO
+        """
+
+        if kind not in COLUMNS:
+            raise ValidError(f"ERROR: unknown import kind '{kind}'...")
+
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension not in (".csv", ".jsonl"):
+            raise ValidError("ERROR: import file must be a '.csv' or '.jsonl' file...")
+
+        try:
+            f = open(file_path, "r", newline="" if extension == ".csv" else None)
+        except IOError:
+            raise RepoError(f"ERROR: path '{file_path}' does not exist..")
+
+        start = time.perf_counter()
+        rows = imported = skipped = 0
+        rejected = []
+
+        with f, self.__transaction():
+            lines = self.__read_csv(f) if extension == ".csv" else self.__read_jsonl(f)
+            for chunk in self.__read_chunks(lines, chunk_size):
+                rows += len(chunk)
+                valid = []
+
+                for line_number, row in chunk:
+                    try:
+                        if isinstance(row, str):
+                            raise ValidError(row)
+                        valid.append((line_number, self.__get_values(kind, row)))
+                    except (ValidError, TypeError) as error:
+                        rejected.append((line_number, str(error)))
+
+                if kind == "attendance":
+                    added, duplicates = self.__import_attendance_chunk(valid, rejected)
+                    imported += added
+                    skipped += duplicates
+                    continue
+
+                for line_number, values in valid:
+                    try:
+                        if kind == "persons":
+                            self.__import_person(values)
+                        else:
+                            self.__import_event(values)
+                        imported += 1
+                    except (ValidError, RepoError) as error:
+                        rejected.append((line_number, str(error).replace("\n", " ")))
+
+        rejected.sort()
+
+        return ImportReportDTO(kind, rows, imported, skipped, rejected, time.perf_counter() - start)
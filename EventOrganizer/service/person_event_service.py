@@ -1,11 +1,13 @@
 from domain.person_event import PersonEvent
 from domain.dtos import TopPersonsDTO
 from domain.dtos import TopEventsDTO
+from service.ranking import RankingEngine
+from service.sorting import SortEngine
 
 
 class PersonEventService:
 
-    def __init__(self, person_repository, event_repository, person_event_repository) -> None:
+    def __init__(self, person_repository, event_repository, person_event_repository, sort_engine=None) -> None:
         """
         Constructor for PersonEventService object.
 
@@ -13,6 +15,7 @@ class PersonEventService:
             person_repository (PersonRepository): PersonRepository object
             event_repository (EventRepository): EventRepository object
             person_event_repository (PersonEventRepository): PersonEventRepository object
+            sort_engine (SortEngine): SortEngine object ordering Event objects (built-in timsort by default)
 
         Return: None
         """
@@ -20,54 +23,19 @@ class PersonEventService:
         self.__person_repository = person_repository
         self.__event_repository = event_repository
         self.__person_event_repository = person_event_repository
-
-    @staticmethod
-    def cmp_generic(item_1, item_2, keys: list) -> int:
-        """
-        Compare items based on multiple keys.
-
-        Args:
-            item_1: First item to compare
-            item_2: Second item to compare
-            keys (list): List of keys
-
-        Returns: int
-        """
-        for key in keys:
-            key_1 = key(item_1)
-            key_2 = key(item_2)
-            if key_1 < key_2:
-                return -1
-            elif key_1 > key_2:
-                return 1
-
-        return 0
-
-    @staticmethod
-    def cmp(item_1, item_2) -> bool:
-        """
-        Compare items based on multiple keys.
-
-        Args:
-            item_1: First item to compare
-            item_2: Second item to compare
-
-        Returns: bool
-        """
-        if item_1.get_description() == item_2.get_description():
-            return item_1.get_date() > item_2.get_date()
-
-        return item_1.get_description() > item_2.get_description()
+        self.__sort_engine = sort_engine if sort_engine is not None else SortEngine()
 
     def selection_sort(self, items: list, key_func, reverse=False) -> list:
         """
         Perform selection sort on a list of items based on a custom key function.
 
+        Kept for teaching purposes, see SortEngine for the O(n log n) algorithms.
+
         Time Complexity:
             O(n^2) (worst-case) / Θ(n^2) (average-case) / Ω(n^2) (best-case)
 
         Space Complexity:
-            O(1) - constant
+            O(n) - keys are computed once per item
 
         Args:
             items (list): List of items to be sorted
@@ -76,17 +44,7 @@ class PersonEventService:
 
         Returns: list
         """
-        for i in range(len(items)):
-            index = i
-            for j in range(i + 1, len(items)):
-                if reverse:
-                    if self.cmp_generic(items[j], items[index], key_func) > 0:
-                        index = j
-                else:
-                    if self.cmp_generic(items[j], items[index], key_func) < 0:
-                        index = j
-
-            items[i], items[index] = items[index], items[i]
+        items[:] = SortEngine("selection").sort(items, key_func, reverse)
 
         return items
 
@@ -94,11 +52,13 @@ class PersonEventService:
         """
         Perform shake sort on a list of items based on a custom key function.
 
+        Kept for teaching purposes, see SortEngine for the O(n log n) algorithms.
+
         Time Complexity:
             O(n^2) (worst-case) / Θ(n^2) (average-case) / Ω(n^2) (best-case)
 
         Space Complexity:
-            O(1) - constant
+            O(n) - keys are computed once per item
 
         Args:
             items (list): List of items to be sorted
@@ -107,28 +67,7 @@ class PersonEventService:
 
         Returns: list
         """
-        left = 0
-        right = len(items) - 1
-        while left <= right:
-            for i in range(left, right):
-                if reverse:
-                    if self.cmp_generic(items[i + 1], items[i], key_func) > 0:
-                        items[i], items[i + 1] = items[i + 1], items[i]
-                else:
-                    if self.cmp_generic(items[i + 1], items[i], key_func) < 0:
-                        items[i], items[i + 1] = items[i + 1], items[i]
-
-            right = right - 1
-
-            for i in range(right, left, -1):
-                if reverse:
-                    if self.cmp_generic(items[i], items[i - 1], key_func) > 0:
-                        items[i], items[i - 1] = items[i - 1], items[i]
-                else:
-                    if self.cmp_generic(items[i], items[i - 1], key_func) < 0:
-                        items[i], items[i - 1] = items[i - 1], items[i]
-
-            left = left + 1
+        items[:] = SortEngine("shake").sort(items, key_func, reverse)
 
         return items
 
@@ -202,7 +141,7 @@ class PersonEventService:
 
         person = self.__person_repository.search_person(person_id)
         event_ids = self.__person_event_repository.get_person_events(person)
-        events = [self.__event_repository.search_event(event_id) for event_id in event_ids]
+        events = self.__event_repository.search_events(event_ids)
 
         return events
 
@@ -218,10 +157,24 @@ class PersonEventService:
 
         event = self.__event_repository.search_event(event_id)
         person_ids = self.__person_event_repository.get_event_persons(event)
-        persons = [self.__person_repository.search_person(person_id) for person_id in person_ids]
+        persons = self.__person_repository.search_persons(person_ids)
 
         return persons
 
+    def person_number_events(self, person_id: int) -> int:
+        """
+        Return number of Event objects Person object attends.
+
+        Args:
+            person_id (int): id of Person object
+
+        Return: int
+        """
+
+        person = self.__person_repository.search_person(person_id)
+
+        return self.__person_event_repository.count_person_events(person)
+
     def get_person_events_by_description(self, person_id: int) -> list:
         """
         Return Event objects Person object attends by description ascending.
@@ -234,9 +187,9 @@ class PersonEventService:
 
         person = self.__person_repository.search_person(person_id)
         event_ids = self.__person_event_repository.get_person_events(person)
-        events = [self.__event_repository.search_event(event_id) for event_id in event_ids]
-        # events.sort(key=lambda event: event.get_description(), reverse=False)
-        events = self.shake_sort(events, key_func=[lambda event: event.get_description(), lambda event: event.get_date()])
+        events = self.__event_repository.search_events(event_ids)
+        events = self.__sort_engine.sort(events, keys=[lambda event: event.get_description(),
+                                                       lambda event: event.get_date_key()])
 
         return events
 
@@ -252,67 +205,53 @@ class PersonEventService:
 
         person = self.__person_repository.search_person(person_id)
         event_ids = self.__person_event_repository.get_person_events(person)
-        events = [self.__event_repository.search_event(event_id) for event_id in event_ids]
-        # events.sort(key=lambda event: event.get_date(), reverse=False)
-        events = self.selection_sort(events, key_func=[lambda event: event.get_date(), lambda event: event.get_time()])
+        events = self.__event_repository.search_events(event_ids)
+        events = self.__sort_engine.sort(events, keys=[lambda event: event.get_timestamp()])
 
         return events
 
-    def get_top_persons(self) -> list:
+    def get_top_persons(self, k: int = None, percent: int = None, include_ties: bool = False) -> list:
         """
-        Return top 20% Person objects with most attendances to events.
+        Return Person objects with most attendances to events, top 20% by default.
 
-        Args: None
+        Args:
+            k (int): number of Person objects to return
+            percent (int): percentage of Person objects to return (used when k is None)
+            include_ties (bool): also return Person objects tied with the last one
 
         Return: list
         """
 
         persons = self.__person_repository.get_persons()
-        nr_events = {}
-
-        for person in persons:
-            person_id = person.get_id()
-            nr_events[person_id] = len(self.__person_event_repository.get_person_events(person))
-
+        nr_events = self.__person_event_repository.get_person_event_counts()
         result = []
 
-        for key, value in nr_events.items():
-            person = self.__person_repository.search_person(key)
-            events = value
-            dto = TopPersonsDTO(person, events)
+        for person in persons:
+            dto = TopPersonsDTO(person, nr_events.get(person.get_id(), 0))
             result.append(dto)
 
-        # result.sort(key=lambda x: x.get_nr_events(), reverse=True)
-        result = self.shake_sort(result, key_func=[lambda obj: obj.get_nr_events()], reverse=True)
-
-        return result[:(len(result) // 5)]
+        return RankingEngine.select(result, key=lambda obj: obj.get_nr_events(), k=k, percent=percent,
+                                    include_ties=include_ties)
 
-    def get_top_events(self) -> list:
+    def get_top_events(self, k: int = None, percent: int = None, include_ties: bool = False) -> list:
         """
-        Return top 20% Event objects with most attending persons.
+        Return Event objects with most attending persons, top 20% by default.
 
-        Args: None
+        Args:
+            k (int): number of Event objects to return
+            percent (int): percentage of Event objects to return (used when k is None)
+            include_ties (bool): also return Event objects tied with the last one
 
         Return: list
         """
 
         events = self.__event_repository.get_events()
-        nr_persons = {}
-
-        for event in events:
-            event_id = event.get_id()
-            nr_persons[event_id] = len(self.__person_event_repository.get_event_persons(event))
-
+        nr_persons = self.__person_event_repository.get_event_person_counts()
         result = []
 
-        for key, value in nr_persons.items():
-            event = self.__event_repository.search_event(key)
-            event_description = event.get_description()
-            persons = value
-            dto = TopEventsDTO(event_description, persons)
+        for event in events:
+            dto = TopEventsDTO(event.get_description(), nr_persons.get(event.get_id(), 0))
             result.append(dto)
 
-        # result.sort(key=lambda x: x.get_nr_persons(), reverse=True)
-        result = self.selection_sort(result, key_func=[lambda obj: obj.get_nr_persons()], reverse=True)
-
-        return result[:(len(result) // 5)]
+        return RankingEngine.select(result, key=lambda obj: obj.get_nr_persons(), k=k, percent=percent,
+                                    include_ties=include_ties)
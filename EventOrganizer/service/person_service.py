@@ -1,7 +1,7 @@
 from domain.person import Person
 from validation.functions import Functions
-import random
-import string
+from infrastructure.trigram_index import DEFAULT_LIMIT
+from service import dataset_generator
 
 
 class PersonService(Functions):
@@ -46,6 +46,17 @@ class PersonService(Functions):
 
         return self.__person_repository.get_persons()
 
+    def iter_persons(self):
+        """
+        Yield all Person objects one at a time.
+
+        Args: None
+
+        Return: generator of Person objects
+        """
+
+        return self.__person_repository.iter_persons()
+
     def delete_person(self, id: int) -> None:
         """
         Delete Person object.
@@ -105,34 +116,68 @@ class PersonService(Functions):
 
         return person
 
-    """
-    def add_random_people(self, number_of_people: int) -> None:
+    def search_persons(self, ids: list) -> list:
+        """
+        Search several Person objects at once.
+
+        Args:
+            ids (list): ids of Person objects
 
-        for i in range(0, number_of_people):
-            person_id = random.randrange(100, 1000)
-            name = ''.join(random.choice(string.ascii_letters) for _ in range(0, 5))
-            address = ''.join(random.choice(string.ascii_letters) for _ in range(0, 8))
-            address += str(random.randrange(1, 99))
+        Return: list
+        """
 
-            self.add_person(person_id, name, address)
-    """
+        return self.__person_repository.search_persons(ids)
 
-    def add_random_people(self, number_of_people: int) -> None:
+    def search_person_by_address(self, address: str) -> Person:
         """
-        Add randomly generated people recursively.
+        Search Person object by its unique address.
 
         Args:
-            number_of_people (int): the number of people to add
+            address (str): address of Person object
+
+        Return: Person
+        """
+
+        return self.__person_repository.search_person_by_address(address)
+
+    def search_person_by_name(self, name: str, limit: int = DEFAULT_LIMIT) -> list:
+        """
+        Search Person objects whose name is similar to the given one, best match first.
+
+        Args:
+            name (str): name, possibly misspelled, of Person objects
+            limit (int): maximum number of Person objects
+
+        Return: list
+        """
+
+        return self.__person_repository.search_person_by_name(name, limit)
+
+    def add_persons(self, persons: list) -> None:
+        """
+        Add Person objects at once, none of them if any is invalid or already exists.
+
+        Args:
+            persons (list): Person objects to add
 
         Return: None
         """
-        if number_of_people <= 0:
-            return
 
-        person_id = random.randrange(100, 1000)
-        name = ''.join(random.choice(string.ascii_letters) for _ in range(0, 5))
-        address = ''.join(random.choice(string.ascii_letters) for _ in range(0, 8))
-        address += str(random.randrange(1, 99))
+        for person in persons:
+            self.__person_validator.validate_person(person)
+
+        self.__person_repository.add_persons(persons)
+
+    def add_random_people(self, number_of_people: int, seed=None) -> None:
+        """
+        Add randomly generated people, with ids following the greatest stored id.
+
+        Args:
+            number_of_people (int): the number of people to add
+            seed (int): seed of the random generator (None for different people every call)
+
+        Return: None
+        """
 
-        self.add_person(person_id, name, address)
-        self.add_random_people(number_of_people - 1)
\ No newline at end of file
+        first_id = max((person.get_id() for person in self.__person_repository.iter_persons()), default=0) + 1
+        self.add_persons(list(dataset_generator.generate_persons(number_of_people, seed, first_id)))
\ No newline at end of file
@@ -0,0 +1,52 @@
+import heapq
+
+DEFAULT_TOP_PERCENT = 20
+
+
+class RankingEngine:
+    """
+    Class definition for RankingEngine.
+
+    Methods:
+        select: return the best ranked items using heap-based partial selection
+    """
+
+    @staticmethod
+    def select(items, key, k: int = None, percent: int = None, include_ties: bool = False) -> list:
+        """
+        Return the items with the greatest keys, best first.
+
+        Only k items are kept in a heap while scanning, so selecting the top k of n items costs
+        O(n log k) instead of sorting all of them. Items with equal keys keep their original order.
+
+        Time Complexity:
+            O(n log k)
+
+        Args:
+            items (iterable): items to rank
+            key (function): function returning the ranking key of an item
+            k (int): number of items to return (top-k mode)
+            percent (int): percentage of items to return (top-percent mode, used when k is None)
+            include_ties (bool): also return the items tied with the last selected one
+
+        Returns: list
+        """
+
+        items = list(items)
+
+        if k is None:
+            if percent is None:
+                percent = DEFAULT_TOP_PERCENT
+            k = len(items) * percent // 100
+
+        if k <= 0:
+            return []
+
+        result = heapq.nlargest(k, items, key=key)
+
+        if include_ties and len(result) < len(items):
+            threshold = key(result[-1])
+            result = [item for item in items if key(item) >= threshold]
+            result.sort(key=key, reverse=True)
+
+        return result
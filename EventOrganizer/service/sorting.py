@@ -0,0 +1,178 @@
+class SortEngine:
+    """
+    Class definition for SortEngine.
+
+    Every item's keys are computed once (decorate-sort-undecorate), then the decorated items are
+    sorted with the selected algorithm:
+        timsort: Python's built-in sort, O(n log n), stable
+        merge: top-down merge sort, O(n log n), stable
+        selection: legacy selection sort, O(n^2), not stable
+        shake: legacy shake (cocktail) sort, O(n^2), stable
+
+    Methods:
+        sort: return items sorted by a list of key functions
+    """
+
+    ALGORITHMS = ("timsort", "merge", "selection", "shake")
+
+    def __init__(self, algorithm: str = "timsort") -> None:
+        """
+        Constructor for SortEngine object.
+
+        Args:
+            algorithm (str): one of SortEngine.ALGORITHMS
+
+        Return: None
+        """
+
+        if algorithm not in SortEngine.ALGORITHMS:
+            raise ValueError(f"ERROR: unknown sort algorithm '{algorithm}'...")
+
+        self.__algorithm = algorithm
+
+    def get_algorithm(self) -> str:
+        """
+        Return name of the sort algorithm.
+
+        Args: None
+
+        Return: str
+        """
+
+        return self.__algorithm
+
+    def sort(self, items: list, keys: list, reverse: bool = False) -> list:
+        """
+        Return a new list with the items sorted by their keys.
+
+        Args:
+            items (list): items to sort
+            keys (list): functions returning the comparison keys of an item, most significant first
+            reverse (bool): dictates the direction of the sort (ascending / descending)
+
+        Returns: list
+        """
+
+        decorated = [(tuple(key(item) for key in keys), item) for item in items]
+
+        if self.__algorithm == "timsort":
+            decorated.sort(key=lambda pair: pair[0], reverse=reverse)
+        elif self.__algorithm == "merge":
+            decorated = self.__merge_sort(decorated, reverse)
+        elif self.__algorithm == "selection":
+            self.__selection_sort(decorated, reverse)
+        else:
+            self.__shake_sort(decorated, reverse)
+
+        return [pair[1] for pair in decorated]
+
+    @staticmethod
+    def __before(key_1, key_2, reverse: bool) -> bool:
+        """
+        Check if key_1 must be placed strictly before key_2.
+
+        Args:
+            key_1 (tuple): first key
+            key_2 (tuple): second key
+            reverse (bool): descending order
+
+        Returns: bool
+        """
+
+        return key_1 > key_2 if reverse else key_1 < key_2
+
+    def __merge_sort(self, pairs: list, reverse: bool) -> list:
+        """
+        Sort decorated items with a stable top-down merge sort.
+
+        Time Complexity:
+            O(n log n)
+
+        Space Complexity:
+            O(n)
+
+        Args:
+            pairs (list): (key, item) pairs
+            reverse (bool): descending order
+
+        Returns: list
+        """
+
+        if len(pairs) <= 1:
+            return pairs
+
+        middle = len(pairs) // 2
+        left = self.__merge_sort(pairs[:middle], reverse)
+        right = self.__merge_sort(pairs[middle:], reverse)
+
+        merged = []
+        i = j = 0
+        while i < len(left) and j < len(right):
+            if self.__before(right[j][0], left[i][0], reverse):
+                merged.append(right[j])
+                j += 1
+            else:
+                merged.append(left[i])
+                i += 1
+
+        merged.extend(left[i:])
+        merged.extend(right[j:])
+
+        return merged
+
+    def __selection_sort(self, pairs: list, reverse: bool) -> None:
+        """
+        Sort decorated items in place with selection sort.
+
+        Time Complexity:
+            O(n^2) (worst-case) / Θ(n^2) (average-case) / Ω(n^2) (best-case)
+
+        Space Complexity:
+            O(1) - constant
+
+        Args:
+            pairs (list): (key, item) pairs
+            reverse (bool): descending order
+
+        Returns: None
+        """
+
+        for i in range(len(pairs)):
+            index = i
+            for j in range(i + 1, len(pairs)):
+                if self.__before(pairs[j][0], pairs[index][0], reverse):
+                    index = j
+
+            pairs[i], pairs[index] = pairs[index], pairs[i]
+
+    def __shake_sort(self, pairs: list, reverse: bool) -> None:
+        """
+        Sort decorated items in place with shake sort.
+
+        Time Complexity:
+            O(n^2) (worst-case) / Θ(n^2) (average-case) / Ω(n^2) (best-case)
+
+        Space Complexity:
+            O(1) - constant
+
+        Args:
+            pairs (list): (key, item) pairs
+            reverse (bool): descending order
+
+        Returns: None
+        """
+
+        left = 0
+        right = len(pairs) - 1
+        while left <= right:
+            for i in range(left, right):
+                if self.__before(pairs[i + 1][0], pairs[i][0], reverse):
+                    pairs[i], pairs[i + 1] = pairs[i + 1], pairs[i]
+
+            right = right - 1
+
+            for i in range(right, left, -1):
+                if self.__before(pairs[i][0], pairs[i - 1][0], reverse):
+                    pairs[i], pairs[i - 1] = pairs[i - 1], pairs[i]
+
+            left = left + 1
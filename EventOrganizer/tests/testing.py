@@ -2,7 +2,43 @@ from domain.person import Person
 from domain.event import Event
 from infrastructure.person_repository import PersonRepository
 from infrastructure.event_repository import EventRepository
+from infrastructure.person_repository import FilePersonRepository
+from infrastructure.person_event_repository import FilePersonEventRepository
+from domain.person_event import PersonEvent
+from infrastructure.person_event_repository import PersonEventRepository
+from infrastructure.event_repository import FileEventRepository
+from infrastructure.unit_of_work import UnitOfWork
+from infrastructure.person_repository import SqlitePersonRepository
+from infrastructure.event_repository import SqliteEventRepository
+from infrastructure.person_event_repository import SqlitePersonEventRepository
+from infrastructure import sqlite_connection
+from infrastructure.columnar_person_event_repository import ColumnarPersonEventRepository
+from infrastructure import columnar_person_event_repository
+from infrastructure.binary_person_event_repository import BinaryPersonEventRepository
+from service.ranking import RankingEngine
+from service.sorting import SortEngine
+from service.import_service import ImportService
+from service.export_service import ExportService
+from service.person_service import PersonService
+from service.analytics_service import AnalyticsService
+from service import dataset_generator
+from benchmarks import benchmark_suite
+from ui.console import Console
+from ui.command_stats import CommandStats
+from ui import command_stats as command_stats_module
+from service.person_event_service import PersonEventService
+from validation.person_validator import PersonValidator
+from validation.event_validator import EventValidator
 from validation.functions import Functions
+from exceptions.repo_exc import RepoError
+from exceptions.valid_exc import ValidError
+import contextlib
+import io
+import os
+import pstats
+import shutil
+import sqlite3
+import tempfile
 
 
 class Tests:
@@ -108,6 +144,736 @@ class Tests:
         isFalse = validate.validate_time("00-00")
         assert isFalse == False
 
+    def test_cached_file_repository(self) -> None:
+        file_descriptor, file_path = tempfile.mkstemp(suffix=".txt")
+        os.close(file_descriptor)
+        try:
+            repository = FilePersonRepository(file_path, cached=True)
+            repository.add_person(Person(1, "Dan", "Tudor23"))
+            assert repository.search_person(1).get_name() == "Dan"
+            assert len(repository.get_persons()) == 1
+            stats = repository.get_cache_stats()
+            assert stats["misses"] == 1
+            assert stats["hits"] == 2
+            with open(file_path, "a") as f:
+                f.write("2\nAlex\nPrincipala1\n")
+            assert len(repository.get_persons()) == 2
+            assert repository.get_cache_stats()["misses"] == 2
+        finally:
+            os.remove(file_path)
+
+    def test_journaled_person_event_repository(self) -> None:
+        file_descriptor, file_path = tempfile.mkstemp(suffix=".txt")
+        os.close(file_descriptor)
+        try:
+            repository = FilePersonEventRepository(file_path, cached=True, journaled=True)
+            repository.store(PersonEvent(1, 1))
+            repository.store(PersonEvent(1, 2))
+            repository.store(PersonEvent(2, 1))
+            repository.update_deleted_event(Event(2, "2020-10-11", "00:00", "Balul Bobocilor UBB"))
+            assert os.path.getsize(file_path) == 0
+            assert repository.get_journal_size() == 4
+            reloaded = FilePersonEventRepository(file_path, journaled=True)
+            assert reloaded.get_person_events(Person(1, "Dan", "Tudor23")) == [1]
+            assert reloaded.get_event_persons(Event(1, "2020-10-10", "18:00", "Concurs")) == [1, 2]
+            repository.compact()
+            assert repository.get_journal_size() == 0
+            reloaded = FilePersonEventRepository(file_path)
+            assert reloaded.get_event_persons(Event(1, "2020-10-10", "18:00", "Concurs")) == [1, 2]
+        finally:
+            os.remove(file_path)
+            if os.path.exists(file_path + ".journal"):
+                os.remove(file_path + ".journal")
+
+    def test_person_event_adjacency(self) -> None:
+        repository = PersonEventRepository()
+        person_1 = Person(1, "Dan", "Tudor23")
+        person_2 = Person(2, "Alex", "Principala1")
+        event_1 = Event(1, "2020-10-10", "18:00", "Concurs de informatica")
+        event_2 = Event(2, "2020-10-11", "00:00", "Balul Bobocilor UBB")
+        repository.store(PersonEvent(1, 1))
+        repository.store(PersonEvent(1, 2))
+        repository.store(PersonEvent(2, 1))
+        assert repository.get_person_events(person_1) == [1, 2]
+        assert repository.get_event_persons(event_1) == [1, 2]
+        assert repository.count_person_events(person_1) == 2
+        assert repository.get_event_person_counts() == {1: 2, 2: 1}
+        repository.update_deleted_person(person_1)
+        assert repository.count_person_events(person_1) == 0
+        assert repository.get_person_events(person_1) == []
+        assert repository.get_event_persons(event_1) == [2]
+        assert repository.get_event_persons(event_2) == []
+        repository.update_deleted_event(event_1)
+        assert repository.get_person_events(person_2) == []
+
+    def test_person_event_duplicates(self) -> None:
+        repository = PersonEventRepository()
+        repository.store(PersonEvent(1, 1))
+        assert PersonEvent(1, 1) == PersonEvent(1, 1)
+        assert len({PersonEvent(1, 1), PersonEvent(1, 1), PersonEvent(1, 2)}) == 2
+        try:
+            repository.store(PersonEvent(1, 1))
+            assert False
+        except RepoError:
+            pass
+        assert repository.store(PersonEvent(1, 1), exist_ok=True) is False
+        assert repository.store(PersonEvent(1, 2), exist_ok=True) is True
+        repository.delete(PersonEvent(1, 1))
+        assert repository.get_person_events(Person(1, "Dan", "Tudor23")) == [2]
+        try:
+            repository.delete(PersonEvent(1, 1))
+            assert False
+        except RepoError:
+            pass
+
+    def test_person_address_index(self) -> None:
+        repository = PersonRepository()
+        repository.add_person(Person(1, "Dan", "Tudor23"))
+        repository.add_person(Person(2, "Alex", "Principala1"))
+        try:
+            repository.add_person(Person(3, "Gigi", "Tudor23"))
+            assert False
+        except RepoError:
+            pass
+        try:
+            repository.modify_person(Person(2, "Alex", "Tudor23"))
+            assert False
+        except RepoError:
+            pass
+        repository.modify_person(Person(1, "Dan", "Vantului22"))
+        assert repository.search_person_by_address("Vantului22").get_id() == 1
+        repository.add_person(Person(3, "Gigi", "Tudor23"))
+        repository.delete_person(Person(3, "Gigi", "Tudor23"))
+        try:
+            repository.search_person_by_address("Tudor23")
+            assert False
+        except RepoError:
+            pass
+
+    def test_iter_persons(self) -> None:
+        file_descriptor, file_path = tempfile.mkstemp(suffix=".txt")
+        os.close(file_descriptor)
+        try:
+            with open(file_path, "w") as f:
+                for person_id in range(1, 2001):
+                    f.write(f"{person_id}\nDan\nTudor{person_id}\n")
+            repository = FilePersonRepository(file_path)
+            persons = repository.get_persons()
+            assert len(persons) == 2000
+            assert persons[-1].get_id() == 2000
+            streamed = [person.get_id() for person in repository.iter_persons()]
+            assert streamed == list(range(1, 2001))
+        finally:
+            os.remove(file_path)
+
+    def test_batch_search(self) -> None:
+        persons = self.__person_repository.search_persons([2, 1])
+        assert [person.get_id() for person in persons] == [2, 1]
+        events = self.__event_repository.search_events([1, 2])
+        assert [event.get_id() for event in events] == [1, 2]
+        try:
+            self.__event_repository.search_events([1, 99])
+            assert False
+        except RepoError:
+            pass
+
+    def test_unit_of_work(self) -> None:
+        directory = tempfile.mkdtemp()
+        try:
+            persons_path = os.path.join(directory, "persons.txt")
+            events_path = os.path.join(directory, "events.txt")
+            person_event_path = os.path.join(directory, "person_event.txt")
+            manifest_path = os.path.join(directory, "transaction.manifest")
+            with open(persons_path, "w") as f:
+                f.write("1\nDan\nTudor23\n2\nAlex\nPrincipala1\n")
+            with open(events_path, "w") as f:
+                f.write("1,2020-10-10,18:00,Concurs de informatica\n")
+            with open(person_event_path, "w") as f:
+                f.write("1,1\n2,1\n")
+            person_repository = FilePersonRepository(persons_path, cached=True)
+            event_repository = FileEventRepository(events_path, cached=True)
+            person_event_repository = FilePersonEventRepository(person_event_path, cached=True, journaled=True)
+            unit_of_work = UnitOfWork(person_repository, event_repository, person_event_repository, manifest_path)
+
+            with unit_of_work:
+                person = person_repository.search_person(1)
+                person_event_repository.update_deleted_person(person)
+                person_repository.delete_person(person)
+                with open(person_event_path, "r") as f:
+                    assert f.read() == "1,1\n2,1\n"
+            with open(person_event_path, "r") as f:
+                assert f.read() == "2,1\n"
+            assert len(FilePersonRepository(persons_path).get_persons()) == 1
+            assert not os.path.exists(manifest_path)
+
+            try:
+                with unit_of_work:
+                    person_repository.delete_person(Person(2, "Alex", "Principala1"))
+                    raise RepoError("ERROR: interrupted...")
+            except RepoError:
+                pass
+            assert len(person_repository.get_persons()) == 1
+
+            with open(persons_path + ".tmp", "w") as f:
+                f.write("")
+            with open(manifest_path, "w") as f:
+                f.write(f"{persons_path}.tmp\t{persons_path}\n")
+            UnitOfWork.recover(manifest_path)
+            assert len(person_repository.get_persons()) == 0
+            assert not os.path.exists(manifest_path)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_sqlite_repositories(self) -> None:
+        connection = sqlite_connection.connect(":memory:")
+        person_repository = SqlitePersonRepository(connection)
+        event_repository = SqliteEventRepository(connection)
+        person_event_repository = SqlitePersonEventRepository(connection)
+        person_repository.add_person(Person(1, "Dan", "Tudor23"))
+        person_repository.add_person(Person(2, "Alex", "Principala1"))
+        try:
+            person_repository.add_person(Person(3, "Gigi", "Tudor23"))
+            assert False
+        except RepoError:
+            pass
+        event_repository.add_event(Event(1, "2020-10-10", "18:00", "Concurs de informatica"))
+        event_repository.add_event(Event(2, "2020-10-11", "00:00", "Balul Bobocilor UBB"))
+        person_event_repository.store(PersonEvent(2, 1))
+        person_event_repository.store(PersonEvent(1, 1))
+        assert person_event_repository.store(PersonEvent(1, 1), exist_ok=True) is False
+        event = event_repository.search_event(1)
+        assert person_event_repository.get_event_persons(event) == [2, 1]
+        assert person_event_repository.count_event_persons(event) == 2
+        assert person_event_repository.get_person_event_counts() == {1: 1, 2: 1}
+        assert [person.get_id() for person in person_repository.search_persons([2, 1])] == [2, 1]
+        assert person_repository.search_person_by_address("Principala1").get_id() == 2
+        start = Event(0, "2020-10-11", "00:00", "").get_timestamp()
+        assert [event.get_id() for event in event_repository.events_between(0, start)] == [1, 2]
+        assert [event.get_id() for event in event_repository.upcoming_events(start, 5)] == [2]
+
+        unit_of_work = UnitOfWork(person_repository, event_repository, person_event_repository, ":memory:")
+        try:
+            with unit_of_work:
+                person_event_repository.update_deleted_event(event)
+                event_repository.delete_event(event)
+                raise RepoError("ERROR: interrupted...")
+        except RepoError:
+            pass
+        assert person_event_repository.get_event_persons(event) == [2, 1]
+        with unit_of_work:
+            person_event_repository.update_deleted_event(event)
+            event_repository.delete_event(event)
+        assert person_event_repository.get_event_persons(event) == []
+        assert person_event_repository.get_event_person_counts() == {}
+        assert len(event_repository.get_events()) == 1
+
+        # A row and its index entries are written together: a failing index insert keeps neither.
+        for table in ("person_trigrams", "event_terms"):
+            connection.execute(f"CREATE TRIGGER fail_{table} BEFORE INSERT ON {table} "
+                               "BEGIN SELECT RAISE(ABORT, 'full'); END")
+        for add in (lambda: person_repository.add_person(Person(4, "Ana", "Fabricii4")),
+                    lambda: event_repository.add_event(Event(4, "2020-10-12", "10:00", "Hackathon"))):
+            try:
+                add()
+                assert False
+            except sqlite3.Error:
+                pass
+        assert not connection.in_transaction
+        assert [person.get_id() for person in person_repository.get_persons()] == [1, 2]
+        assert [event.get_id() for event in event_repository.get_events()] == [2]
+        connection.close()
+
+    def test_ranking_engine(self) -> None:
+        items = [("a", 3), ("b", 5), ("c", 3), ("d", 1), ("e", 5), ("f", 0), ("g", 3), ("h", 2), ("i", 1), ("j", 4)]
+        key = lambda item: item[1]
+        assert [item[0] for item in RankingEngine.select(items, key)] == ["b", "e"]
+        assert [item[0] for item in RankingEngine.select(items, key, k=3)] == ["b", "e", "j"]
+        assert [item[0] for item in RankingEngine.select(items, key, k=4, include_ties=True)] == \
+               ["b", "e", "j", "a", "c", "g"]
+        assert [item[0] for item in RankingEngine.select(items, key, percent=50)] == ["b", "e", "j", "a", "c"]
+        assert RankingEngine.select(items, key, k=0) == []
+        assert len(RankingEngine.select(items, key, k=20)) == 10
+
+    def test_sort_engine(self) -> None:
+        items = [("b", 2), ("a", 2), ("c", 1), ("a", 1), ("d", 3)]
+        keys = [lambda item: item[1]]
+        for algorithm in ("timsort", "merge", "shake"):
+            engine = SortEngine(algorithm)
+            assert engine.sort(items, keys) == [("c", 1), ("a", 1), ("b", 2), ("a", 2), ("d", 3)]
+            assert engine.sort(items, keys, reverse=True) == [("d", 3), ("b", 2), ("a", 2), ("c", 1), ("a", 1)]
+        keys = [lambda item: item[0], lambda item: item[1]]
+        expected = sorted(items)
+        for algorithm in SortEngine.ALGORITHMS:
+            assert SortEngine(algorithm).sort(items, keys) == expected
+        try:
+            SortEngine("bogo")
+            assert False
+        except ValueError:
+            pass
+
+    def test_event_date_keys(self) -> None:
+        event_1 = Event(1, "2024-12-9", "9:05", "Revelion")
+        event_2 = Event(2, "2024-8-12", "20:00", "Untold Festival")
+        assert event_1.get_date() < event_2.get_date()
+        assert event_1.get_date_key() > event_2.get_date_key()
+        assert event_1.get_time_key() == 9 * 60 + 5
+        assert event_1.get_timestamp() > event_2.get_timestamp()
+        event_2.set_date("2025-1-1")
+        assert event_2.get_date_key() > event_1.get_date_key()
+        validate = Functions()
+        assert validate.compare_dates("2024-12-9", "2024-8-12") == True
+
+    def test_events_between(self) -> None:
+        repository = EventRepository()
+        repository.add_event(Event(1, "2024-8-12", "20:00", "FMI - Balul Bobocilor"))
+        repository.add_event(Event(2, "2024-1-9", "16:30", "Treasure Hunt Cluj Napoca"))
+        repository.add_event(Event(3, "2024-2-11", "21:00", "UBB - Kitsch Party Form Club"))
+        repository.add_event(Event(4, "2024-1-9", "12:45", "Hermes - Hermes Hackathon"))
+        start = Event(0, "2024-1-1", "0:00", "").get_timestamp()
+        end = Event(0, "2024-3-31", "23:59", "").get_timestamp()
+        assert [event.get_id() for event in repository.events_between(start, end)] == [4, 2, 3]
+        repository.modify_event(Event(3, "2024-9-1", "10:00", "UBB - Kitsch Party Form Club"))
+        repository.delete_event(Event(4, "2024-1-9", "12:45", "Hermes - Hermes Hackathon"))
+        assert [event.get_id() for event in repository.events_between(start, end)] == [2]
+        assert [event.get_id() for event in repository.upcoming_events(start, 2)] == [2, 1]
+        try:
+            repository.add_event(Event(1, "2024-8-12", "20:00", "FMI - Balul Bobocilor"))
+            assert False
+        except RepoError:
+            pass
+
+    def test_search_events_text(self) -> None:
+        repository = EventRepository()
+        repository.add_event(Event(1, "2024-8-12", "20:00", "FMI - Balul Bobocilor"))
+        repository.add_event(Event(2, "2024-1-9", "16:30", "Treasure Hunt Cluj Napoca"))
+        repository.add_event(Event(3, "2024-2-11", "21:00", "UBB - Kitsch Party Form Club"))
+        repository.add_event(Event(4, "2024-1-9", "12:45", "Hermes - Hermes Hackathon"))
+        assert [event.get_id() for event in repository.search_events_text("kitsch club")] == [3]
+        assert [event.get_id() for event in repository.search_events_text("kitsch bobocilor")] == []
+        assert [event.get_id() for event in repository.search_events_text("Hack* OR balul")] == [1, 4]
+        repository.modify_event(Event(3, "2024-2-11", "21:00", "UBB - Halloween Party"))
+        repository.delete_event(Event(1, "2024-8-12", "20:00", "FMI - Balul Bobocilor"))
+        assert repository.search_events_text("kitsch OR balul") == []
+        assert [event.get_id() for event in repository.search_events_text("ha*")] == [3, 4]
+
+        connection = sqlite_connection.connect(":memory:")
+        sqlite_repository = SqliteEventRepository(connection)
+        sqlite_repository.add_event(Event(1, "2024-8-12", "20:00", "FMI - Balul Bobocilor"))
+        sqlite_repository.add_event(Event(2, "2024-2-11", "21:00", "UBB - Kitsch Party Form Club"))
+        sqlite_repository.modify_event(Event(1, "2024-8-12", "20:00", "FMI - Party"))
+        assert [event.get_id() for event in sqlite_repository.search_events_text("part*")] == [1, 2]
+        assert [event.get_id() for event in sqlite_repository.search_events_text("fmi OR kitsch")] == [1, 2]
+        sqlite_repository.delete_event(Event(2, "2024-2-11", "21:00", "UBB - Kitsch Party Form Club"))
+        assert sqlite_repository.search_events_text("kitsch") == []
+        connection.close()
+
+    def test_search_person_by_name(self) -> None:
+        repository = PersonRepository()
+        repository.add_person(Person(1, "Alex", "Tudor23"))
+        repository.add_person(Person(2, "Alexandra", "Principala1"))
+        repository.add_person(Person(3, "Ana", "Fabricii4"))
+        assert [person.get_id() for person in repository.search_person_by_name("Alx")] == [1]
+        assert [person.get_id() for person in repository.search_person_by_name("alexandr", 1)] == [2]
+        repository.modify_person(Person(1, "Mihai", "Tudor23"))
+        repository.delete_person(Person(2, "Alexandra", "Principala1"))
+        assert repository.search_person_by_name("Alx") == []
+        assert [person.get_id() for person in repository.search_person_by_name("Mihaii")] == [1]
+
+        connection = sqlite_connection.connect(":memory:")
+        sqlite_repository = SqlitePersonRepository(connection)
+        sqlite_repository.add_person(Person(1, "Alex", "Tudor23"))
+        sqlite_repository.add_person(Person(2, "Alexandra", "Principala1"))
+        assert [person.get_id() for person in sqlite_repository.search_person_by_name("Alexa")] == [1, 2]
+        sqlite_repository.modify_person(Person(1, "Mihai", "Tudor23"))
+        assert [person.get_id() for person in sqlite_repository.search_person_by_name("Alexa")] == [2]
+        connection.close()
+
+    def test_compact_entities(self) -> None:
+        for entity in (Person(1, "Dan", "Tudor23"), Event(1, "2024-1-9", "16:30", "Treasure Hunt"), PersonEvent(1, 1)):
+            assert not hasattr(entity, "__dict__")
+        line_1 = "1,2024-1-9,16:30,Treasure Hunt".split(",")
+        line_2 = "2,2024-1-9,16:30,Hermes Hackathon".split(",")
+        event_1 = Event(int(line_1[0]), line_1[1], line_1[2], line_1[3])
+        event_2 = Event(int(line_2[0]), line_2[1], line_2[2], line_2[3])
+        assert event_1.get_date() is event_2.get_date() and event_1.get_time() is event_2.get_time()
+
+    def test_columnar_requires_numpy(self) -> None:
+        numpy = columnar_person_event_repository.numpy
+        columnar_person_event_repository.numpy = None
+        try:
+            ColumnarPersonEventRepository("person_event.txt")
+            assert False
+        except RepoError:
+            pass
+        finally:
+            columnar_person_event_repository.numpy = numpy
+
+    def test_columnar_person_event_repository(self) -> None:
+        directory = tempfile.mkdtemp()
+        try:
+            file_path = os.path.join(directory, "person_event.txt")
+            with open(file_path, "w") as f:
+                f.write("1,1\n1,2\n2,1\n3,1\n2,3\n")
+            with open(file_path + ".journal", "w") as f:
+                f.write("-,3,1\n+,3,2\n+,1,3\n")
+
+            repository = ColumnarPersonEventRepository(file_path)
+            assert repository.get_size() == 6
+            assert repository.get_person_event_counts() == {1: 3, 2: 2, 3: 1}
+            assert repository.get_event_person_counts() == {1: 2, 2: 2, 3: 2}
+            assert repository.top_persons(2) == [(1, 3), (2, 2)]
+            assert repository.top_events(1) == [(1, 2)]
+            assert repository.top_events(1, include_ties=True) == [(1, 2), (2, 2), (3, 2)]
+            assert repository.persons_attending_at_least(2) == [1, 2]
+            event_dates = {1: 738000, 2: 738000, 3: 738001}
+            assert repository.count_by_event_date(event_dates) == {738000: 4, 738001: 2}
+
+            person_repository = PersonRepository()
+            for person_id, name in ((1, "Dan"), (2, "Alex"), (3, "Gigi"), (4, "Ana")):
+                person_repository.add_person(Person(person_id, name, f"Tudor{person_id}"))
+            event_repository = EventRepository()
+            for event_id in (1, 2, 3):
+                event_repository.add_event(Event(event_id, "2024-1-9", "16:30", f"Party{event_id}"))
+            analytics_service = AnalyticsService(person_repository, event_repository, repository)
+            person_event_repository = PersonEventRepository()
+            for line in ("1,1", "1,2", "2,1", "2,3", "3,2", "1,3"):
+                person_event_repository.store(PersonEvent(*map(int, line.split(","))))
+            person_event_service = PersonEventService(person_repository, event_repository, person_event_repository)
+            for options in ({"k": 2}, {"percent": 50}, {"k": 1, "include_ties": True}, {}):
+                assert [str(dto) for dto in analytics_service.get_top_persons(**options)] == \
+                       [str(dto) for dto in person_event_service.get_top_persons(**options)]
+                assert [str(dto) for dto in analytics_service.get_top_events(**options)] == \
+                       [str(dto) for dto in person_event_service.get_top_events(**options)]
+
+            with open(file_path, "a") as f:
+                f.write(f"{2 ** 31},1\n")
+            try:
+                repository.get_size()
+                assert False
+            except RepoError:
+                pass
+            os.remove(file_path + ".journal")
+            for text in ("1,1\n2\n", "1,1\n2,x\n", "1,1,1\n"):
+                with open(file_path, "w") as f:
+                    f.write(text)
+                try:
+                    ColumnarPersonEventRepository(file_path).get_size()
+                    assert False
+                except RepoError:
+                    pass
+            with open(file_path, "w") as f:
+                f.write("")
+            assert ColumnarPersonEventRepository(file_path).get_person_event_counts() == {}
+        finally:
+            shutil.rmtree(directory)
+
+    def test_binary_person_event_repository(self) -> None:
+        directory = tempfile.mkdtemp()
+        try:
+            text_path = os.path.join(directory, "person_event.txt")
+            binary_path = os.path.join(directory, "person_event.bin")
+            with open(text_path, "w") as f:
+                f.write("3,1\n1,2\n2,1\n1,1\n")
+            with open(text_path + ".journal", "w") as f:
+                f.write("-,2,1\n+,2,3\n")
+            assert BinaryPersonEventRepository.convert_from_text(text_path, binary_path) == 4
+            assert os.path.getsize(binary_path) == 32
+
+            repository = BinaryPersonEventRepository(binary_path)
+            person = Person(1, "Dan", "Tudor23")
+            event = Event(1, "2024-1-9", "16:30", "Treasure Hunt")
+            assert repository.get_person_events(person) == [1, 2]
+            assert repository.get_event_persons(event) == [1, 3]
+            assert repository.store(PersonEvent(2, 1)) is True
+            assert repository.store(PersonEvent(2, 1), exist_ok=True) is False
+            assert repository.get_event_persons(event) == [1, 2, 3]
+            assert repository.count_person_events(Person(2, "Alex", "Principala1")) == 2
+            repository.delete(PersonEvent(3, 1))
+            assert repository.get_event_person_counts() == {1: 2, 2: 1, 3: 1}
+
+            for name in ("persons.txt", "events.txt"):
+                open(os.path.join(directory, name), "w").close()
+            unit_of_work = UnitOfWork(FilePersonRepository(os.path.join(directory, "persons.txt")),
+                                      FileEventRepository(os.path.join(directory, "events.txt")),
+                                      repository, os.path.join(directory, "transaction.manifest"))
+            try:
+                with unit_of_work:
+                    repository.update_deleted_event(event)
+                    assert repository.get_event_persons(event) == []
+                    raise RepoError("ERROR: interrupted...")
+            except RepoError:
+                pass
+            assert repository.get_event_persons(event) == [1, 2]
+            with unit_of_work:
+                repository.update_deleted_person(person)
+            assert repository.get_person_event_counts() == {2: 2}
+            assert [person_event.get_key() for person_event in BinaryPersonEventRepository(binary_path)
+                    .iter_person_events()] == [(2, 1), (2, 3)]
+            try:
+                repository.store(PersonEvent(2 ** 31, 1))
+                assert False
+            except RepoError:
+                pass
+            assert sorted(os.listdir(directory)) == ["events.txt", "person_event.bin", "person_event.bin.by_event",
+                                                     "person_event.txt", "person_event.txt.journal", "persons.txt"]
+            with open(text_path + ".journal", "a") as f:
+                f.write(f"+,1,{2 ** 31}\n")
+            try:
+                BinaryPersonEventRepository.convert_from_text(text_path, binary_path)
+                assert False
+            except RepoError:
+                pass
+        finally:
+            shutil.rmtree(directory)
+
+    def test_import_service(self) -> None:
+        directory = tempfile.mkdtemp()
+        try:
+            paths = {name: os.path.join(directory, name) for name in ("persons.txt", "events.txt", "person_event.txt")}
+            for path in paths.values():
+                open(path, "w").close()
+            person_repository = FilePersonRepository(paths["persons.txt"])
+            event_repository = FileEventRepository(paths["events.txt"])
+            person_event_repository = FilePersonEventRepository(paths["person_event.txt"], journaled=True)
+            unit_of_work = UnitOfWork(person_repository, event_repository, person_event_repository,
+                                      os.path.join(directory, "transaction.manifest"))
+            import_service = ImportService(person_repository, event_repository, person_event_repository,
+                                           PersonValidator(), EventValidator(), unit_of_work)
+
+            with open(os.path.join(directory, "persons.csv"), "w") as f:
+                f.write("id,name,address\n1,dan,Tudor23\n2,Alex,Tudor23\nx,Ana,Fabricii4\n3,Ana,Fabricii4\n")
+            report = import_service.import_file("persons", os.path.join(directory, "persons.csv"), chunk_size=2)
+            assert (report.get_rows(), report.get_imported()) == (4, 2)
+            assert [line_number for line_number, _ in report.get_rejected()] == [3, 4]
+            assert person_repository.search_person(1).get_name() == "Dan"
+
+            with open(os.path.join(directory, "events.jsonl"), "w") as f:
+                f.write('{"id": 1, "date": "2024-1-9", "time": "16:30", "description": "Treasure Hunt"}\n')
+                f.write('{"id": 2, "date": "2024-13-9", "time": "16:30", "description": "Hackathon"}\n')
+                f.write('{"id": 3.7, "date": "2024-1-9", "time": "16:30", "description": "Party"}\n')
+                f.write('{"id": true, "date": "2024-1-9", "time": "16:30", "description": "Party"}\n')
+                f.write('{"id": [4], "date": "2024-1-9", "time": "16:30", "description": "Party"}\n')
+                f.write('{"id": 5, "date": "2024-1-9", "time": "16:30", "description": ["Party"]}\n')
+                f.write('{"id": 6.0, "date": "2024-1-9", "time": "16:30", "description": "Concert"}\n')
+            report = import_service.import_file("events", os.path.join(directory, "events.jsonl"))
+            assert report.get_imported() == 2
+            assert [line_number for line_number, _ in report.get_rejected()] == [2, 3, 4, 5, 6]
+            assert event_repository.search_event(6).get_description() == "Concert"
+
+            with open(os.path.join(directory, "attendance.jsonl"), "w") as f:
+                f.write('{"person_id": 1, "event_id": 1}\n{"person_id": 3, "event_id": 1}\n')
+                f.write('{"person_id": 1, "event_id": 1}\n{"person_id": 9, "event_id": 1}\nnot json\n')
+            report = import_service.import_file("attendance", os.path.join(directory, "attendance.jsonl"))
+            assert (report.get_imported(), report.get_skipped()) == (2, 1)
+            assert [line_number for line_number, _ in report.get_rejected()] == [4, 5]
+            assert FilePersonEventRepository(paths["person_event.txt"], journaled=True).get_event_persons(
+                Event(1, "2024-1-9", "16:30", "Treasure Hunt")) == [1, 3]
+
+            # Out of range ids are rejected row by row instead of failing the binary write of the chunk.
+            person_repository.add_person(Person(2 ** 31, "Gigi", "Tudor99"))
+            binary_path = os.path.join(directory, "person_event.bin")
+            BinaryPersonEventRepository.convert_from_text(paths["person_event.txt"], binary_path)
+            import_service = ImportService(person_repository, event_repository,
+                                           BinaryPersonEventRepository(binary_path), PersonValidator(),
+                                           EventValidator())
+            with open(os.path.join(directory, "attendance.csv"), "w") as f:
+                f.write(f"person_id,event_id\n1,1\n{2 ** 31},1\n3,-1\n3,6\n")
+            report = import_service.import_file("attendance", os.path.join(directory, "attendance.csv"))
+            assert (report.get_imported(), report.get_skipped()) == (1, 1)
+            assert [line_number for line_number, _ in report.get_rejected()] == [3, 4]
+        finally:
+            shutil.rmtree(directory)
+
+    def test_export_service(self) -> None:
+        directory = tempfile.mkdtemp()
+        try:
+            person_repository = PersonRepository()
+            event_repository = EventRepository()
+            person_event_repository = PersonEventRepository()
+            person_repository.add_person(Person(1, "Dan", "Tudor23"))
+            person_repository.add_person(Person(2, "Alex", "Principala1"))
+            event_repository.add_event(Event(1, "2024-1-9", "16:30", "Treasure Hunt, Cluj; Napoca"))
+            event_repository.add_event(Event(2, "2024-2-11", "9:05", "Hackathon"))
+            person_event_repository.store(PersonEvent(1, 1))
+            person_event_repository.store(PersonEvent(2, 1))
+            person_event_repository.store(PersonEvent(2, 2))
+            person_event_service = PersonEventService(person_repository, event_repository, person_event_repository)
+            export_service = ExportService(person_repository, event_repository, person_event_repository,
+                                           person_event_service)
+
+            path = os.path.join(directory, "attendance.csv")
+            assert export_service.export_file("attendance", path)[0] == 3
+            with open(path, newline="") as f:
+                lines = f.read().splitlines()
+            assert lines[0] == "person_id,name,address,event_id,date,time,description"
+            assert lines[1] == '1,Dan,Tudor23,1,2024-1-9,16:30,"Treasure Hunt, Cluj; Napoca"'
+
+            path = os.path.join(directory, "top_persons.jsonl")
+            assert export_service.export_file("top_persons", path)[0] == 0
+            path = os.path.join(directory, "events.jsonl")
+            export_service.export_file("events", path)
+            with open(path) as f:
+                assert f.readline() == '{"id": 1, "date": "2024-1-9", "time": "16:30", ' \
+                                       '"description": "Treasure Hunt, Cluj; Napoca"}\n'
+
+            # Attendances of missing persons or events are left out by every writer.
+            person_event_repository.store(PersonEvent(9, 1))
+            person_event_repository.store(PersonEvent(1, 3))
+            assert export_service.export_file("attendance", os.path.join(directory, "attendance.csv"))[0] == 3
+            path = os.path.join(directory, "attendance.ics")
+            assert export_service.export_file("attendance", path)[0] == 2
+            with open(path, newline="") as f:
+                calendar = f.read()
+            assert calendar.count("ATTENDEE") == 3 and "person:9" not in calendar
+            assert "DTSTART:20240109T163000\r\nSUMMARY:Treasure Hunt\\, Cluj\\; Napoca\r\n" in calendar
+            assert 'ATTENDEE;CN="Alex":urn:eventorganizer:person:2\r\n' in calendar
+            assert "DTSTART:20240211T090500" in calendar
+            try:
+                export_service.export_file("persons", os.path.join(directory, "persons.ics"))
+                assert False
+            except ValidError:
+                pass
+            assert sorted(os.listdir(directory)) == ["attendance.csv", "attendance.ics", "events.jsonl",
+                                                     "top_persons.jsonl"]
+        finally:
+            shutil.rmtree(directory)
+
+    def test_dataset_generator(self) -> None:
+        pairs = list(dataset_generator.generate_attendance(5000, 500, 200, seed=7))
+        assert pairs == list(dataset_generator.generate_attendance(5000, 500, 200, seed=7))
+        assert len(pairs) == len(set(pairs)) == 5000
+        assert all(1 <= person_id <= 500 and 1 <= event_id <= 200 for person_id, event_id in pairs)
+        counts = {}
+        for person_id, event_id in pairs:
+            counts[event_id] = counts.get(event_id, 0) + 1
+        assert max(counts.values()) > 4 * 5000 / 200
+        assert len(list(dataset_generator.generate_attendance(6, 2, 3))) == 6
+        try:
+            list(dataset_generator.generate_attendance(7, 2, 3))
+            assert False
+        except ValidError:
+            pass
+
+        directory = tempfile.mkdtemp()
+        try:
+            dataset_generator.write_dataset(directory, 30, 4, 20, seed=3)
+            binary_path = os.path.join(directory, "person_event.bin")
+            BinaryPersonEventRepository.convert_from_text(os.path.join(directory, "person_event.txt"), binary_path)
+            dataset_generator.write_dataset(directory, 300, 40, 1000, seed=3)
+            assert not os.path.exists(binary_path) and not os.path.exists(binary_path + ".by_event")
+            person_repository = FilePersonRepository(os.path.join(directory, "persons.txt"))
+            event_repository = FileEventRepository(os.path.join(directory, "events.txt"))
+            person_event_repository = FilePersonEventRepository(os.path.join(directory, "person_event.txt"))
+            assert len(person_repository.get_persons()) == 300
+            assert len(event_repository.get_events()) == 40
+            assert person_event_repository.count_person_events(Person(1, "Dan", "Tudor23")) in (3, 4)
+
+            person_service = PersonService(person_repository, PersonValidator())
+            person_service.add_random_people(2000)
+            persons = person_repository.get_persons()
+            assert len(persons) == 2300
+            assert [person.get_id() for person in persons[300:]] == list(range(301, 2301))
+            try:
+                person_service.add_persons([Person(2301, "Dan", "Tudor1"), Person(2302, "Dan", "Tudor1")])
+                assert False
+            except RepoError:
+                pass
+            assert len(person_repository.get_persons()) == 2300
+
+            # Like the shipped data, real addresses may be made of generator streets and greater ids.
+            person_repository = PersonRepository()
+            person_repository.add_persons([Person(1, "Alex", "AurelVlaicu184"), Person(2, "Ana", "Vantului22"),
+                                           Person(6, "Darius", "Observatorului9"), Person(10, "Irina", "Tudor57")])
+            person_service = PersonService(person_repository, PersonValidator())
+            for seed in range(20):
+                person_service.add_random_people(200, seed)
+            assert all(person.get_address().startswith(dataset_generator.ADDRESS_PREFIX)
+                       for person in person_repository.get_persons()[-4000:])
+        finally:
+            shutil.rmtree(directory)
+
+    def test_benchmark_suite(self) -> None:
+        document = benchmark_suite.run(sizes=(50,), repeat=1, cases=["store", "sort_shake", "console_top_persons"])
+        assert [(result["case"], result["size"]) for result in document["results"]] == \
+               [("store", 50), ("sort_shake", 50), ("console_top_persons", 50)]
+        baseline = {"results": [{"case": "store", "size": 50, "seconds": 1.0},
+                                {"case": "sort_shake", "size": 50, "seconds": 2.0}]}
+        current = {"results": [{"case": "store", "size": 50, "seconds": 1.1},
+                               {"case": "sort_shake", "size": 50, "seconds": 2.5},
+                               {"case": "sort_merge", "size": 50, "seconds": 9.0}]}
+        comparison = benchmark_suite.compare(current, baseline, threshold=0.2)
+        assert [(row[0], row[-1]) for row in comparison] == [("store", False), ("sort_shake", True)]
+
+    def test_command_stats(self) -> None:
+        directory = tempfile.mkdtemp()
+        try:
+            persons_file = os.path.join(directory, "persons.txt")
+            with open(persons_file, "w") as f:
+                f.write("1\nDan\nTudor23\n")
+            person_service = PersonService(FilePersonRepository(persons_file), PersonValidator())
+            slow_log = os.path.join(directory, "slow.log")
+            command_stats = CommandStats(0, slow_log)
+            console = Console(person_service, None, None, command_stats=command_stats)
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                console.execute("search_person 1")
+                console.execute("add_person 2 Alex Principala1")
+                console.execute("search_person 7")
+                console.execute("no_such_command")
+                console.execute("stats")
+            assert sorted(line.split()[0] for line in output.getvalue().splitlines()[-2:]) == \
+                   ["add_person", "search_person"]
+            summary = {row["command"]: row for row in command_stats.get_summary()}
+            assert sorted(summary) == ["add_person", "search_person", "stats"]
+            assert summary["search_person"]["runs"] == 2
+            assert summary["search_person"]["reads"] == 1 and summary["search_person"]["writes"] == 0
+            size = os.path.getsize(persons_file)
+            assert summary["search_person"]["bytes_read"] == (len("1\nDan\nTudor23\n") + size) / 2
+            assert summary["add_person"]["writes"] == 1 and summary["add_person"]["bytes_written"] == size
+            with open(slow_log) as f:
+                logged = [line.split("bytes_written=")[1].split(" ", 1)[1].strip() for line in f]
+            assert logged == ["search_person 1", "add_person 2 Alex Principala1", "search_person 7", "stats"]
+            assert command_stats_module.percentile([1, 2, 3, 4], 50) == 2
+            assert command_stats_module.percentile([1, 2, 3, 4], 99) == 4
+            with contextlib.redirect_stdout(io.StringIO()):
+                console.execute("stats reset")
+            assert [row["command"] for row in command_stats.get_summary()] == ["stats"]
+            broken_stats = CommandStats(0, os.path.join(directory, "missing", "slow.log"))
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                broken_stats.measure("x", "x", lambda: None)
+                broken_stats.measure("x", "x", lambda: None)
+            assert output.getvalue().count("ERROR: slow command log can not be written") == 1
+            assert broken_stats.get_summary()[0]["runs"] == 2
+        finally:
+            shutil.rmtree(directory)
+
+    def test_profile_command(self) -> None:
+        directory = tempfile.mkdtemp()
+        try:
+            person_repository = PersonRepository()
+            person_repository.add_person(Person(1, "Dan", "Tudor23"))
+            command_stats = CommandStats()
+            console = Console(PersonService(person_repository, PersonValidator()), None, None,
+                              command_stats=command_stats)
+            dump_path = os.path.join(directory, "search.prof")
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                console.execute(f"profile --memory --dump {dump_path} search_person 1")
+                console.execute("profile profile search_person 1")
+            assert "Name: Dan" in output.getvalue()
+            assert "functions by cumulative time" in output.getvalue()
+            assert "allocation sites still holding memory" in output.getvalue()
+            assert "'profile' can not profile itself" in output.getvalue()
+            assert any(function[2] == "search_person" for function in pstats.Stats(dump_path).stats)
+            with contextlib.redirect_stdout(io.StringIO()):
+                console.execute("search_person 1")
+                console.execute("stats")
+            assert [row["runs"] for row in command_stats.get_summary() if row["command"] == "search_person"] == [1]
+            assert "profile" not in [row["command"] for row in command_stats.get_summary()]
+        finally:
+            shutil.rmtree(directory)
+
     def run_tests(self) -> None:
         print("Running tests...")
         self.test_validate_time()
@@ -120,4 +886,31 @@ class Tests:
         self.test_equal_event()
         self.test_equal_person()
         self.test_validate_address()
+        self.test_cached_file_repository()
+        self.test_journaled_person_event_repository()
+        self.test_person_event_adjacency()
+        self.test_person_event_duplicates()
+        self.test_person_address_index()
+        self.test_iter_persons()
+        self.test_batch_search()
+        self.test_unit_of_work()
+        self.test_sqlite_repositories()
+        self.test_ranking_engine()
+        self.test_sort_engine()
+        self.test_event_date_keys()
+        self.test_events_between()
+        self.test_search_events_text()
+        self.test_search_person_by_name()
+        self.test_compact_entities()
+        self.test_columnar_requires_numpy()
+        # numpy is optional: without it the columnar backend is off (see index.py) and left untested.
+        if columnar_person_event_repository.numpy is not None:
+            self.test_columnar_person_event_repository()
+        self.test_binary_person_event_repository()
+        self.test_import_service()
+        self.test_export_service()
+        self.test_dataset_generator()
+        self.test_benchmark_suite()
+        self.test_command_stats()
+        self.test_profile_command()
         print("Tests ran successfully!")
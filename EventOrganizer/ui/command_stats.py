@@ -0,0 +1,151 @@
+from infrastructure import io_stats
+import collections
+import datetime
+import time
+
+# Number of most recent runs of every command kept for the percentiles.
+SAMPLES_PER_COMMAND = 1000
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values: list, percent: float) -> float:
+    """
+    Return the nearest-rank percentile of sorted values.
+
+    Args:
+        sorted_values (list): values sorted ascending, not empty
+        percent (float): percentile between 0 and 100
+
+    Return: float
+    """
+
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+
+    return sorted_values[int(rank) - 1]
+
+
+class CommandStats:
+
+    def __init__(self, slow_threshold: float = None, slow_log_path: str = None) -> None:
+        """
+        Constructor for CommandStats object.
+
+        Records the wall time and the data file I/O (see io_stats.COUNTERS) of every console command.
+        Commands slower than the threshold are appended to the slow command log, if one is given.
+
+        Args:
+            slow_threshold (float): duration in seconds from which a command is slow (None to log nothing)
+            slow_log_path (str): file path of the slow command log
+
+        Return: None
+        """
+
+        self.__slow_threshold = slow_threshold
+        self.__slow_log_path = slow_log_path
+        self.__samples = {
+
+        }
+
+    def measure(self, command_name: str, command: str, run) -> None:
+        """
+        Run a command and record its duration and I/O.
+
+        Args:
+            command_name (str): name of the command
+            command (str): whole command line, for the slow command log
+            run (function): function running the command
+
+        Return: None
+        """
+
+        before = io_stats.COUNTERS.snapshot()
+        start = time.perf_counter()
+
+        try:
+            run()
+        finally:
+            seconds = time.perf_counter() - start
+            io = tuple(after - previous for after, previous in zip(io_stats.COUNTERS.snapshot(), before))
+            self.record(command_name, seconds, io)
+
+            if self.__slow_threshold is not None and seconds >= self.__slow_threshold:
+                self.__log_slow(command, seconds, io)
+
+    def record(self, command_name: str, seconds: float, io: tuple) -> None:
+        """
+        Record one run of a command.
+
+        Args:
+            command_name (str): name of the command
+            seconds (float): wall time of the run
+            io (tuple): (reads, writes, bytes read, bytes written) of the run
+
+        Return: None
+        """
+
+        if command_name not in self.__samples:
+            self.__samples[command_name] = collections.deque(maxlen=SAMPLES_PER_COMMAND)
+
+        self.__samples[command_name].append((seconds,) + io)
+
+    def __log_slow(self, command: str, seconds: float, io: tuple) -> None:
+        """
+        Append a slow command to the slow command log; the log is disabled if it can not be written.
+
+        Args:
+            command (str): whole command line
+            seconds (float): wall time of the run
+            io (tuple): (reads, writes, bytes read, bytes written) of the run
+
+        Return: None
+        """
+
+        if self.__slow_log_path is None:
+            return
+
+        stamp = datetime.datetime.now().isoformat(timespec="seconds")
+        try:
+            with open(self.__slow_log_path, "a") as f:
+                f.write(f"{stamp} {seconds * 1000:.1f} ms reads={io[0]} writes={io[1]} bytes_read={io[2]} "
+                        f"bytes_written={io[3]} {command.strip()}\n")
+        except OSError as error:
+            # A broken log must not take the console down; it is reported once and turned off.
+            self.__slow_log_path = None
+            print(f"ERROR: slow command log can not be written ({error.strerror}), it is disabled...")
+
+    def clear(self) -> None:
+        """
+        Forget all recorded runs.
+
+        Args: None
+
+        Return: None
+        """
+
+        self.__samples.clear()
+
+    def get_summary(self) -> list:
+        """
+        Return statistics of every recorded command, slowest median first.
+
+        Args: None
+
+        Return: list of dicts with 'command', 'runs', 'p50', 'p90', 'p99', 'max' (seconds) and the
+            average 'reads', 'writes', 'bytes_read' and 'bytes_written' per run
+        """
+
+        summary = []
+
+        for command_name, samples in self.__samples.items():
+            seconds = sorted(sample[0] for sample in samples)
+            row = {"command": command_name, "runs": len(samples), "max": seconds[-1]}
+            for percent in PERCENTILES:
+                row[f"p{percent}"] = percentile(seconds, percent)
+            for index, name in enumerate(("reads", "writes", "bytes_read", "bytes_written"), start=1):
+                row[name] = sum(sample[index] for sample in samples) / len(samples)
+            summary.append(row)
+
+        summary.sort(key=lambda row: (-row["p50"], row["command"]))
+
+        return summary
@@ -1,11 +1,23 @@
 from exceptions.ui_exc import UIError
 from exceptions.repo_exc import RepoError
+from ui.command_stats import CommandStats
+import contextlib
+import cProfile
+import os
+import pstats
 import time
+import tracemalloc
+
+IMPORT_REJECTED_SHOWN = 20
+
+PROFILE_FUNCTIONS_SHOWN = 20
+PROFILE_ALLOCATIONS_SHOWN = 10
 
 
 class Console:
 
-    def __init__(self, person_service, event_service, person_event_service) -> None:
+    def __init__(self, person_service, event_service, person_event_service, unit_of_work=None,
+                 analytics_service=None, import_service=None, export_service=None, command_stats=None) -> None:
         """
         Constructor for UI object.
 
@@ -13,6 +25,11 @@ class Console:
             person_service (PersonService): PersonService object service
             event_service (EventService): EventService object service
             person_event_service (PersonEventService): PersonEventService object service
+            unit_of_work (UnitOfWork): UnitOfWork object making compound commands atomic (optional)
+            analytics_service (AnalyticsService): AnalyticsService object for columnar analytics (optional)
+            import_service (ImportService): ImportService object for bulk imports (optional)
+            export_service (ExportService): ExportService object for file exports (optional)
+            command_stats (CommandStats): CommandStats object recording command timings (optional)
 
         Return: None
         """
@@ -20,6 +37,11 @@ class Console:
         self.__person_service = person_service
         self.__event_service = event_service
         self.__person_event_service = person_event_service
+        self.__unit_of_work = unit_of_work
+        self.__analytics_service = analytics_service
+        self.__import_service = import_service
+        self.__export_service = export_service
+        self.__command_stats = command_stats if command_stats is not None else CommandStats()
         self.__commands = {
             "commands": [self.__ui_commands, "()"],
             "add_person": [self.__ui_add_person, "(person_id, person_name, person_address)"],
@@ -29,6 +51,8 @@ class Console:
             "modify_person_address": [self.__ui_modify_person_address, "(person_id, new_address)"],
             "person_display_events": [self.__ui_person_display_events, "(person_id)"],
             "search_person": [self.__ui_search_person, "(person_id)"],
+            "search_person_by_address": [self.__ui_search_person_by_address, "(person_address)"],
+            "search_person_by_name": [self.__ui_search_person_by_name, "(person_name, [limit])"],
             "person_display_events_by_description": [self.__ui_person_display_events_by_description, "(person_id)"],
             "person_display_events_by_date": [self.__ui_person_display_events_by_date, "(person_id)"],
             "add_event": [self.__ui_add_event, "(event_id, event_date, event_time, event_description)"],
@@ -38,16 +62,40 @@ class Console:
             "modify_event_time": [self.__ui_modify_event_time, "(event_id, new_time)"],
             "modify_event_description": [self.__ui_modify_event_description, "(event_id, new_description)"],
             "search_event": [self.__ui_search_event, "(event_id)"],
+            "events_between": [self.__ui_events_between, "(start_date, end_date)"],
+            "upcoming_events": [self.__ui_upcoming_events, "(date, time, count)"],
+            "search_events_text": [self.__ui_search_events_text, "(word [word* | OR word]...)"],
             "add_person_to_event": [self.__ui_add_person_to_event, "(person_id, event_id)"],
             "remove_person_from_event": [self.__ui_remove_person_from_event, "(person_id, event_id)"],
             "event_display_persons": [self.__ui_event_display_persons, "(event_id)"],
             "person_events_number": [self.__ui_person_events_number, "(person_id)"],
-            "top_events": [self.__ui_top_events, "()"],
-            "top_persons": [self.__ui_top_persons, "()"],
+            "top_events": [self.__ui_top_events, "([count | percent%], [ties])"],
+            "top_persons": [self.__ui_top_persons, "([count | percent%], [ties])"],
+            "persons_attending_at_least": [self.__ui_persons_attending_at_least, "(number_of_events)"],
+            "attendance_by_date": [self.__ui_attendance_by_date, "()"],
             "add_random_people": [self.__ui_add_random_people, "(number_of_people)"],
+            "import_file": [self.__ui_import_file, "(persons | events | attendance, file_path.csv | file_path.jsonl)"],
+            "export_file": [self.__ui_export_file,
+                            "(persons | events | attendance | top_persons | top_events, file_path.csv | .jsonl | .ics)"],
+            "stats": [self.__ui_stats, "([reset])"],
+            "profile": [self.__ui_profile, "([--memory], [--dump file_path.prof], command, [command arguments])"],
             "exit": [self.__ui_exit_program, "()"],
         }
 
+    def __transaction(self):
+        """
+        Return context manager grouping the repository changes of one command.
+
+        Args: None
+
+        Return: UnitOfWork or a no-op context manager
+        """
+
+        if self.__unit_of_work is None:
+            return contextlib.nullcontext()
+
+        return self.__unit_of_work
+
     def __ui_commands(self, params: list) -> None:
         """
         Interface to display commands.
@@ -100,7 +148,7 @@ class Console:
         Return: None
         """
         if len(params) != 1:
-            print(f"ERROR: function 'add_person' takes 1 argument but {len(params)} were given...")
+            print(f"ERROR: function 'add_random_people' takes 1 argument but {len(params)} were given...")
             return
 
         try:
@@ -114,6 +162,52 @@ class Console:
         except RepoError as err:
             raise UIError(err)
 
+    def __ui_import_file(self, params: list) -> None:
+        """
+        Interface to import persons, events or attendance rows from a CSV or JSONL file.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        if len(params) != 2:
+            print(f"ERROR: function 'import_file' takes 2 arguments but {len(params)} were given...")
+            return
+
+        if self.__import_service is None:
+            raise UIError("ERROR: bulk import is not available...")
+
+        report = self.__import_service.import_file(params[0], params[1])
+        print(report)
+
+        rejected = report.get_rejected()
+        for line_number, error in rejected[:IMPORT_REJECTED_SHOWN]:
+            print(f"Line {line_number}: {error}")
+        if len(rejected) > IMPORT_REJECTED_SHOWN:
+            print(f"... and {len(rejected) - IMPORT_REJECTED_SHOWN} more rejected rows")
+
+    def __ui_export_file(self, params: list) -> None:
+        """
+        Interface to export persons, events, attendance or rankings to a CSV, JSONL or iCalendar file.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        if len(params) != 2:
+            print(f"ERROR: function 'export_file' takes 2 arguments but {len(params)} were given...")
+            return
+
+        if self.__export_service is None:
+            raise UIError("ERROR: export is not available...")
+
+        count, seconds = self.__export_service.export_file(params[0], params[1])
+        print(f"SUCCESS: {count} {params[0]} records were exported to '{params[1]}' in {seconds:.3f} s...")
+
     def __ui_display_persons(self, params: list) -> None:
         """
         Interface to display all Person objects.
@@ -128,12 +222,13 @@ class Console:
             print(f"ERROR: function 'display_persons' takes 0 arguments but {len(params)} were given...")
             return
 
-        persons = self.__person_service.get_persons()
-        if len(persons) == 0:
+        displayed = False
+        for person in self.__person_service.iter_persons():
+            print(person)
+            displayed = True
+
+        if not displayed:
             print("No persons available...")
-        else:
-            for person in persons:
-                print(person)
 
     def __ui_delete_person(self, params: list) -> None:
         """
@@ -152,8 +247,9 @@ class Console:
         try:
             id = int(params[0])
 
-            self.__person_event_service.update_deleted_person(id)
-            self.__person_service.delete_person(id)
+            with self.__transaction():
+                self.__person_event_service.update_deleted_person(id)
+                self.__person_service.delete_person(id)
             print("SUCCESS: person was successfully deleted...")
         except ValueError:
             raise UIError("ERROR: 'id' must be a positive numeric value...")
@@ -262,6 +358,58 @@ class Console:
         except RepoError as err:
             raise UIError(err)
 
+    def __ui_search_person_by_address(self, params: list) -> None:
+        """
+        Interface to search Person object by address.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        if len(params) != 1:
+            print(f"ERROR: function 'search_person_by_address' takes 1 arguments but {len(params)} were given...")
+            return
+
+        try:
+            person = self.__person_service.search_person_by_address(params[0])
+            print(person)
+        except RepoError as err:
+            raise UIError(err)
+
+    def __ui_search_person_by_name(self, params: list) -> None:
+        """
+        Interface to search Person objects by a possibly misspelled name.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        if len(params) not in (1, 2):
+            print(f"ERROR: function 'search_person_by_name' takes 1 or 2 arguments but {len(params)} were given...")
+            return
+
+        if len(params) == 1:
+            persons = self.__person_service.search_person_by_name(params[0])
+        else:
+            try:
+                limit = int(params[1])
+                if limit <= 0:
+                    raise ValueError()
+            except ValueError:
+                raise UIError("ERROR: 'limit' must be a positive numeric value...")
+
+            persons = self.__person_service.search_person_by_name(params[0], limit)
+
+        if len(persons) == 0:
+            print("No similar names...")
+        else:
+            for person in persons:
+                print(person)
+
     def __ui_person_display_events_by_description(self, params: list) -> None:
         """
         Interface to display all events Person object attends by description lexicographically.
@@ -378,8 +526,9 @@ class Console:
         try:
             id = int(params[0])
 
-            self.__person_event_service.update_deleted_event(id)
-            self.__event_service.delete_event(id)
+            with self.__transaction():
+                self.__person_event_service.update_deleted_event(id)
+                self.__event_service.delete_event(id)
             print("SUCCESS: event was successfully deleted...")
         except ValueError:
             raise UIError("ERROR: 'id' must be a positive numeric value...")
@@ -481,6 +630,76 @@ class Console:
         except RepoError as err:
             raise UIError(err)
 
+    def __ui_events_between(self, params: list) -> None:
+        """
+        Interface to display Event objects taking place between two dates chronologically.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        if len(params) != 2:
+            print(f"ERROR: function 'events_between' takes 2 arguments but {len(params)} were given...")
+            return
+
+        events = self.__event_service.events_between(params[0], params[1])
+        if len(events) == 0:
+            print("No events in this period...")
+        else:
+            for event in events:
+                print(event)
+
+    def __ui_upcoming_events(self, params: list) -> None:
+        """
+        Interface to display the next Event objects from a date and time on.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        if len(params) != 3:
+            print(f"ERROR: function 'upcoming_events' takes 3 arguments but {len(params)} were given...")
+            return
+
+        try:
+            count = int(params[2])
+            if count <= 0:
+                raise ValueError()
+
+            events = self.__event_service.upcoming_events(params[0], params[1], count)
+            if len(events) == 0:
+                print("No upcoming events...")
+            else:
+                for event in events:
+                    print(event)
+        except ValueError:
+            raise UIError("ERROR: 'count' must be a positive numeric value...")
+
+    def __ui_search_events_text(self, params: list) -> None:
+        """
+        Interface to display Event objects whose description matches a text query.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        if len(params) == 0:
+            print(f"ERROR: function 'search_events_text' takes at least 1 argument but 0 were given...")
+            return
+
+        events = self.__event_service.search_events_text(" ".join(params))
+        if len(events) == 0:
+            print("No matching events...")
+        else:
+            for event in events:
+                print(event)
+
     def __ui_add_person_to_event(self, params: list) -> None:
         """
         Interface to add new person to attend Event object.
@@ -581,9 +800,50 @@ class Console:
         except RepoError as err:
             raise UIError(err)
 
+    @staticmethod
+    def __parse_top_params(params: list) -> dict:
+        """
+        Parse '[count | percent%] [ties]' arguments of ranking commands.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: dict of keyword arguments for the ranking service methods
+        """
+
+        options = {"k": None, "percent": None, "include_ties": False}
+
+        for param in params:
+            if param.lower() == "ties":
+                options["include_ties"] = True
+            elif param.endswith("%"):
+                options["percent"] = int(param[:-1])
+            else:
+                options["k"] = int(param)
+
+        if (options["k"] is not None and options["k"] < 0) or (
+                options["percent"] is not None and not 0 <= options["percent"] <= 100):
+            raise ValueError()
+
+        return options
+
+    def __ranking_service(self):
+        """
+        Return service ranking top persons and events, the vectorized AnalyticsService when enabled.
+
+        Args: None
+
+        Return: AnalyticsService or PersonEventService
+        """
+
+        if self.__analytics_service is not None:
+            return self.__analytics_service
+
+        return self.__person_event_service
+
     def __ui_top_events(self, params: list) -> None:
         """
-        Interface to display first 20% Event objects with most participants decreasing.
+        Interface to display Event objects with most participants decreasing (first 20% by default).
 
         Args:
             params (list): list of function arguments
@@ -591,11 +851,16 @@ class Console:
         Return: None
         """
 
-        if len(params) != 0:
-            print(f"ERROR: function 'top_events' takes 0 arguments but {len(params)} were given...")
+        if len(params) > 2:
+            print(f"ERROR: function 'top_events' takes at most 2 arguments but {len(params)} were given...")
             return
 
-        events = self.__person_event_service.get_top_events()
+        try:
+            options = self.__parse_top_params(params)
+        except ValueError:
+            raise UIError("ERROR: 'count' must be a non-negative numeric value and 'percent' between 0% and 100%...")
+
+        events = self.__ranking_service().get_top_events(**options)
         if len(events) == 0:
             print("No persons attending any event...")
         else:
@@ -604,7 +869,7 @@ class Console:
 
     def __ui_top_persons(self, params: list) -> None:
         """
-        Interface to display first 20% Person objects with most attending events decreasing.
+        Interface to display Person objects with most attending events decreasing (first 20% by default).
 
         Args:
             params (list): list of function arguments
@@ -612,17 +877,184 @@ class Console:
         Return: None
         """
 
-        if len(params) != 0:
-            print(f"ERROR: function 'top_persons' takes 0 arguments but {len(params)} were given...")
+        if len(params) > 2:
+            print(f"ERROR: function 'top_persons' takes at most 2 arguments but {len(params)} were given...")
             return
 
-        persons = self.__person_event_service.get_top_persons()
+        try:
+            options = self.__parse_top_params(params)
+        except ValueError:
+            raise UIError("ERROR: 'count' must be a non-negative numeric value and 'percent' between 0% and 100%...")
+
+        persons = self.__ranking_service().get_top_persons(**options)
         if len(persons) == 0:
             print("No persons attending any event...")
         else:
             for person in persons:
                 print(person)
 
+    def __ui_stats(self, params: list) -> None:
+        """
+        Interface to display duration percentiles and data file I/O of the commands run so far.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        if len(params) > 1 or (len(params) == 1 and params[0] != "reset"):
+            print("ERROR: function 'stats' takes no argument or 'reset'...")
+            return
+
+        if len(params) == 1:
+            self.__command_stats.clear()
+            print("SUCCESS: command statistics were reset...")
+            return
+
+        summary = self.__command_stats.get_summary()
+        if len(summary) == 0:
+            print("No commands run yet...")
+            return
+
+        print(f"{'command':<38} {'runs':>5} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} "
+              f"{'reads':>6} {'writes':>6} {'KiB read':>9} {'KiB wrtn':>9}")
+        for row in summary:
+            print(f"{row['command']:<38} {row['runs']:>5} {row['p50'] * 1000:>9.2f} {row['p90'] * 1000:>9.2f} "
+                  f"{row['p99'] * 1000:>9.2f} {row['max'] * 1000:>9.2f} {row['reads']:>6.1f} {row['writes']:>6.1f} "
+                  f"{row['bytes_read'] / 1024:>9.1f} {row['bytes_written'] / 1024:>9.1f}")
+
+    def __ui_profile(self, params: list) -> None:
+        """
+        Interface to run a command under cProfile (and tracemalloc with '--memory') and display its hot spots.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        memory = False
+        dump_path = None
+
+        while len(params) > 0 and params[0].startswith("--"):
+            if params[0] == "--memory":
+                memory = True
+                params = params[1:]
+            elif params[0] == "--dump" and len(params) > 1:
+                dump_path = params[1]
+                params = params[2:]
+            else:
+                print(f"ERROR: unknown option '{params[0]}' of function 'profile'...")
+                return
+
+        if len(params) == 0:
+            print("ERROR: function 'profile' takes a command to profile...")
+            return
+
+        if params[0] == "profile":
+            raise UIError("ERROR: 'profile' can not profile itself...")
+
+        if params[0] not in self.__commands:
+            raise UIError(f"ERROR: invalid command '{params[0]}'...")
+
+        if dump_path is not None and not os.path.isdir(os.path.dirname(os.path.abspath(dump_path))):
+            raise UIError(f"ERROR: path '{dump_path}' does not exist...")
+
+        tracing = memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(self.__dispatch, params[0], params[1:])
+            snapshot = tracemalloc.take_snapshot() if memory else None
+            peak = tracemalloc.get_traced_memory()[1] if memory else 0
+        finally:
+            if tracing:
+                tracemalloc.stop()
+
+        print(f"\nTop {PROFILE_FUNCTIONS_SHOWN} functions by cumulative time:")
+        pstats.Stats(profiler).strip_dirs().sort_stats("cumulative").print_stats(PROFILE_FUNCTIONS_SHOWN)
+
+        if snapshot is not None:
+            snapshot = snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),
+                                               tracemalloc.Filter(False, cProfile.__file__)))
+            print(f"Peak traced memory: {peak / 1024:.1f} KiB")
+            print(f"Top {PROFILE_ALLOCATIONS_SHOWN} allocation sites still holding memory:")
+            for statistic in snapshot.statistics("lineno")[:PROFILE_ALLOCATIONS_SHOWN]:
+                print(statistic)
+
+        if dump_path is not None:
+            try:
+                profiler.dump_stats(dump_path)
+            except OSError:
+                raise UIError(f"ERROR: path '{dump_path}' can not be written...")
+            print(f"SUCCESS: profile was written to '{dump_path}' (open it with pstats or snakeviz)...")
+
+    def __analytics(self):
+        """
+        Return AnalyticsService object of columnar analytics commands.
+
+        Args: None
+
+        Return: AnalyticsService
+        """
+
+        if self.__analytics_service is None:
+            raise UIError("ERROR: columnar analytics are disabled (set EVENT_ORGANIZER_COLUMNAR=1)...")
+
+        return self.__analytics_service
+
+    def __ui_persons_attending_at_least(self, params: list) -> None:
+        """
+        Interface to display Person objects attending at least a number of events.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        if len(params) != 1:
+            print(f"ERROR: function 'persons_attending_at_least' takes 1 argument but {len(params)} were given...")
+            return
+
+        try:
+            count = int(params[0])
+            if count <= 0:
+                raise ValueError()
+        except ValueError:
+            raise UIError("ERROR: 'number_of_events' must be a positive numeric value...")
+
+        persons = self.__analytics().persons_attending_at_least(count)
+        if len(persons) == 0:
+            print("No persons attending that many events...")
+        else:
+            for person in persons:
+                print(person)
+
+    def __ui_attendance_by_date(self, params: list) -> None:
+        """
+        Interface to display number of attendances of every date chronologically.
+
+        Args:
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        if len(params) != 0:
+            print(f"ERROR: function 'attendance_by_date' takes 0 arguments but {len(params)} were given...")
+            return
+
+        histogram = self.__analytics().attendance_by_date()
+        if len(histogram) == 0:
+            print("No attendances...")
+        else:
+            for date, count in histogram:
+                print(f" - - > Date: {date} \n - - > Attendances: {count} \n")
+
     @staticmethod
     def __ui_exit_program(params: list) -> None:
         """
@@ -643,6 +1075,46 @@ class Console:
         clear_screen()
         exit()
 
+    def __dispatch(self, command_name: str, params: list) -> None:
+        """
+        Run the handler of a command and print its error, if any.
+
+        Args:
+            command_name (str): name of a registered command
+            params (list): list of function arguments
+
+        Return: None
+        """
+
+        try:
+            self.__commands[command_name][0](params)
+        except Exception as exception:
+            print(exception)
+
+    def execute(self, command: str) -> None:
+        """
+        Run one command line and print its result or error.
+
+        Args:
+            command (str): command name followed by its arguments
+
+        Return: None
+        """
+
+        try:
+            tokens = [token.strip() for token in command.split()]
+            command_name = tokens[0]
+            params = tokens[1:]
+            if command_name == "profile":
+                # Profiled runs are slowed down by cProfile / tracemalloc, they stay out of the statistics.
+                self.__dispatch(command_name, params)
+            elif command_name in self.__commands:
+                self.__command_stats.measure(command_name, command, lambda: self.__dispatch(command_name, params))
+            else:
+                print(f"ERROR: invalid command '{command_name}'...")
+        except IndexError:
+            print(f"ERROR: command must not be blank...")
+
     def run(self) -> None:
         """
         Interface for I/O.
@@ -652,20 +1124,7 @@ class Console:
 
         print("Use \"commands\" to show available options. ", end='')
         while True:
-            command = input("\n>>> ")
-            try:
-                tokens = [token.strip() for token in command.split()]
-                command_name = tokens[0]
-                params = tokens[1:]
-                if command_name in self.__commands:
-                    try:
-                        self.__commands[command_name][0](params)
-                    except Exception as exception:
-                        print(exception)
-                else:
-                    print(f"ERROR: invalid command '{command_name}'...")
-            except IndexError:
-                print(f"ERROR: command must not be blank...")
+            self.execute(input("\n>>> "))
 
 
 def clear_screen() -> None:
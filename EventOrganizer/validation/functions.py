@@ -1,6 +1,7 @@
 import re
 import datetime
 from exceptions.valid_exc import ValidError
+from domain.event import parse_date
 
 
 class Functions:
@@ -106,6 +107,4 @@ class Functions:
         Returns: bool
         """
 
-        date_1 = datetime.datetime.strptime(string_value_1, '%Y-%m-%d')
-        date_2 = datetime.datetime.strptime(string_value_2, '%Y-%m-%d')
-        return date_1 > date_2
+        return parse_date(string_value_1) > parse_date(string_value_2)